@@ -8,7 +8,26 @@ from config import Config
 db = SQLAlchemy()
 
 
+def create_db_app(name: str = "app", db_uri: str = None):
+    """
+    DB 연결만 있는 앱 (블루프린트 / 스키마 변경 / 백그라운드 작업 없음)
+    scripts/*, OPC UA 워커 embedded 핸들러처럼 서버가 아닌 프로세스용
+    db_uri: 벤치 / 점검 스크립트에서 Config 대신 쓸 DB
+    """
+    app = Flask(name)
+    app.config.from_object(Config)
+    if db_uri:
+        app.config["SQLALCHEMY_DATABASE_URI"] = db_uri
+    db.init_app(app)
+    from app.models import dashboard, opcua
+    return app
+
+
 def create_app():
+    """
+    웹 서버 앱 (DB + 블루프린트). 스키마 변경 / 백그라운드 작업은 start_background_jobs() 에서
+    → 요청을 받는 서버 프로세스에서만 1회 호출 (run.py)
+    """
     app = Flask(
         __name__,
         template_folder="templates",
@@ -20,7 +39,7 @@ def create_app():
     db.init_app(app)
 
     # 모델 import (FK나 관계가 있으면 반드시 init 후 import)
-    from app.models import dashboard
+    from app.models import dashboard, opcua
 
      # ───────── Web UI Blueprints ──────
     from app.web.dashboard import dashboard_bp
@@ -31,22 +50,90 @@ def create_app():
     # ───────── API Blueprints ─────────
     from app.api.v1.plc_api import plc_api_bp
     app.register_blueprint(plc_api_bp, url_prefix="/api/v1/plc")      
-    from app.api.v1.amr_api import amr_api_bp
-    app.register_blueprint(amr_api_bp, url_prefix="/api/v1/amr")     
-    from app.api.v1.arm_api import arm_api_bp
-    app.register_blueprint(arm_api_bp, url_prefix="/api/v1/arm")     
     from app.api.v1.vision_api import vision_api_bp
     app.register_blueprint(vision_api_bp, url_prefix="/api/v1/vision")     
 
 
     from app.api.v1.dashboard_api import dashboard_api_bp
     app.register_blueprint(dashboard_api_bp, url_prefix="/api/v1/dashboard")
+    from app.api.v1.metrics_api import metrics_api_bp
+    app.register_blueprint(metrics_api_bp, url_prefix="/api/v1/metrics")
+    from app.api.v1.amr_api import amr_api_bp
+    app.register_blueprint(amr_api_bp, url_prefix="/api/v1/amr")
+    from app.api.v1.search_api import search_api_bp
+    app.register_blueprint(search_api_bp, url_prefix="/api/v1/search")
+    from app.api.v1.export_api import export_api_bp
+    app.register_blueprint(export_api_bp, url_prefix="/api/v1/export")
+    from app.api.v1.archive_api import archive_api_bp
+    app.register_blueprint(archive_api_bp, url_prefix="/api/v1/archive")
 
-    # 초기 개발용: 테이블 자동 생성
-    with app.app_context():
-        db.create_all()
+    # ───────── OPC UA 이벤트 webhook (PLC / ARM / AMR) ─────────
+    # app/services/event_routes.py 테이블을 핸들러로 컴파일 + webhook 경로 등록
+    from app.services.event_router import init_event_routes
+    init_event_routes(app)
 
     # CORS
     CORS(app)
 
     return app
+
+
+def init_schema(app):
+    """
+    테이블 생성 + 마이그레이션 (start_background_jobs, OPC UA 워커 embedded 모드)
+    """
+    # 초기 개발용: 테이블 자동 생성
+    with app.app_context():
+        db.create_all()
+
+    # 기존 DB 스키마 변경 (ENUM / 인덱스 등): app/migrations/versions/
+    from app.migrations import run_startup_migrations
+    run_startup_migrations(app)
+
+
+def start_background_jobs(app):
+    """
+    스키마 변경 + 트리거 설치 + 백그라운드 스레드 시작
+    reloader 감시 프로세스 / OPC UA 워커에서 돌면 집계·보관·writer 가 프로세스 수만큼 중복 실행되므로
+    요청을 받는 서버 프로세스에서만 호출한다.
+    """
+    init_schema(app)
+
+    # amr_state_current: amr_state_log INSERT 트리거 설치 + 최초 1회 이력에서 채움
+    from app.services.amr_state_service import install_amr_state_current
+    install_amr_state_current(app)
+
+    # mission_latest: mission_logs / mission_plc_logs INSERT 트리거 설치 + 최초 1회 이력에서 채움
+    from app.services.mission_latest_service import install_mission_latest
+    install_mission_latest(app)
+
+    # amr_state_log 1초/1분 집계 + 보관 기간 지난 행 정리
+    from app.services.amr_rollup import amr_rollup_job
+    amr_rollup_job.start(app)
+
+    # 보관 기간(LOG_ARCHIVE_DAYS)이 지난 로그 행 → data/archive 압축 파일로 이동
+    from app.services.log_archive import log_archive_job
+    log_archive_job.start(app)
+
+    # control_logs 버퍼 writer (CONTROL_LOG_WRITE_MODE=sync 면 요청 스레드에서 바로 저장)
+    from app.services.control_log_writer import control_log_writer
+    control_log_writer.start(app)
+
+    # AMR 텔레메트리 수집 writer (AMR_INGEST_WRITE_MODE=sync 면 요청 스레드에서 바로 저장)
+    from app.services.amr_ingest import amr_ingest_writer
+    amr_ingest_writer.start(app)
+
+    # 대시보드 SSE 변경 피드: 바뀐 행만 delta 이벤트로 발행 (구독자가 있을 때만 DB 확인)
+    from app.services.dashboard_feed import dashboard_feed
+    dashboard_feed.start(app)
+
+    # OPC UA 이벤트 중복 필터: 노드별 마지막 처리 이벤트 로드 + 주기 저장
+    # (embedded 모드면 이벤트를 워커 프로세스가 처리하므로 워커 쪽에서 시작: app/hardware/opcua/delivery.py)
+    from app.hardware.opcua.config import EVENT_DELIVERY
+    if EVENT_DELIVERY != "embedded":
+        from app.services.event_ingest import ingest_index
+        ingest_index.start(app)
+
+    # OPC UA 워커 unix 소켓 이벤트 수신 (OPCUA_EVENT_DELIVERY=unix 일 때만)
+    from app.services.event_socket import start_event_socket_server
+    start_event_socket_server(app)
@@ -1,109 +1,51 @@
 # app/api/v1/amr_api.py
 
 from flask import Blueprint, request, jsonify
-from app.hardware.opcua.sender import (
-    write_amr_go_move,
-    write_arm_go_move,
-    write_amr_go_move
-)
-import json
-from app.services.control_log_service import log_control_action
-amr_api_bp = Blueprint("amr_api", __name__)
-
-
-@amr_api_bp.route("/amr_mission_state", methods=["POST"])
-def amr_mission_state():
-    try:
-        data = request.get_json(force=True)
-        value = data.get("value")
-       
-        if value == 'Ready':
-            return jsonify({"action": "Ready pass"}), 200
-        
-        print(f"[AMR] amr_mission_state webhook 수신: value={value}")
-
-         # 2) value를 dict 형태로 정규화
-        status = None
-
-        if isinstance(value, dict):
-            # 이미 {"status": "..."} 형태인 경우
-            status = value.get("status")
-
-        elif isinstance(value, str):
-            # 문자열이면 JSON 파싱 시도
-            try:
-                parsed = json.loads(value)
-                if isinstance(parsed, dict):
-                    status = parsed.get("status")
-                else:
-                    # 그냥 "DONE" 같은 문자열인 경우
-                    status = parsed
-            except json.JSONDecodeError:
-                # JSON이 아니면 그냥 문자열 자체를 status로 사용
-                status = value
-
-        # 3) 유효한 status 없으면 no_action
-        if not status:
-            return jsonify({"ok": True, "action": "no_action"}), 200
 
-        if status == "DONE":
-            # 예: AGV가 작업 완료 → 다음 명령
-            # write_amr_go_move({"move_command": "go_home"})
-            return jsonify({"ok": True, "action": "mission_done"}), 200
+from app import db
+from app.services.amr_ingest import IngestError, amr_ingest_writer, ingest
 
-        elif status == "PICK":
-            # 예: 로봇암 픽업 시작
-            # write_arm_go_move({"move_command": "mission_start"})
-
-            arm_cmd = {"move_command": "mission_start"}
-            arm_status = "SUCCESS"
-            arm_msg = None
-
-            try:
-                write_arm_go_move(arm_cmd)
-            except Exception as e:
-                arm_status = "FAIL"
-                arm_msg = "OPCUA access fail "
-
-            log_control_action(
-                equipment_id="ARM01",
-                target_type="ARM",
-                action_type="arm_go_move",
-                operator_name="SYSTEM",        # 자동 제어면 SYSTEM, 수동이면 current_user 등
-                source="API",
-                request_payload=arm_cmd,
-                result_status=arm_status,
-                result_message=arm_msg,
-            )
-
-            return jsonify({"ok": True, "action": "pick_start"}), 200
-
-        elif status == "ERR":
-            # 예: AGV 오류 → AGV 홈으로
-            # write_amr_go_move({"move_command": "go_home"})
-            amr_cmd = {"move_command": "go_home"}
-            amr_status = "SUCCESS"
-            amr_msg = None
+amr_api_bp = Blueprint("amr_api", __name__)
 
-            try:
-                write_amr_go_move(amr_cmd)
-            except Exception as e:
-                amr_status = "FAIL"
-                amr_msg = "OPCUA access fail "
+RETRY_AFTER_SEC = 1
 
-            log_control_action(
-                equipment_id="AMR01",
-                target_type="AMR",
-                action_type="amr_go_move",
-                operator_name="SYSTEM",        # 자동 제어면 SYSTEM, 수동이면 current_user 등
-                source="API",
-                request_payload=amr_cmd,
-                result_status=amr_status,
-                result_message=amr_msg,
-            )
 
-            return jsonify({"ok": True, "action": "error_handle"}), 200
+@amr_api_bp.route("/telemetry", methods=["POST"])
+def post_telemetry():
+    """
+    AMR 상태 샘플 대량 수집 (형식 / 검증 / 백프레셔: app/services/amr_ingest.py)
+    POST /api/v1/amr/telemetry
+      Content-Type: application/x-ndjson      → 줄마다 샘플 JSON 1개
+      Content-Type: application/octet-stream  → BINARY_DTYPE 레코드 배열
 
+    202: 저장 대기열에 넣음 (거부된 행은 rejected / errors)
+    429: writer 가 밀려서 배치 전체를 받지 않음 → Retry-After 후 같은 배치 재전송
+    """
+    try:
+        result = ingest(request.get_data(cache=False), request.content_type)
+    except IngestError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"[AMR] amr_mission_state 오류: {e}")
-        return jsonify({"ok": False, "error": str(e)}), 500
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    if result["throttled"]:
+        resp = jsonify({"error": "ingest queue full", **result})
+        resp.status_code = 429
+        resp.headers["Retry-After"] = str(RETRY_AFTER_SEC)
+        return resp
+    return jsonify(result), 202
+
+
+@amr_api_bp.route("/telemetry/status", methods=["GET"])
+def get_telemetry_status():
+    """
+    수집 writer 상태
+    queue_rows / written / retries / dropped(재시도 후에도 저장 실패해서 버린 행) / throttled(429) / last_error
+    """
+    return jsonify({
+        "running": amr_ingest_writer.running,
+        "queue_rows": amr_ingest_writer.pending,
+        "queue_max_rows": amr_ingest_writer.max_rows,
+        **amr_ingest_writer.stats,
+    }), 200
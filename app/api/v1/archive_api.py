@@ -0,0 +1,55 @@
+# app/api/v1/archive_api.py
+
+from datetime import datetime, timedelta
+from itertools import islice
+
+from flask import Blueprint, request, jsonify
+
+from app.services.log_archive import (
+    ARCHIVE_TABLES,
+    LOG_ARCHIVE_DAYS,
+    LOG_ARCHIVE_MAX_QUERY_DAYS,
+    archive_status,
+    read_archive,
+)
+
+archive_api_bp = Blueprint("archive_api", __name__)
+
+
+@archive_api_bp.route("", methods=["GET"])
+def get_archive_status():
+    """보관 파일 현황 (테이블별 날짜 범위 / 파일 수 / 크기)"""
+    return jsonify({"retention_days": LOG_ARCHIVE_DAYS, "tables": archive_status()}), 200
+
+
+@archive_api_bp.route("/<name>", methods=["GET"])
+def get_archived_rows(name):
+    """
+    보관된 행 조회 (app/services/log_archive.py)
+    GET /api/v1/archive/control_logs?start=2025-09-01T00:00:00&end=2025-09-02T00:00:00[&equipment_id=AMR01&limit=1000]
+    - end 기본: start + 1일, 기간은 최대 LOG_ARCHIVE_MAX_QUERY_DAYS 일
+    """
+    if name not in ARCHIVE_TABLES:
+        return jsonify({"error": f"unknown archive table: {name}", "available": sorted(ARCHIVE_TABLES)}), 404
+
+    try:
+        start = datetime.fromisoformat(request.args["start"])
+        end = datetime.fromisoformat(request.args["end"]) if request.args.get("end") else start + timedelta(days=1)
+    except KeyError:
+        return jsonify({"error": "start required"}), 400
+    except ValueError as e:
+        return jsonify({"error": f"invalid time: {e}"}), 400
+    if end - start > timedelta(days=LOG_ARCHIVE_MAX_QUERY_DAYS):
+        return jsonify({"error": f"range too long (max {LOG_ARCHIVE_MAX_QUERY_DAYS} days)"}), 400
+
+    try:
+        limit = max(1, min(int(request.args.get("limit", 1000)), 10000))
+    except (TypeError, ValueError):
+        limit = 1000
+
+    rows = list(islice(read_archive(name, start, end, request.args.get("equipment_id") or None), limit + 1))
+    return jsonify({
+        "items": rows[:limit],
+        "count": min(len(rows), limit),
+        "has_more": len(rows) > limit,
+    }), 200
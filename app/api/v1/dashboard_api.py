@@ -1,18 +1,23 @@
 # app/api/v1/dashboard_api.py
 
 from flask import Blueprint, jsonify, send_file, request, Response, stream_with_context
-from sqlalchemy import text, desc, func, union_all, literal, and_
+from sqlalchemy import text, desc, func, union_all, literal
 from app import db
-import queue
-import json, time
+from datetime import datetime, timedelta
 
 from app.models.dashboard import (
     ControlLog,
-    EquipmentInfo,
     EventLog,
     Map,
-    AmrStateLog,
 )
+from app.services.amr_rollup import HISTORY_MAX_POINTS, get_amr_history
+from app.services.amr_state_service import get_current_amr_states
+from app.services.dashboard_feed import amr_state_item, event_item, mission_item, sse_stream
+from app.services.equipment_cache import equipment_cache
+from app.services.mission_latest_service import get_latest_missions
+from app.hardware.opcua.circuit_breaker import breaker_states
+from app.utils.files import data_dir
+from app.utils.pagination import keyset_page
 
 from PIL import Image
 import numpy as np
@@ -22,64 +27,26 @@ import os
 dashboard_api_bp = Blueprint("dashboard_api", __name__)
 
 
-# ====== 대시보드 SSE용 간단 브로드캐스터 ======
-
-_dashboard_subscribers: set[queue.Queue] = set()
-
-def publish_dashboard_event(event: dict):
-    """
-    대시보드로 푸시할 이벤트 공통 함수.
-    예) publish_dashboard_event({"type": "amr_state", "payload": {...}})
-    """
-    dead_queues = []
-    for q in list(_dashboard_subscribers):
-        try:
-            q.put_nowait(event)
-        except Exception:
-            # 꽉 찌거나 에러난 큐는 제거 후보
-            dead_queues.append(q)
-
-    for q in dead_queues:
-        _dashboard_subscribers.discard(q)
-
+# ====== 대시보드 SSE 변경 피드 (app/services/dashboard_feed.py) ======
 
 @dashboard_api_bp.route("/stream", methods=["GET"])
 def dashboard_stream():
     """
-    대시보드용 SSE 타이머
+    대시보드용 SSE 변경 피드
     클라이언트: new EventSource('/api/v1/dashboard/stream')
-    3~10초마다 'tick' 이벤트를 보내서 프론트가 각 API를 다시 호출하게 만듦
+    hello 를 받으면 REST API 로 전체 1회 로드, 이후 바뀐 행만 타입별 delta 이벤트로 받아서 반영
+    (control_logs / events_logs / amr_states / mission_logs / opcua_status / inspection_job / resync)
     """
-    INTERVAL_SEC = 3  # 원하면 3~10 사이에서 조정
-
-    def event_stream():
-        # 최초 한 번 연결 확인용
-        hello = {
-            "type": "hello",
-            "payload": {"msg": "dashboard stream connected"},
-        }
-        yield f"data: {json.dumps(hello, ensure_ascii=False)}\n\n"
-
-        while True:
-            tick = {
-                "type": "tick",
-                "payload": {"ts": time.time()},
-            }
-            yield f"data: {json.dumps(tick, ensure_ascii=False)}\n\n"
-            time.sleep(INTERVAL_SEC)
-
     return Response(
-        stream_with_context(event_stream()),
+        stream_with_context(sse_stream({"msg": "dashboard stream connected"})),
         mimetype="text/event-stream",
+        # nginx 등 프록시가 버퍼링하지 않도록
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 # === MAP 공통 상수 ===
 
-# 프로젝트 기준 경로
-BASE_DIR = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "../../..")
-)
-MAP_DIR = os.path.join(BASE_DIR, "data", "maps")
+MAP_DIR = data_dir("maps")
 
 # 캡처 기준 해상도 (네가 잡아둔 값)
 BASE_W = 725
@@ -259,77 +226,92 @@ def get_map_meta():
 #     return send_file(buf, mimetype="image/png")
 
 
+# === OPC UA 연결 상태 (circuit breaker) ===
+
+@dashboard_api_bp.route("/opcua_status", methods=["GET"])
+def get_opcua_status():
+    """
+    OPC UA 엔드포인트별 breaker 상태
+    state: CLOSED(정상) / OPEN(서버 다운, 명령 즉시 실패) / HALF_OPEN(복구 확인 중)
+    """
+    return jsonify({"items": breaker_states()})
+
+
 # === Control Logs (제어 명령 로그) ===
 
 def _get_limit(default=10, max_limit=100):
+    return _get_limit_arg("limit", default, max_limit)
+
+
+def _get_limit_arg(name, default, max_limit):
     try:
-        limit = int(request.args.get("limit", default))
+        limit = int(request.args.get(name, default))
     except (TypeError, ValueError):
         return default
     return max(1, min(limit, max_limit))
 
 
+def _page_response(page: dict, items: list):
+    """keyset_page 결과 → JSON (items 는 직렬화한 목록)"""
+    return jsonify({
+        "items": items,
+        "count": len(items),
+        "cursor": page["cursor"],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"],
+        "reset": page["reset"],
+    }), 200
+
+
 @dashboard_api_bp.route("/control_logs", methods=["GET"])
 def get_control_logs():
+    """
+    제어 명령 로그 (최신순, keyset 페이지네이션: app/utils/pagination.py)
+    GET /api/v1/dashboard/control_logs?limit=10[&before=<next_cursor> | &since=<cursor>]
+    """
     limit = _get_limit(default=10)
 
-    logs = (
-        ControlLog.query
-        .order_by(desc(ControlLog.created_at))
-        .limit(limit)
-        .all()
-    )
+    try:
+        page = keyset_page(
+            ControlLog.query,
+            ControlLog.created_at, ControlLog.control_id,
+            limit,
+            row_key=lambda log: (log.created_at, log.control_id),
+            before=request.args.get("before"),
+            since=request.args.get("since"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify({
-        "items": [log.to_dict() for log in logs]
-    })
+    return _page_response(page, [log.to_dict() for log in page["items"]])
 
 @dashboard_api_bp.route("/events_logs", methods=["GET"])
 def get_events():
     """
-    대시보드 이벤트 로그용 API
-    GET /api/v1/events?limit=10
+    대시보드 이벤트 로그용 API (최신순, keyset 페이지네이션)
+    GET /api/v1/dashboard/events_logs?limit=10[&before=<next_cursor> | &since=<cursor>]
     """
     try:
-        limit = request.args.get("limit", default=10, type=int)
-        if not limit or limit < 1:
-            limit = 10
-        if limit > 100:
-            limit = 100
-
-        # 최신순으로 EquipmentInfo와 조인해서 가져오기
-        q = (
-            db.session.query(EventLog, EquipmentInfo)
-            .join(EquipmentInfo, EventLog.equipment_id == EquipmentInfo.equipment_id)
-            .order_by(EventLog.created_at.desc())
-            .limit(limit)
+        limit = _get_limit(default=10)
+
+        # 장비 정보는 JOIN 대신 equipment_cache 에서
+        # equipment_info 에 있는 장비 이벤트만 (예전 INNER JOIN 과 같은 결과, 페이지 크기 유지를 위해 SQL 에서 거름)
+        page = keyset_page(
+            EventLog.query.filter(EventLog.equipment_id.in_(equipment_cache.ids())),
+            EventLog.created_at, EventLog.event_id,
+            limit,
+            row_key=lambda ev: (ev.created_at, ev.event_id),
+            before=request.args.get("before"),
+            since=request.args.get("since"),
         )
 
-        items = []
-        for ev, eq in q.all():
-            items.append(
-                {
-                    "event_id": ev.event_id,
-                    "equipment_id": ev.equipment_id,
-                    "equipment_type": ev.equipment_type,
-                    "level": ev.level,
-                    "message": ev.message,
-                    "created_at": ev.created_at.isoformat(sep=" ", timespec="seconds")
-                    if ev.created_at
-                    else None,
-                    "equipment": {
-                        "equipment_id": eq.equipment_id,
-                        "equipment_name": eq.equipment_name,
-                        "equipment_type": eq.equipment_type,
-                        "location": eq.location,
-                    }
-                    if eq
-                    else None,
-                }
-            )
-
-        return jsonify({"items": items, "count": len(items)}), 200
+        # 조회 사이 캐시에서 빠진 장비는 event_item() 이 None
+        items = [item for item in map(event_item, page["items"]) if item is not None]
+
+        return _page_response(page, items)
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -338,91 +320,19 @@ def get_events():
 @dashboard_api_bp.route("/mission_logs", methods=["GET"])
 def get_mission_logs():
     """
-    미션 로그(mission_logs) + PLC 미션 로그(mission_plc_logs)를 합쳐서
+    미션 로그(mission_logs) + PLC 미션 로그(mission_plc_logs) 중
     장비(equipment_id)별로 가장 최신 1건만 반환하는 API.
+    이력 테이블을 스캔하지 않고 트리거로 유지되는 mission_latest(장비당 1행)를 읽는다.
+    (트리거를 만들지 못한 DB 면 이력 GROUP BY, app/services/mission_latest_service.py)
 
     GET /api/v1/dashboard/mission_logs?limit=5
     """
     try:
         limit = _get_limit(default=5, max_limit=50)
 
-        sql = text("""
-        SELECT
-            x.equipment_id,
-            x.equipment_type,
-            x.status,
-            x.description,
-            x.source,
-            x.created_at,
-            ei.equipment_name
-        FROM (
-            -- 1) PLC 쪽 미션 로그
-            SELECT
-                mpl.equipment_id               AS equipment_id,
-                'PLC'                          AS equipment_type,
-                NULL                           AS status,
-                mpl.description                AS description,
-                mpl.source                     AS source,
-                mpl.created_at                 AS created_at
-            FROM mission_plc_logs AS mpl
-
-            UNION ALL
-
-            -- 2) 일반 미션 로그
-            SELECT
-                ml.equipment_id                AS equipment_id,
-                ml.equipment_type              AS equipment_type,
-                ml.status                      AS status,
-                ml.description                 AS description,
-                ml.source                      AS source,
-                ml.created_at                  AS created_at
-            FROM mission_logs AS ml
-        ) AS x
-        JOIN (
-            -- 장비별 최신 created_at만 뽑기
-            SELECT
-                equipment_id,
-                MAX(created_at) AS max_created_at
-            FROM (
-                SELECT equipment_id, created_at
-                FROM mission_plc_logs
-                UNION ALL
-                SELECT equipment_id, created_at
-                FROM mission_logs
-            ) t
-            GROUP BY equipment_id
-        ) latest
-          ON latest.equipment_id = x.equipment_id
-         AND latest.max_created_at = x.created_at
-        LEFT JOIN equipment_info ei
-          ON ei.equipment_id = x.equipment_id
-        ORDER BY x.created_at DESC
-        LIMIT :limit
-        """)
-
-        rows = db.session.execute(sql, {"limit": limit}).mappings().all()
-
-        items = []
-        for row in rows:
-            created_at = row["created_at"]
-            created_str = (
-                created_at.strftime("%Y-%m-%d %H:%M:%S")
-                if created_at is not None else None
-            )
-
-            items.append({
-                "equipment_id": row["equipment_id"],
-                "equipment_type": row["equipment_type"],
-                "status": row["status"],
-                "description": row["description"],
-                "source": row["source"],
-                "created_at": created_str,
-                # 프론트에서 m.equipment?.equipment_name 로 쓰기 좋게 nested 구조
-                "equipment": {
-                    "equipment_id": row["equipment_id"],
-                    "equipment_name": row["equipment_name"],
-                } if row["equipment_name"] is not None else None,
-            })
+        rows = get_latest_missions(limit)
+
+        items = [mission_item(row) for row in rows]
 
         return jsonify({"count": len(items), "items": items}), 200
 
@@ -430,49 +340,45 @@ def get_mission_logs():
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
     
-@dashboard_api_bp.route("/amr_states", methods=["GET"])
-def get_latest_amr_states():
+@dashboard_api_bp.route("/amr_history", methods=["GET"])
+def get_amr_history_api():
     """
-    AGV(AMR) 상태 로그에서
-    모든 equipment_id 별로 updated_at 기준 최신 1건씩만 조회.
-    (특정 ID 조회 기능 제거됨)
+    AMR 1대의 상태 이력. 구간의 행 수가 max_points 이하인 가장 세밀한 해상도(raw / 1s / 1m)를 자동 선택.
+    1m 으로도 넘으면 앞에서부터 max_points 건 + truncated=true (app/services/amr_rollup.py)
+
+    GET /api/v1/dashboard/amr_history?equipment_id=AMR01&start=2026-01-01T09:00:00&end=...&max_points=2000
+    - start / end: ISO 시각 (UTC, 기본 end=지금, start=end-10분)
     """
+    equipment_id = request.args.get("equipment_id")
+    if not equipment_id:
+        return jsonify({"error": "equipment_id required"}), 400
 
     try:
-        # 1) equipment_id 별로 가장 최신 updated_at 을 구하는 서브쿼리
-        subq = (
-            db.session.query(
-                AmrStateLog.equipment_id.label("eq_id"),
-                func.max(AmrStateLog.updated_at).label("max_updated_at"),
-            )
-            .group_by(AmrStateLog.equipment_id)
-            .subquery()
-        )
+        end = datetime.fromisoformat(request.args["end"]) if "end" in request.args else datetime.utcnow()
+        start = datetime.fromisoformat(request.args["start"]) if "start" in request.args else end - timedelta(minutes=10)
+    except ValueError as e:
+        return jsonify({"error": f"invalid time: {e}"}), 400
+    max_points = _get_limit_arg("max_points", default=HISTORY_MAX_POINTS, max_limit=HISTORY_MAX_POINTS * 5)
 
-        # 2) 서브쿼리와 조인하여 실제 최신 상태 row 가져오기
-        q = (
-            db.session.query(AmrStateLog)
-            .join(
-                subq,
-                and_(
-                    AmrStateLog.equipment_id == subq.c.eq_id,
-                    AmrStateLog.updated_at == subq.c.max_updated_at,
-                ),
-            )
-            .order_by(AmrStateLog.equipment_id.asc())
-        )
+    try:
+        return jsonify(get_amr_history(equipment_id, start, end, max_points)), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
-        logs = q.all()
 
-        items = []
-        for log in logs:
-            data = log.to_dict()
+@dashboard_api_bp.route("/amr_states", methods=["GET"])
+def get_latest_amr_states():
+    """
+    모든 AMR 의 최신 상태 1건씩 조회.
+    amr_state_log 를 GROUP BY 하지 않고, 트리거로 유지되는 amr_state_current(AMR 당 1행)를 바로 읽는다.
+    (app/services/amr_state_service.py)
+    """
 
-            # equipment_info 조인 결과 포함
-            if log.equipment:
-                data["equipment"] = log.equipment.to_dict()
+    try:
+        logs = get_current_amr_states()
 
-            items.append(data)
+        items = [amr_state_item(log) for log in logs]
 
         return jsonify({
             "items": items,
@@ -0,0 +1,42 @@
+# app/api/v1/export_api.py
+
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from app.services.log_export import EXPORTS, FORMATS, ExportError, export_rows
+
+export_api_bp = Blueprint("export_api", __name__)
+
+
+@export_api_bp.route("/<kind>", methods=["GET"])
+def export_logs(kind):
+    """
+    로그 내보내기 (청크 단위 스트리밍, 메모리 일정: app/services/log_export.py)
+    GET /api/v1/export/control_logs?format=csv&start=2026-01-01T00:00:00&end=2026-02-01T00:00:00[&equipment_id=AMR01]
+    GET /api/v1/export/amr_state_log?format=parquet&start=...
+    kind: control_logs | camera_logs | mission_logs | amr_state_log
+    """
+    if kind not in EXPORTS:
+        return jsonify({"error": f"unknown export: {kind}", "available": sorted(EXPORTS)}), 404
+
+    fmt = request.args.get("format", "csv")
+    try:
+        start = datetime.fromisoformat(request.args["start"]) if request.args.get("start") else None
+        end = datetime.fromisoformat(request.args["end"]) if request.args.get("end") else None
+    except ValueError as e:
+        return jsonify({"error": f"invalid time: {e}"}), 400
+
+    try:
+        chunks = export_rows(kind, fmt, start, end, request.args.get("equipment_id") or None)
+    except ExportError as e:
+        return jsonify({"error": str(e)}), 400
+
+    period = "-".join(t.strftime("%Y%m%d%H%M") for t in (start, end) if t)
+    filename = f"{kind}_{period}.{fmt}" if period else f"{kind}.{fmt}"
+    # Content-Length 없이 generator 로 응답 → chunked transfer
+    return Response(
+        stream_with_context(chunks),
+        mimetype=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,26 @@
+# app/api/v1/metrics_api.py
+
+from flask import Blueprint, jsonify, request, Response
+
+from app.utils import metrics
+
+metrics_api_bp = Blueprint("metrics_api", __name__)
+
+
+@metrics_api_bp.route("/latency", methods=["GET"])
+def get_latency():
+    """
+    OPC UA 이벤트 구간별 지연 히스토그램
+    GET /api/v1/metrics/latency               → JSON {event: {stage: {...}}}
+    GET /api/v1/metrics/latency?format=prom   → Prometheus text format
+    """
+    if request.args.get("format") == "prom":
+        return Response(metrics.prometheus_text(), mimetype="text/plain; version=0.0.4")
+
+    return jsonify({"items": metrics.snapshot(), "buckets_ms": list(metrics.BUCKETS_MS)}), 200
+
+
+@metrics_api_bp.route("/latency/reset", methods=["POST"])
+def reset_latency():
+    metrics.reset()
+    return jsonify({"ok": True}), 200
@@ -0,0 +1,42 @@
+# app/api/v1/search_api.py
+
+from flask import Blueprint, request, jsonify
+
+from app import db
+from app.services.log_search import SEARCHES, search_logs
+
+search_api_bp = Blueprint("search_api", __name__)
+
+
+@search_api_bp.route("/<kind>", methods=["GET"])
+def search(kind):
+    """
+    로그 검색 (필터 / payload 키 / 기간, 최신순 keyset 페이지네이션: app/services/log_search.py)
+    GET /api/v1/search/control_logs?equipment_id=AMR01&result_status=FAIL&payload.move_command=go_home
+                                   &start=2026-01-05T00:00:00&end=2026-01-12T00:00:00&limit=50[&before=<next_cursor>]
+    GET /api/v1/search/events_logs?level=ERROR
+    GET /api/v1/search/camera_logs?decision=REJECT&module_type=ESP32
+    """
+    if kind not in SEARCHES:
+        return jsonify({"error": f"unknown log type: {kind}", "available": sorted(SEARCHES)}), 404
+
+    try:
+        limit = max(1, min(int(request.args.get("limit", 50)), 500))
+    except (TypeError, ValueError):
+        limit = 50
+
+    try:
+        page = search_logs(kind, request.args, limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    items = [row.to_dict() for row in page["items"]]
+    return jsonify({
+        "items": items,
+        "count": len(items),
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"],
+    }), 200
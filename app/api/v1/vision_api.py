@@ -1,7 +1,47 @@
 # app/api/v1/vision_api.py
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, url_for
 
 from app import db
+from app.models.opcua import MissionCameraLog
+from app.utils.pagination import keyset_page
 
-vision_api_bp = Blueprint("vision_api", __name__)
\ No newline at end of file
+vision_api_bp = Blueprint("vision_api", __name__)
+
+@vision_api_bp.route("/camera_logs", methods=["GET"])
+def get_camera_logs():
+    """
+    검사 카메라 로그 (최신순, keyset 페이지네이션: app/utils/pagination.py)
+    GET /api/v1/vision/camera_logs?limit=20[&before=<next_cursor> | &since=<cursor>]
+    """
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+    except (TypeError, ValueError):
+        limit = 20
+
+    try:
+        page = keyset_page(
+            MissionCameraLog.query,
+            MissionCameraLog.created_at, MissionCameraLog.log_camera_id,
+            limit,
+            row_key=lambda log: (log.created_at, log.log_camera_id),
+            before=request.args.get("before"),
+            since=request.args.get("since"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    items = []
+    for log in page["items"]:
+        item = log.to_dict()
+        item["image_url"] = url_for("vision.mission_camera_log_image", log_id=log.log_camera_id)
+        items.append(item)
+
+    return jsonify({
+        "items": items,
+        "count": len(items),
+        "cursor": page["cursor"],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"],
+        "reset": page["reset"],
+    }), 200
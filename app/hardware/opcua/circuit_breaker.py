@@ -0,0 +1,120 @@
+# app/hardware/opcua/circuit_breaker.py
+"""
+OPC UA 엔드포인트별 circuit breaker
+
+- CLOSED    : 정상. 연결/세션 오류(timeout 포함)가 failure_threshold 번 연속되면 OPEN
+- OPEN      : 서버 다운으로 판단. 명령은 세션을 잡지 않고 즉시 CircuitOpenError
+              (풀의 백그라운드 probe 가 probe_interval 마다 접속을 시도)
+- HALF_OPEN : probe 성공 후 상태. 명령 1건만 시험으로 통과시키고
+              성공하면 CLOSED, 실패하면 다시 OPEN
+
+Method 자체의 실패 상태 코드(서버는 응답함)는 장애로 세지 않는다.
+Flask 요청 스레드(상태 조회)와 sender 루프에서 같이 쓰므로 threading.Lock 으로 보호.
+"""
+
+import threading
+import time
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(ConnectionError):
+    """breaker 가 열려 있어 명령을 보내지 않고 바로 실패"""
+
+
+class CircuitBreaker:
+
+    def __init__(self, name: str, failure_threshold: int = 2, probe_interval: float = 5.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.last_change = time.time()
+        self._trial_in_flight = False
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            print(f"[OPCUA] breaker {self.name}: {self.state} -> {state}")
+            self.state = state
+            self.last_change = time.time()
+
+    def allow(self):
+        """명령 전송 가능 여부 확인. 불가하면 CircuitOpenError"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(f"OPC UA server unreachable ({self.name}, breaker {self.state})")
+
+    def release_trial(self):
+        """allow() 뒤 세션을 받기 전에 취소됨 → 판정 없이 시험 명령 기회만 돌려줌 (HALF_OPEN 유지)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            self.opened_at = None
+            self._set_state(CLOSED)
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened_at = time.time()
+                self._set_state(OPEN)
+
+    def probe_succeeded(self):
+        """백그라운드 probe 가 접속에 성공 → 시험 명령 1건 허용"""
+        with self._lock:
+            if self.state == OPEN:
+                self._trial_in_flight = False
+                self._set_state(HALF_OPEN)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "endpoint": self.name,
+                "state": self.state,
+                "failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "opened_at": self.opened_at,
+                "last_change": self.last_change,
+                "last_error": self.last_error,
+            }
+
+
+# 엔드포인트(URL) → CircuitBreaker
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str, **kwargs) -> CircuitBreaker:
+    """엔드포인트별 breaker (없으면 생성, kwargs 는 생성 시에만 적용)"""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(endpoint, **kwargs)
+        return breaker
+
+
+def breaker_states() -> list:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [b.to_dict() for b in breakers]
@@ -1,21 +1,50 @@
 # app/hardware/opcua/client.py
 
 import asyncio
-from asyncua import Client
+import time
+from datetime import timezone
 
-from .config import OPCUA_SERVER_URL, OPCUA_NAMESPACE_URI, SUBSCRIBE_NODES
-from .webhook import call_webhook
+from asyncua import Client, ua
+
+from .config import (
+    OPCUA_SERVER_URL,
+    OPCUA_NAMESPACE_URI,
+    SUBSCRIBE_NODES,
+    DEFAULT_SUBSCRIPTION,
+)
+from .delivery import start_delivery, deliver_event
 
 
 # OPC UA 서버가 끊겼을 때 재접속까지 기다리는 시간 (초)
 RECONNECT_DELAY_SEC = 10
 
 
+def _to_epoch(ts):
+    """asyncua DataValue 타임스탬프(datetime, UTC) → epoch 초"""
+    if ts is None:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _event_meta(node, data) -> dict:
+    """datachange 의 DataValue 에서 노드 ID / Source·Server 타임스탬프 추출"""
+    meta = {"node_id": node.nodeid.to_string(), "received_ts": time.time()}
+    try:
+        dv = data.monitored_item.Value
+        meta["source_ts"] = _to_epoch(dv.SourceTimestamp)
+        meta["server_ts"] = _to_epoch(dv.ServerTimestamp)
+    except AttributeError:
+        pass
+    return meta
+
+
 class SubHandler:
     """
     OPC UA Subscription Handler
 
-    - datachange_notification: 노드 값 변경 이벤트 → Flask 내부 API(webhook) 호출
+    - datachange_notification: 노드 값 변경 이벤트 → 이벤트 핸들러로 전달 (webhook / unix socket / embedded)
     - status_change_notification: 구독/세션 상태 변화 이벤트 → 재접속 트리거
     """
 
@@ -27,6 +56,7 @@ class SubHandler:
 
     # 노드 값 변경 콜백
     def datachange_notification(self, node, val, data):
+        meta = _event_meta(node, data)
         info = self.node_info_map.get(node.nodeid)
         if not info:
             print(f"[OPCUA] unknown node {node}, val={val}")
@@ -36,8 +66,8 @@ class SubHandler:
         webhook_path = info["webhook"]
         print(f"[OPCUA] {name} changed -> {val} (webhook={webhook_path})")
 
-        # 비동기 webhook 호출
-        self.loop.create_task(call_webhook(name, val, webhook_path))
+        # 비동기 이벤트 전달 (EVENT_DELIVERY: http / unix / embedded)
+        self.loop.create_task(deliver_event(name, val, webhook_path, meta))
 
     # 구독/세션 상태 변화 콜백
     def status_change_notification(self, status):
@@ -51,13 +81,54 @@ class SubHandler:
         self.loop.call_soon_threadsafe(self.disconnect_event.set)
 
 
+def _subscription_options(conf: dict) -> dict:
+    """노드 config 의 "subscription" 설정을 DEFAULT_SUBSCRIPTION 위에 덮어쓴 결과"""
+    opts = dict(DEFAULT_SUBSCRIPTION)
+    opts.update(conf.get("subscription") or {})
+    return opts
+
+
+def _make_deadband_filter(deadband):
+    """
+    deadband 설정 → ua.DataChangeFilter
+    예: {"type": "absolute", "value": 0.5} / {"type": "percent", "value": 2}
+    """
+    if not deadband:
+        return None
+
+    mfilter = ua.DataChangeFilter()
+    # 값 또는 상태가 바뀌었을 때만 알림
+    mfilter.Trigger = ua.DataChangeTrigger.StatusValue
+    if deadband.get("type", "absolute") == "percent":
+        mfilter.DeadbandType = ua.DeadbandType.Percent
+    else:
+        mfilter.DeadbandType = ua.DeadbandType.Absolute
+    mfilter.DeadbandValue = float(deadband["value"])
+    return mfilter
+
+
+def _make_monitored_item_request(sub, node, opts: dict):
+    """노드별 sampling / queue / discard / deadband 를 반영한 MonitoredItem 요청 생성"""
+    req = sub._make_monitored_item_request(
+        node,
+        ua.AttributeIds.Value,
+        _make_deadband_filter(opts.get("deadband")),
+        opts["queue_size"],
+        ua.MonitoringMode.Reporting,
+        opts["sampling_interval"],
+    )
+    req.RequestedParameters.DiscardOldest = bool(opts["discard_oldest"])
+    return req
+
+
 async def run_single_session(client: Client):
     """
     한 번의 OPC UA 세션을 구성한다.
 
     1. namespace index 조회
     2. SUBSCRIBE_NODES 기준으로 Node 찾기
-    3. Subscription 생성 + datachange 구독
+    3. publishing_interval 별로 Subscription 생성 + 노드별 MonitoredItem 등록
+       (sampling_interval / queue_size / discard_oldest / deadband)
     4. status_change_notification 에서 disconnect_event 가 set 될 때까지 대기
 
     서버가 내려가거나, 세션/구독 상태가 바뀌면 status_change_notification 이 호출되어
@@ -69,23 +140,34 @@ async def run_single_session(client: Client):
     idx = await client.get_namespace_index(OPCUA_NAMESPACE_URI)
 
     node_info_map = {}
-    nodes = []
+    # publishing_interval(ms) -> [(node, conf, opts), ...]
+    groups = {}
 
     # config에 정의된 모든 노드 구독 준비
     for conf in SUBSCRIBE_NODES:
         path = [p.format(idx=idx) for p in conf["browse_path"]]
         node = await client.nodes.root.get_child(path)
-        nodes.append(node)
         node_info_map[node.nodeid] = conf
-        print(f"[OPCUA] subscribe target: {conf['name']} -> {node}")
+        opts = _subscription_options(conf)
+        groups.setdefault(opts["publishing_interval"], []).append((node, conf, opts))
+        print(f"[OPCUA] subscribe target: {conf['name']} -> {node} ({opts})")
 
     # 세션 종료 트리거용 이벤트
     disconnect_event = asyncio.Event()
 
-    # 구독 핸들러 등록
+    # 구독 핸들러 등록 (모든 Subscription 이 같은 핸들러 공유)
     handler = SubHandler(node_info_map, disconnect_event, loop)
-    sub = await client.create_subscription(500, handler)  # 500 ms 주기
-    await sub.subscribe_data_change(nodes)
+
+    for publishing_interval, items in sorted(groups.items()):
+        sub = await client.create_subscription(publishing_interval, handler)
+        requests = [_make_monitored_item_request(sub, node, opts) for node, _, opts in items]
+        results = await sub.create_monitored_items(requests)
+
+        for (_, conf, _), result in zip(items, results):
+            if isinstance(result, ua.StatusCode):
+                print(f"[OPCUA] monitored item failed: {conf['name']} -> {result}")
+
+        print(f"[OPCUA] subscription {publishing_interval} ms: {[c['name'] for _, c, _ in items]}")
 
     print("[OPCUA] subscription started")
 
@@ -103,6 +185,8 @@ async def run_opcua_worker():
     - 연결되면 run_single_session() 으로 구독 및 이벤트 처리
     - 서버 재부팅 / 세션 에러 등으로 끊기면 10초 후 재접속
     """
+    await start_delivery()
+
     while True:
         client = Client(url=OPCUA_SERVER_URL)
 
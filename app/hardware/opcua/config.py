@@ -1,12 +1,79 @@
 # app/hardware/opcua/config.py
 
+import os
+
 OPCUA_SERVER_URL = "opc.tcp://172.30.1.61:0630/freeopcua/server/"
 # OPCUA_NAMESPACE_URI = "http://synchrobots.com/interfaces"
 OPCUA_NAMESPACE_URI = "http://examples.freeopcua.github.io"
 
+# sender.py Method 호출용 세션 풀
+OPCUA_POOL_SIZE = 2               # 동시에 유지할 세션 수
+OPCUA_CALL_TIMEOUT_SEC = 3.0      # Method 호출 1건 timeout
+OPCUA_HEALTH_CHECK_SEC = 10.0     # 이 시간 이상 쉰 세션은 사용 전/주기적으로 점검
+OPCUA_COMMAND_TIMEOUT_SEC = 8.0   # 동기 명령(write_*) 전체 대기 한도 (세션 대기 + 재접속 + 호출)
+OPCUA_BREAKER_FAILURES = 2        # 연결/timeout 오류가 연속 이만큼 나면 circuit open (명령 즉시 실패)
+OPCUA_BREAKER_PROBE_SEC = 5.0     # open 상태에서 백그라운드 재접속 시도 주기
+
+# 장비 명령 게이트 (app/services/command_gate.py)
+COMMAND_DEDUP_WINDOW_SEC = 1.0    # 같은 장비에 같은 명령이 이 시간 안에 또 오면 생략
+COMMAND_RATE_LIMIT = {            # 장비별 token bucket (rate: 초당 명령 수, burst: 최대 연속)
+    "default": {"rate": 2.0, "burst": 4},
+    # "AMR01": {"rate": 1.0, "burst": 2},
+}
+
 # Flask 서버 베이스 URL (같은 서버라면 127.0.0.1)
 API_BASE = "http://172.30.1.29:80"
 
+# 워커 → Flask 이벤트 전달 방식
+#  - "http"     : API_BASE 로 JSON webhook POST (기본)
+#  - "unix"     : 같은 호스트의 Flask 프로세스로 Unix 도메인 소켓 + 바이너리 프레임 전달
+#  - "embedded" : 워커 프로세스 안에서 Flask 앱을 띄우고 핸들러를 직접 실행
+EVENT_DELIVERY = os.getenv("OPCUA_EVENT_DELIVERY", "http")
+EVENT_SOCKET_PATH = os.getenv("OPCUA_EVENT_SOCKET", "/tmp/synchrobots_events.sock")
+
+# ─────────────────────────────────────
+# 구독 튜닝 기본값
+#  - 각 SUBSCRIBE_NODES 항목의 "subscription" 키로 노드별 override 가능
+#  - publishing_interval 이 같은 노드끼리 하나의 Subscription 으로 묶인다
+#  - publishing_interval / sampling_interval 단위: ms
+#  - queue_size: 서버 측 MonitoredItem 큐 길이 (0/1 = 최신 값만)
+#  - discard_oldest: 큐가 넘칠 때 오래된 값부터 버릴지 여부
+#  - deadband: None 또는 {"type": "absolute" | "percent", "value": float}
+#              (숫자형 노드 전용, 변화량이 value 이하이면 알림 생략)
+# ─────────────────────────────────────
+DEFAULT_SUBSCRIPTION = {
+    "publishing_interval": 500,
+    "sampling_interval": 0,
+    "queue_size": 0,
+    "discard_oldest": True,
+    "deadband": None,
+}
+
+# 센서 트리거처럼 지연에 민감한 노드용 (엣지를 놓치지 않도록 큐 유지)
+FAST_TRIGGER_SUBSCRIPTION = {
+    "publishing_interval": 50,
+    "sampling_interval": 50,
+    "queue_size": 10,
+    "discard_oldest": False,
+}
+
+# 상태/완료 알림용
+STATE_SUBSCRIPTION = {
+    "publishing_interval": 100,
+    "sampling_interval": 100,
+    "queue_size": 5,
+    "discard_oldest": False,
+}
+
+# 배터리/속도 등 잦은 텔레메트리용 예시 (deadband 로 잡음 제거)
+TELEMETRY_SUBSCRIPTION = {
+    "publishing_interval": 1000,
+    "sampling_interval": 250,
+    "queue_size": 1,
+    "discard_oldest": True,
+    "deadband": {"type": "absolute", "value": 0.5},
+}
+
 # ─────────────────────────────────────
 # 여기만 수정해서 구독 노드들을 관리
 # ─────────────────────────────────────
@@ -18,12 +85,14 @@ SUBSCRIBE_NODES = [
         "name": "conveyor_sensor_check",
         "browse_path": ["0:Objects", "{idx}:PLC", "{idx}:read_conveyor_sensor_check"],
         "webhook": "/api/v1/plc/conveyor_sensor_check",  
+        "subscription": FAST_TRIGGER_SUBSCRIPTION,
     },
     #로봇암 센서 체크 - AMR : write_amr_go_move("pick_up_zone"), ARM : write_arm_go_move("go_home")
     {
         "name": "robotarm_sensor_check",
         "browse_path": ["0:Objects", "{idx}:PLC", "{idx}:read_robotarm_sensor_check"],
         "webhook": "/api/v1/plc/robotarm_sensor_check",  
+        "subscription": FAST_TRIGGER_SUBSCRIPTION,
     },
 
 
@@ -33,18 +102,21 @@ SUBSCRIBE_NODES = [
         "name": "arm_img",
         "browse_path": ["0:Objects", "{idx}:ARM", "{idx}:read_arm_img"],
         "webhook": "/api/v1/arm/arm_img",
+        "subscription": STATE_SUBSCRIPTION,
     },
     # # Place 단건 수행 완료 알림 - PLC : write_ready_state()
     {
         "name": "arm_place_single",
         "browse_path": ["0:Objects", "{idx}:ARM", "{idx}:read_arm_place_single"],
         "webhook": "/api/v1/arm/arm_place_single", 
+        "subscription": STATE_SUBSCRIPTION,
     },
     #  # Place 전체 수행 완료 알림 - AMR : write_amr_go_positions("{"object_info" : "['esp32','motordriver','powersuplpy']"}")
     {
         "name": "arm_place_completed",
         "browse_path": ["0:Objects", "{idx}:ARM", "{idx}:read_arm_place_completed"],
         "webhook": "/api/v1/arm/arm_place_completed", 
+        "subscription": STATE_SUBSCRIPTION,
     },
 
 
@@ -57,6 +129,15 @@ SUBSCRIBE_NODES = [
         "name": "amr_mission_state",
         "browse_path": ["0:Objects", "{idx}:AMR", "{idx}:read_amr_mission_state"],
         "webhook": "/api/v1/amr/amr_mission_state",  
+        "subscription": STATE_SUBSCRIPTION,
     },
 
+    # 텔레메트리 예시 (서버에 노드가 생기면 주석 해제)
+    # {
+    #     "name": "amr_battery_pct",
+    #     "browse_path": ["0:Objects", "{idx}:AMR", "{idx}:read_amr_battery_pct"],
+    #     "webhook": "/api/v1/amr/amr_battery_pct",
+    #     "subscription": TELEMETRY_SUBSCRIPTION,
+    # },
+
 ]
\ No newline at end of file
@@ -0,0 +1,199 @@
+# app/hardware/opcua/delivery.py
+"""
+OPC UA 워커 → 이벤트 핸들러 전달 경로 선택
+
+EVENT_DELIVERY
+  - "http"     : call_webhook (JSON over HTTP, 기존 방식)
+  - "unix"     : UnixEventClient (Unix 도메인 소켓 + ipc 바이너리 프레임)
+                 소켓 연결 실패 시 HTTP webhook 으로 fallback
+  - "embedded" : EmbeddedDispatcher (워커 프로세스 안의 Flask 앱에서 핸들러 직접 실행)
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import EVENT_DELIVERY, EVENT_SOCKET_PATH
+from .ipc import HEADER, KIND_EVENT, KIND_REPLY, encode_frame, parse_header, decode_body
+from .webhook import call_webhook
+
+# 핸들러 응답 대기 시간 (webhook timeout 과 동일)
+DELIVERY_TIMEOUT_SEC = 5
+
+
+class UnixEventClient:
+    """
+    Flask 프로세스의 EventSocketServer 로 이벤트를 보내는 클라이언트.
+    연결 하나를 유지하고 request_id 로 응답을 매칭하므로 여러 이벤트를 동시에 보낼 수 있다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._pending = {}
+        self._next_id = 0
+        self._connect_lock = asyncio.Lock()
+
+    async def connect(self):
+        """연결이 없으면 새로 연결 (이미 연결돼 있으면 그대로)"""
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            # 닫히는 중인 이전 연결: 수신 태스크를 멈추고 그 연결로 보낸 요청은 실패 처리
+            if self._reader_task is not None:
+                self._reader_task.cancel()
+                self._reader_task = None
+            self._reset(ConnectionError("unix event socket reconnecting"))
+
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            self._reader, self._writer = reader, writer
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_replies(reader, writer))
+            print(f"[OPCUA] unix event socket connected: {self.path}")
+
+    async def _read_replies(self, reader, writer):
+        """연결 1개의 응답 수신 (reader / writer 는 이 태스크를 만든 연결)"""
+        try:
+            while True:
+                kind, request_id, body_len = parse_header(await reader.readexactly(HEADER.size))
+                msg = decode_body(await reader.readexactly(body_len))
+                fut = self._pending.pop(request_id, None)
+                if kind == KIND_REPLY and fut is not None and not fut.done():
+                    fut.set_result(msg)
+        except Exception as e:
+            print(f"[OPCUA] unix event socket closed: {e}")
+        finally:
+            writer.close()
+            # 그 사이 새로 연결했으면 새 연결의 상태 / 대기 요청은 건드리지 않음
+            if self._writer is writer:
+                self._reset(ConnectionError("unix event socket closed"))
+
+    def _reset(self, exc: Exception):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def send(self, name: str, value, meta: dict = None, timeout: float = DELIVERY_TIMEOUT_SEC) -> dict:
+        """이벤트 1건 전송 후 {"status": int, "body": dict} 응답 반환"""
+        await self.connect()
+
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        request_id = self._next_id
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = fut
+
+        try:
+            self._writer.write(encode_frame(KIND_EVENT, request_id, {"event": name, "value": value, "meta": meta}))
+            await self._writer.drain()
+            return await asyncio.wait_for(fut, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self._reset(ConnectionError("client closed"))
+
+
+class EmbeddedDispatcher:
+    """
+    워커 프로세스 안에서 Flask 앱을 만들고, 핸들러를 스레드 풀에서 app context 로 실행한다.
+    (핸들러가 DB / 동기 OPC UA 호출을 하므로 이벤트 루프를 막지 않도록 executor 사용)
+    앱은 DB 연결 + 이벤트 핸들러만 (집계 / 보관 / writer / 대시보드 피드 등은 웹 서버 프로세스에서만 실행)
+    스키마(create_all + 마이그레이션)는 웹 서버와 같은 init_schema() 로 준비
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedded-event")
+        self.app = None
+
+    def _load_app(self):
+        if self.app is None:
+            from app import create_db_app, init_schema
+            from app.services.event_ingest import ingest_index
+            from app.services.event_router import init_event_routes
+
+            app = create_db_app("opcua_embedded")
+            # 웹 서버보다 먼저 뜬 경우에도 event_ingest_state 등 테이블 / 마이그레이션이 있도록
+            init_schema(app)
+            init_event_routes(app)
+            # 이 모드에서는 이벤트를 이 프로세스만 처리하므로 중복 필터 인덱스도 여기서 유지
+            ingest_index.start(app)
+            self.app = app
+        return self.app
+
+    async def start(self):
+        from .sender import sender_service
+
+        # 핸들러가 보내는 OPC UA 명령도 워커 루프에서 처리 (별도 스레드/루프 불필요)
+        await sender_service.start_in_running_loop()
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self._load_app)
+        print("[OPCUA] embedded event handlers ready")
+
+    def _dispatch(self, name: str, value, meta: dict = None):
+        from app.services.event_router import dispatch_event
+
+        with self._load_app().app_context():
+            body, status = dispatch_event(name, value, meta)
+        return {"status": status, "body": body}
+
+    async def send(self, name: str, value, meta: dict = None) -> dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._dispatch, name, value, meta)
+
+
+_unix_client = None
+_embedded = None
+
+
+async def start_delivery():
+    """워커 시작 시 1회 호출 (embedded 모드면 Flask 앱 미리 로드)"""
+    global _unix_client, _embedded
+
+    print(f"[OPCUA] event delivery mode: {EVENT_DELIVERY}")
+    if EVENT_DELIVERY == "unix":
+        _unix_client = UnixEventClient(EVENT_SOCKET_PATH)
+    elif EVENT_DELIVERY == "embedded":
+        _embedded = EmbeddedDispatcher()
+        await _embedded.start()
+
+
+async def deliver_event(name: str, value, path: str, meta: dict = None):
+    """
+    OPC UA 에서 받은 값을 설정된 방식으로 핸들러에 전달
+    meta 에 전달 시작 시각(dispatched_ts)을 기록해서 워커 내부 대기 시간을 측정할 수 있게 한다.
+    """
+    meta = dict(meta or {})
+    meta["dispatched_ts"] = time.time()
+
+    if _embedded is not None:
+        try:
+            resp = await _embedded.send(name, value, meta)
+            print(f"[OPCUA] embedded {name} -> {resp['status']}, resp={resp['body']}")
+        except Exception as e:
+            print(f"[OPCUA] embedded dispatch error ({name}): {e}")
+        return
+
+    if _unix_client is not None:
+        try:
+            await _unix_client.connect()
+        except OSError as e:
+            # 소켓 서버가 없는 경우 → HTTP 로 fallback (아직 보내지 않았으므로 중복 없음)
+            print(f"[OPCUA] unix connect failed ({name}): {e}, fallback to webhook")
+        else:
+            try:
+                resp = await _unix_client.send(name, value, meta)
+                print(f"[OPCUA] unix {name} -> {resp['status']}, resp={resp['body']}")
+            except Exception as e:
+                print(f"[OPCUA] unix delivery error ({name}): {e}")
+            return
+
+    await call_webhook(name, value, path, meta)
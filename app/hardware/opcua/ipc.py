@@ -0,0 +1,144 @@
+# app/hardware/opcua/ipc.py
+"""
+OPC UA 워커 ↔ Flask 간 Unix 도메인 소켓 이벤트 전달용 프레이밍/인코딩
+
+프레임 = 헤더(11B) + body
+  헤더: MAGIC(2B "SB") | kind(u8) | request_id(u32) | body_len(u32)   (network byte order)
+  body: 태그 1바이트 + 값 (None/bool/int/float/str/bytes/list/dict 재귀 인코딩)
+
+이벤트 body: {"event": name, "value": value}
+응답   body: {"status": http_status, "body": dict}
+"""
+
+import struct
+
+MAGIC = b"SB"
+KIND_EVENT = 1
+KIND_REPLY = 2
+
+HEADER = struct.Struct("!2sBII")
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+_U32 = struct.Struct("!I")
+_I64 = struct.Struct("!q")
+_F64 = struct.Struct("!d")
+
+(
+    _T_NONE,
+    _T_FALSE,
+    _T_TRUE,
+    _T_INT,
+    _T_FLOAT,
+    _T_STR,
+    _T_BYTES,
+    _T_LIST,
+    _T_DICT,
+) = range(9)
+
+_I64_MIN = -(1 << 63)
+_I64_MAX = (1 << 63) - 1
+
+
+class FrameError(Exception):
+    """잘못된 프레임 / 디코딩 실패"""
+
+
+def _encode(value, out: bytearray):
+    if value is None:
+        out.append(_T_NONE)
+    elif value is True:
+        out.append(_T_TRUE)
+    elif value is False:
+        out.append(_T_FALSE)
+    elif isinstance(value, int) and _I64_MIN <= value <= _I64_MAX:
+        out.append(_T_INT)
+        out += _I64.pack(value)
+    elif isinstance(value, float):
+        out.append(_T_FLOAT)
+        out += _F64.pack(value)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_T_BYTES)
+        out += _U32.pack(len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out.append(_T_LIST)
+        out += _U32.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out.append(_T_DICT)
+        out += _U32.pack(len(value))
+        for k, v in value.items():
+            _encode(str(k), out)
+            _encode(v, out)
+    else:
+        # str 및 그 외 타입(datetime, 큰 정수 등)은 문자열로 전달
+        raw = str(value).encode("utf-8")
+        out.append(_T_STR)
+        out += _U32.pack(len(raw))
+        out += raw
+
+
+def _decode(buf, pos: int):
+    tag = buf[pos]
+    pos += 1
+
+    if tag == _T_NONE:
+        return None, pos
+    if tag == _T_TRUE:
+        return True, pos
+    if tag == _T_FALSE:
+        return False, pos
+    if tag == _T_INT:
+        return _I64.unpack_from(buf, pos)[0], pos + _I64.size
+    if tag == _T_FLOAT:
+        return _F64.unpack_from(buf, pos)[0], pos + _F64.size
+
+    (n,) = _U32.unpack_from(buf, pos)
+    pos += _U32.size
+
+    if tag == _T_STR:
+        return bytes(buf[pos:pos + n]).decode("utf-8"), pos + n
+    if tag == _T_BYTES:
+        return bytes(buf[pos:pos + n]), pos + n
+    if tag == _T_LIST:
+        items = []
+        for _ in range(n):
+            item, pos = _decode(buf, pos)
+            items.append(item)
+        return items, pos
+    if tag == _T_DICT:
+        result = {}
+        for _ in range(n):
+            k, pos = _decode(buf, pos)
+            v, pos = _decode(buf, pos)
+            result[k] = v
+        return result, pos
+
+    raise FrameError(f"unknown tag: {tag}")
+
+
+def encode_frame(kind: int, request_id: int, obj) -> bytes:
+    body = bytearray()
+    _encode(obj, body)
+    return HEADER.pack(MAGIC, kind, request_id, len(body)) + bytes(body)
+
+
+def parse_header(header: bytes):
+    """헤더 11바이트 → (kind, request_id, body_len)"""
+    magic, kind, request_id, body_len = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise FrameError(f"bad magic: {magic!r}")
+    if body_len > MAX_BODY_SIZE:
+        raise FrameError(f"frame too large: {body_len}")
+    return kind, request_id, body_len
+
+
+def decode_body(body: bytes):
+    try:
+        obj, pos = _decode(body, 0)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise FrameError(f"decode error: {e}") from e
+    if pos != len(body):
+        raise FrameError("trailing bytes in frame")
+    return obj
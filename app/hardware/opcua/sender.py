@@ -1,76 +1,126 @@
 # app/hardware/opcua/sender.py
 import asyncio
 import json
-from asyncua import Client, ua
-from .config import OPCUA_SERVER_URL, OPCUA_NAMESPACE_URI
+from asyncua import ua
+from .config import (
+    OPCUA_SERVER_URL,
+    OPCUA_NAMESPACE_URI,
+    OPCUA_POOL_SIZE,
+    OPCUA_CALL_TIMEOUT_SEC,
+    OPCUA_HEALTH_CHECK_SEC,
+    OPCUA_COMMAND_TIMEOUT_SEC,
+    OPCUA_BREAKER_FAILURES,
+    OPCUA_BREAKER_PROBE_SEC,
+)
+from .circuit_breaker import CircuitOpenError, get_breaker
+from .session_pool import OpcUaSessionPool
+from .sender_service import SenderService
 
 # ==============================================================
-# OPC UA NodeId 상수 (예시 값이므로 실제 서버 NodeId로 교체 필요)
+# OPC UA 노드 browse path (Objects 폴더 기준, OPCUA_NAMESPACE_URI 의 BrowseName)
 # ==============================================================
+# NodeId 는 서버 주소공간을 재생성할 때마다 바뀔 수 있으므로 BrowseName 경로로 지정하고,
+# 실제 NodeId 는 세션 풀이 세션별로 1회 조회해서 캐시한다 (session_pool.OpcUaSession.resolve).
+# "ns=2;i=15" 같은 NodeId 문자열을 넣어도 그대로 동작한다.
 
 # AMR
-AMR_NODE_ID = "ns=2;i=1"                 # 예시: AMR 관련 Object 노드
-AMR_GO_MOVE_METHOD_NODE_ID = "ns=2;i=15"        # 예시: write_amr_go_move 메서드 노드
-AMR_GO_POSITIONS_METHOD_NODE_ID = "ns=2;i=16"   # 예시: write_amr_go_positions 메서드 노드
+AMR_OBJECT_PATH = "AMR"
+AMR_GO_MOVE_METHOD_PATH = "AMR/write_amr_go_move"
+AMR_GO_POSITIONS_METHOD_PATH = "AMR/write_amr_go_positions"
 
 # ARM
-ARM_NODE_ID = "ns=2;i=3"                 # 예시: ARM 관련 Object 노드
-ARM_GO_MOVE_METHOD_NODE_ID = "ns=2;i=23"        # 예시: write_arm_go_move 메서드 노드
+ARM_OBJECT_PATH = "ARM"
+ARM_GO_MOVE_METHOD_PATH = "ARM/write_arm_go_move"
 
 # PLC
-PLC_NODE_ID = "ns=2;i=2"                 # 예시: PLC 관련 Object 노드
-PLC_OK_NG_METHOD_NODE_ID = "ns=2;i=19"          # 예시: write_ok_ng_value 메서드 노드
-PLC_READY_STATE_METHOD_NODE_ID = "ns=2;i=20"    # 예시: write_ready_state 메서드 노드
+PLC_OBJECT_PATH = "PLC"
+PLC_OK_NG_METHOD_PATH = "PLC/write_ok_ng_value"
+PLC_READY_STATE_METHOD_PATH = "PLC/write_ready_state"
+
+# action_type(control_logs.action_type 과 동일) → (Object path, Method path, 장비 key)
+# 배치 호출(write_batch)에서 사용
+METHOD_TABLE = {
+    "amr_go_move": (AMR_OBJECT_PATH, AMR_GO_MOVE_METHOD_PATH, "AMR"),
+    "amr_go_positions": (AMR_OBJECT_PATH, AMR_GO_POSITIONS_METHOD_PATH, "AMR"),
+    "arm_go_move": (ARM_OBJECT_PATH, ARM_GO_MOVE_METHOD_PATH, "ARM"),
+    "ok_ng_value": (PLC_OBJECT_PATH, PLC_OK_NG_METHOD_PATH, "PLC"),
+    "ready_state": (PLC_OBJECT_PATH, PLC_READY_STATE_METHOD_PATH, "PLC"),
+}
+
+
+# ==============================================================
+# 명령 전송 서비스 (세션 풀 + 전용 이벤트 루프)
+# ==============================================================
+# asyncua 세션은 이벤트 루프에 묶이므로 호출마다 asyncio.run() 을 쓰지 않고,
+# SenderService 의 루프 1개 위에서 풀을 유지하며 모든 Method 호출을 처리한다.
+
+def _make_pool():
+    return OpcUaSessionPool(
+        OPCUA_SERVER_URL,
+        OPCUA_NAMESPACE_URI,
+        size=OPCUA_POOL_SIZE,
+        call_timeout=OPCUA_CALL_TIMEOUT_SEC,
+        health_check_sec=OPCUA_HEALTH_CHECK_SEC,
+        breaker=get_breaker(
+            OPCUA_SERVER_URL,
+            failure_threshold=OPCUA_BREAKER_FAILURES,
+            probe_interval=OPCUA_BREAKER_PROBE_SEC,
+        ),
+    )
+
+
+sender_service = SenderService(_make_pool)
 
 
 # ==============================================================
 # 공통 Method Call 헬퍼
 # ==============================================================
 
-async def _call_method(object_node_id: str, method_node_id: str, arguments: list, debug_label: str = ""):
+async def _call_method(pool, object_path: str, method_path: str, arguments: list, debug_label: str = ""):
     """
-    공통 OPC UA Method 호출 유틸리티
-    - object_node_id: Object 노드 NodeId 문자열
-    - method_node_id: Method 노드 NodeId 문자열
+    공통 OPC UA Method 호출 유틸리티 (세션 풀 사용)
+    - object_path: Object 노드 browse path (예: "AMR")
+    - method_path: Method 노드 browse path (예: "AMR/write_amr_go_move")
     - arguments: ua.Variant 리스트
     """
-    client = Client(url=OPCUA_SERVER_URL)
+    print(f"[OPCUA] {debug_label} call: obj={object_path}, method={method_path}, args={arguments}")
 
     try:
-        await client.connect()
-        print(f"[OPCUA] connected for {debug_label or 'method'}")
-
-        # 필요시 네임스페이스 인덱스 확인 (디버그용)
-        idx = await client.get_namespace_index(OPCUA_NAMESPACE_URI)
-        print(f"[OPCUA] namespace index = {idx}")
+        result = await pool.call_method(object_path, method_path, arguments)
+    except asyncio.TimeoutError:
+        print(f"[OPCUA] {debug_label} timeout ({OPCUA_CALL_TIMEOUT_SEC}s)")
+        raise
+    except Exception as e:
+        print(f"[OPCUA] {debug_label} error: {e}")
+        raise
 
-        obj_node = client.get_node(object_node_id)
-        method_node = client.get_node(method_node_id)
+    # 서버에서 (bool, string) 튜플을 주는 경우를 우선 가정
+    try:
+        is_success, status_message = result
+        print(f"[OPCUA] {debug_label} result: success={is_success}, msg='{status_message}'")
+    except Exception:
+        print(f"[OPCUA] {debug_label} raw result: {result}")
 
-        print(f"[OPCUA] obj_node    = {obj_node}")
-        print(f"[OPCUA] method_node = {method_node}")
-        print(f"[OPCUA] arguments   = {arguments}")
+    return result
 
-        result = await obj_node.call_method(method_node, *arguments)
 
-        # 서버에서 (bool, string) 튜플을 주는 경우를 우선 가정
-        try:
-            is_success, status_message = result
-            print(f"[OPCUA] {debug_label} result: success={is_success}, msg='{status_message}'")
-        except Exception:
-            print(f"[OPCUA] {debug_label} raw result: {result}")
+def _send(coro_fn, payload: dict, key: str, label: str, wait: bool = True, timeout: float = None):
+    """
+    동기 래퍼 공통 실행부.
+    - wait=True : 결과까지 대기 (timeout 기본 OPCUA_COMMAND_TIMEOUT_SEC, 초과 시 TimeoutError)
+    - wait=False: fire-and-forget, concurrent.futures.Future 반환
+    key 가 같은 명령(같은 장비)은 순서대로 처리된다.
+    서버 다운으로 breaker 가 열려 있으면 루프로 넘기지도 않고 바로 CircuitOpenError.
+    """
+    pool = sender_service.pool
+    if pool is not None and pool.breaker.is_open:
+        raise CircuitOpenError(f"OPC UA server unreachable ({pool.url}), {label} skipped")
 
-        return result
-
-    except Exception as e:
-        print(f"[OPCUA] {debug_label} error: {e}")
-        raise
-    finally:
-        try:
-            await client.disconnect()
-        except Exception:
-            pass
-        print(f"[OPCUA] disconnected ({debug_label})")
+    if wait:
+        return sender_service.call(
+            coro_fn, payload, key=key, timeout=timeout or OPCUA_COMMAND_TIMEOUT_SEC
+        )
+    return sender_service.fire_and_forget(coro_fn, payload, key=key, label=label)
 
 
 # ==============================================================
@@ -78,44 +128,48 @@ async def _call_method(object_node_id: str, method_node_id: str, arguments: list
 # ==============================================================
 
 # AMR 이동명령
-async def _write_amr_go_move_async(payload: dict):
+async def _write_amr_go_move_async(pool, payload: dict):
     """
     AMR 이동명령 Method 호출 (예: {"move_command": "go_home"} 등 JSON)
     """
     # 서버 Method 시그니처: (String json_command) 가정
     json_str = json.dumps(payload, ensure_ascii=False)
     args = [ua.Variant(json_str, ua.VariantType.String)]
-    await _call_method(
-        AMR_NODE_ID,
-        AMR_GO_MOVE_METHOD_NODE_ID,
+    return await _call_method(
+        pool,
+        AMR_OBJECT_PATH,
+        AMR_GO_MOVE_METHOD_PATH,
         args,
         debug_label="AMR go_move"
     )
 
 
-def write_amr_go_move(payload: dict):
+def write_amr_go_move(payload: dict, wait: bool = True, timeout: float = None):
     """
     동기 컨텍스트(Flask API 등)에서 호출할 래퍼.
-    내부에서는 async Method 호출을 수행.
+    Method 호출은 sender_service 루프에서 수행되고,
+    wait=True 면 결과를 기다리고(timeout), wait=False 면 Future 를 바로 반환한다.
+    (아래 write_* 래퍼 모두 동일)
     """
-    asyncio.run(_write_amr_go_move_async(payload))
+    return _send(_write_amr_go_move_async, payload, key="AMR", label="AMR go_move", wait=wait, timeout=timeout)
 
 
 # AMR 운송 시작(운송물품 JSON으로 전달)
-async def _write_amr_go_positions_async(payload: dict):
+async def _write_amr_go_positions_async(pool, payload: dict):
 
     json_str = json.dumps(payload, ensure_ascii=False)
     args = [ua.Variant(json_str, ua.VariantType.String)]
-    await _call_method(
-        AMR_NODE_ID,
-        AMR_GO_POSITIONS_METHOD_NODE_ID,
+    return await _call_method(
+        pool,
+        AMR_OBJECT_PATH,
+        AMR_GO_POSITIONS_METHOD_PATH,
         args,
         debug_label="AMR go_positions"
     )
 
 
-def write_amr_go_positions(payload: dict):
-    asyncio.run(_write_amr_go_positions_async(payload))
+def write_amr_go_positions(payload: dict, wait: bool = True, timeout: float = None):
+    return _send(_write_amr_go_positions_async, payload, key="AMR", label="AMR go_positions", wait=wait, timeout=timeout)
 
 
 # ==============================================================
@@ -126,22 +180,23 @@ def write_amr_go_positions(payload: dict):
 # "go_home"(초기위치 이동),
 # "mission_start" (센서 체크시 - 작업실행),
 # "stop" (정지)
-async def _write_arm_go_move_async(payload: dict):
+async def _write_arm_go_move_async(pool, payload: dict):
     """
     ARM 이동/상태 명령 (예: {"move_command": "go_home"} / {"move_command": "mission_start"} 등)
     """
     json_str = json.dumps(payload, ensure_ascii=False)
     args = [ua.Variant(json_str, ua.VariantType.String)]
-    await _call_method(
-        ARM_NODE_ID,
-        ARM_GO_MOVE_METHOD_NODE_ID,
+    return await _call_method(
+        pool,
+        ARM_OBJECT_PATH,
+        ARM_GO_MOVE_METHOD_PATH,
         args,
         debug_label="ARM go_move"
     )
 
 
-def write_arm_go_move(payload: dict):
-    asyncio.run(_write_arm_go_move_async(payload))
+def write_arm_go_move(payload: dict, wait: bool = True, timeout: float = None):
+    return _send(_write_arm_go_move_async, payload, key="ARM", label="ARM go_move", wait=wait, timeout=timeout)
 
 
 # ==============================================================
@@ -149,41 +204,103 @@ def write_arm_go_move(payload: dict):
 # ==============================================================
 
 # 컨베이어 센서 체크 후 Anomaly 체크 값 전달
-async def _write_ok_ng_value_async(payload: dict):
+async def _write_ok_ng_value_async(pool, payload: dict):
     """
     컨베이어 센서 체크 후 Anomaly 결과 전달
     예: {"ok_ng": true} 또는 {"result": "OK"} 같은 JSON 문자열을 보내는 형태로 가정
     """
     json_str = json.dumps(payload, ensure_ascii=False)
     args = [ua.Variant(json_str, ua.VariantType.String)]
-    await _call_method(
-        PLC_NODE_ID,
-        PLC_OK_NG_METHOD_NODE_ID,
+    return await _call_method(
+        pool,
+        PLC_OBJECT_PATH,
+        PLC_OK_NG_METHOD_PATH,
         args,
         debug_label="PLC ok_ng_value"
     )
 
 
-def write_ok_ng_value(payload: dict):
-    asyncio.run(_write_ok_ng_value_async(payload))
+def write_ok_ng_value(payload: dict, wait: bool = True, timeout: float = None):
+    return _send(_write_ok_ng_value_async, payload, key="PLC", label="PLC ok_ng_value", wait=wait, timeout=timeout)
 
 
 # PLC 동작 명령
 # 현재는 컨베이러 동작 "state": "c_move"
-async def _write_ready_state_async(payload: dict):
+async def _write_ready_state_async(pool, payload: dict):
     """
     PLC 동작/상태 명령
     예: {"state": "c_move"} / {"state": "stop"} 등 JSON 형태
     """
     json_str = json.dumps(payload, ensure_ascii=False)
     args = [ua.Variant(json_str, ua.VariantType.String)]
-    await _call_method(
-        PLC_NODE_ID,
-        PLC_READY_STATE_METHOD_NODE_ID,
+    return await _call_method(
+        pool,
+        PLC_OBJECT_PATH,
+        PLC_READY_STATE_METHOD_PATH,
         args,
         debug_label="PLC ready_state"
     )
 
 
-def write_ready_state(payload: dict):
-    asyncio.run(_write_ready_state_async(payload))
+def write_ready_state(payload: dict, wait: bool = True, timeout: float = None):
+    return _send(_write_ready_state_async, payload, key="PLC", label="PLC ready_state", wait=wait, timeout=timeout)
+
+
+# ==============================================================
+# 배치 호출 (여러 장비 명령을 Call 요청 1번으로)
+# ==============================================================
+
+async def _write_batch_async(pool, commands: list):
+    """
+    commands: [{"action_type": "amr_go_move", "payload": {...}}, ...]
+    return  : 명령 순서대로 [{"action_type", "ok", "status", "output"}, ...]
+    """
+    calls = []
+    for cmd in commands:
+        object_path, method_path, _ = METHOD_TABLE[cmd["action_type"]]
+        json_str = json.dumps(cmd["payload"], ensure_ascii=False)
+        calls.append((object_path, method_path, [ua.Variant(json_str, ua.VariantType.String)]))
+
+    labels = [c["action_type"] for c in commands]
+    print(f"[OPCUA] batch call: {labels}")
+
+    try:
+        results = await pool.call_methods(calls)
+    except Exception as e:
+        print(f"[OPCUA] batch {labels} error: {e}")
+        raise
+
+    items = []
+    for cmd, res in zip(commands, results):
+        item = {
+            "action_type": cmd["action_type"],
+            "ok": res.StatusCode.is_good(),
+            "status": res.StatusCode.name,
+            "output": [v.Value for v in (res.OutputArguments or [])],
+        }
+        print(f"[OPCUA] batch {cmd['action_type']} result: {item['status']}, output={item['output']}")
+        items.append(item)
+    return items
+
+
+def write_batch(commands: list, wait: bool = True, timeout: float = None):
+    """
+    여러 Method 호출을 OPC UA Call 요청 1번으로 보낸다.
+    예) write_batch([
+            {"action_type": "amr_go_move", "payload": {"move_command": "pick_up_zone"}},
+            {"action_type": "arm_go_move", "payload": {"move_command": "go_home"}},
+        ])
+    요청 자체가 실패하면 예외, 개별 Method 실패는 결과의 ok/status 로 확인.
+    """
+    keys = tuple(METHOD_TABLE[c["action_type"]][2] for c in commands)
+    return _send(_write_batch_async, commands, key=keys, label="batch", wait=wait, timeout=timeout)
+
+
+# action_type → 단건 동기 래퍼 (테이블 기반 이벤트 라우터의 "write" 단계에서 사용)
+WRITERS = {
+    "amr_go_move": write_amr_go_move,
+    "amr_go_positions": write_amr_go_positions,
+    "arm_go_move": write_arm_go_move,
+    "ok_ng_value": write_ok_ng_value,
+    "ready_state": write_ready_state,
+}
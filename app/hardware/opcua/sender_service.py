@@ -0,0 +1,137 @@
+# app/hardware/opcua/sender_service.py
+"""
+OPC UA 명령 전송 서비스
+
+- asyncio 이벤트 루프 1개 위에서 세션 풀과 모든 Method 호출을 처리한다.
+  * Flask 프로세스: start() → 백그라운드 스레드에 전용 루프 생성
+  * OPC UA 워커(embedded 모드): await start_in_running_loop() → 워커 루프를 그대로 사용
+- 다른 스레드(Flask 요청 스레드 등)에서는 run_coroutine_threadsafe 로 명령을 넘긴다.
+  * call()           : 결과를 기다림 (timeout)
+  * fire_and_forget(): Future 만 받고 바로 반환, 실패는 로그로 남김
+- 같은 장비(key) 명령은 순서대로, 다른 장비 명령은 동시에 처리된다.
+"""
+
+import asyncio
+import threading
+import time
+
+from app.utils import metrics
+
+
+class SenderService:
+
+    def __init__(self, pool_factory):
+        """pool_factory: 인자 없이 OpcUaSessionPool 을 만드는 함수"""
+        self._pool_factory = pool_factory
+        self._start_lock = threading.Lock()
+        self.loop = None
+        self.pool = None
+        self._starting = False
+        self._device_locks = {}
+
+    @property
+    def started(self) -> bool:
+        return self.loop is not None
+
+    def start(self):
+        """전용 스레드에 이벤트 루프를 띄우고 세션 풀 시작 (여러 번 호출해도 1회만 동작)"""
+        with self._start_lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="opcua-sender", daemon=True).start()
+
+            pool = self._pool_factory()
+            try:
+                asyncio.run_coroutine_threadsafe(pool.start(), loop).result()
+            except BaseException:
+                # 풀 시작 실패 → 루프 스레드를 남기지 않음 (다음 start() 가 새로 만든다)
+                loop.call_soon_threadsafe(loop.stop)
+                raise
+            self.loop, self.pool = loop, pool
+            print("[OPCUA] sender service started (dedicated loop)")
+
+    async def start_in_running_loop(self):
+        """현재 실행 중인 루프(OPC UA 워커)에 서비스를 붙인다"""
+        with self._start_lock:
+            if self.loop is not None or self._starting:
+                return
+            self._starting = True
+        try:
+            # 풀 시작이 끝난 뒤 loop / pool 을 함께 공개 (started 인데 pool 이 None 인 구간 없음)
+            pool = self._pool_factory()
+            await pool.start()
+            with self._start_lock:
+                self.loop, self.pool = asyncio.get_running_loop(), pool
+        finally:
+            self._starting = False
+        print("[OPCUA] sender service started (worker loop)")
+
+    def _device_lock(self, key):
+        lock = self._device_locks.get(key)
+        if lock is None:
+            lock = self._device_locks[key] = asyncio.Lock()
+        return lock
+
+    async def _run(self, coro_fn, args, key, event):
+        t0 = time.perf_counter()
+        # key 여러 개(배치 명령)면 정렬된 순서로 잠가서 교착 방지
+        keys = sorted(set(key)) if isinstance(key, (list, tuple, set)) else ([] if key is None else [key])
+        acquired = []
+        try:
+            for k in keys:
+                lock = self._device_lock(k)
+                await lock.acquire()
+                acquired.append(lock)
+            return await coro_fn(self.pool, *args)
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+            metrics.observe("opcua_call", time.perf_counter() - t0, event)
+
+    def submit(self, coro_fn, *args, key=None):
+        """
+        coro_fn(pool, *args) 를 서비스 루프에서 실행하고 concurrent.futures.Future 반환
+        key: 같은 key 끼리는 순서대로 실행 (예: 장비 ID, 배치 명령이면 key 튜플)
+        """
+        if self.loop is None:
+            self.start()
+        if self._in_loop_thread():
+            raise RuntimeError("SenderService.submit() called from its own event loop; await the coroutine instead")
+
+        event = metrics.current_event()
+        return asyncio.run_coroutine_threadsafe(self._run(coro_fn, args, key, event), self.loop)
+
+    def call(self, coro_fn, *args, key=None, timeout: float = None):
+        """결과를 기다리는 호출. timeout 초과 시 명령을 취소하고 TimeoutError"""
+        future = self.submit(coro_fn, *args, key=key)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def fire_and_forget(self, coro_fn, *args, key=None, label: str = ""):
+        """결과를 기다리지 않는 호출. 실패는 로그로만 남긴다"""
+        future = self.submit(coro_fn, *args, key=key)
+
+        def _done(f):
+            if f.cancelled():
+                return
+            exc = f.exception()
+            if exc is not None:
+                print(f"[OPCUA] {label or 'command'} (fire-and-forget) failed: {exc}")
+
+        future.add_done_callback(_done)
+        return future
+
+    def _in_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def stop(self):
+        if self.loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.pool.close(), self.loop).result(5)
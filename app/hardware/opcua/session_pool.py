@@ -0,0 +1,339 @@
+# app/hardware/opcua/session_pool.py
+"""
+OPC UA Method 호출용 장기 세션 풀
+
+- 세션(asyncua.Client)을 미리 만들어 두고 재사용 → 호출마다 connect/disconnect 하지 않음
+- namespace index 는 세션 연결 시 1회 조회 후 캐시
+- Object / Method 노드는 browse path("AMR/write_amr_go_move")로 지정하고,
+  세션별로 처음 쓸 때 TranslateBrowsePathsToNodeIds 1번으로 NodeId 를 찾아 캐시
+  (서버 재생성으로 NodeId 가 바뀌어 BadNodeIdUnknown 이 오면 캐시를 비우고 1회 재시도)
+- 오래 쉬었던 세션은 사용 전에 ServerState 읽기로 health check
+- 백그라운드 태스크가 주기적으로 idle 세션을 점검, 끊긴 세션은 다음 사용 시 자동 재접속
+- Method 호출마다 timeout 적용
+- 엔드포인트별 circuit breaker: 서버 다운 중에는 connect timeout 을 기다리지 않고 즉시 실패,
+  백그라운드 probe 가 재접속에 성공하면 시험 호출 1건으로 복구 확인 (circuit_breaker.py)
+
+주의: 풀은 하나의 이벤트 루프에 묶인다 (asyncua 연결이 루프에 종속).
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from asyncua import Client, ua
+
+from .circuit_breaker import CircuitBreaker, get_breaker
+
+# 세션이 죽었다고 판단하는 상태 코드 (이 경우 세션을 버리고 재접속)
+_SESSION_DEAD_CODES = {
+    ua.StatusCodes.BadSessionIdInvalid,
+    ua.StatusCodes.BadSessionClosed,
+    ua.StatusCodes.BadSessionNotActivated,
+    ua.StatusCodes.BadSecureChannelIdInvalid,
+    ua.StatusCodes.BadSecureChannelClosed,
+    ua.StatusCodes.BadConnectionClosed,
+    ua.StatusCodes.BadServerNotConnected,
+    ua.StatusCodes.BadCommunicationError,
+}
+
+
+# 캐시된 NodeId 가 더 이상 유효하지 않다고 판단하는 상태 코드 (캐시 무효화 후 재해석)
+_STALE_NODE_CODES = {
+    ua.StatusCodes.BadNodeIdUnknown,
+    ua.StatusCodes.BadNodeIdInvalid,    # 일부 서버(freeopcua 등)는 없는 Method 에 이 코드를 준다
+    ua.StatusCodes.BadMethodInvalid,
+}
+
+
+# discard() 가 백그라운드로 끊는 중인 연결 (태스크 참조 유지)
+_closing = set()
+
+
+async def _disconnect(client: Client):
+    try:
+        await client.disconnect()
+    except Exception:
+        pass
+
+
+def _is_node_id_string(path: str) -> bool:
+    """"ns=2;i=15" / "i=85" 같은 NodeId 문자열이면 True (browse path 가 아님)"""
+    return path.startswith(("ns=", "nsu=", "i=", "s=", "g=", "b="))
+
+
+def is_session_error(exc: Exception) -> bool:
+    """호출 실패가 세션/연결 문제인지 (True 면 세션 폐기)"""
+    if isinstance(exc, ua.UaStatusCodeError):
+        return exc.code in _SESSION_DEAD_CODES
+    # TimeoutError / ConnectionError / OSError 등 나머지는 연결 문제로 간주
+    return True
+
+
+class OpcUaSession:
+    """풀에 들어가는 세션 1개 (Client + 캐시된 namespace index)"""
+
+    def __init__(self, url: str, namespace_uri: str):
+        self.url = url
+        self.namespace_uri = namespace_uri
+        self.client = None
+        self.ns_idx = None
+        self.node_cache = {}    # browse path -> ua.NodeId (세션 단위 캐시)
+        self.last_used = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None
+
+    async def connect(self):
+        client = Client(url=self.url)
+        await client.connect()
+        try:
+            self.ns_idx = await client.get_namespace_index(self.namespace_uri)
+        except Exception:
+            await client.disconnect()
+            raise
+        self.client = client
+        self.last_used = time.monotonic()
+        print(f"[OPCUA] pool session connected ({self.url}, ns={self.ns_idx})")
+
+    def _browse_path(self, path: str) -> ua.BrowsePath:
+        """"AMR/write_amr_go_move" → Objects 폴더 기준 BrowsePath (각 이름은 설정 namespace)"""
+        rpath = ua.RelativePath()
+        for name in path.strip("/").split("/"):
+            el = ua.RelativePathElement()
+            el.ReferenceTypeId = ua.TwoByteNodeId(ua.ObjectIds.HierarchicalReferences)
+            el.IsInverse = False
+            el.IncludeSubtypes = True
+            el.TargetName = ua.QualifiedName(name, self.ns_idx)
+            rpath.Elements.append(el)
+        bpath = ua.BrowsePath()
+        bpath.StartingNode = ua.TwoByteNodeId(ua.ObjectIds.ObjectsFolder)
+        bpath.RelativePath = rpath
+        return bpath
+
+    async def resolve(self, paths: list) -> list:
+        """
+        browse path(또는 NodeId 문자열) 리스트 → ua.NodeId 리스트
+        캐시에 없는 path 만 모아서 TranslateBrowsePathsToNodeIds 요청 1번으로 조회
+        """
+        missing = [p for p in dict.fromkeys(paths) if p not in self.node_cache and not _is_node_id_string(p)]
+        if missing:
+            results = await self.client.uaclient.translate_browsepaths_to_nodeids(
+                [self._browse_path(p) for p in missing]
+            )
+            for path, res in zip(missing, results):
+                if not res.StatusCode.is_good() or not res.Targets:
+                    raise ua.UaStatusCodeError(res.StatusCode.value)
+                target = res.Targets[0].TargetId
+                self.node_cache[path] = ua.NodeId(target.Identifier, target.NamespaceIndex)
+            print(f"[OPCUA] resolved {', '.join(f'{p}={self.node_cache[p].to_string()}' for p in missing)}")
+
+        return [
+            ua.NodeId.from_string(p) if _is_node_id_string(p) else self.node_cache[p]
+            for p in paths
+        ]
+
+    def invalidate(self, paths: list = None):
+        """캐시된 NodeId 제거 (paths 생략 시 전체)"""
+        if paths is None:
+            self.node_cache.clear()
+            return
+        for p in paths:
+            self.node_cache.pop(p, None)
+
+    async def check(self, timeout: float):
+        """ServerState 읽기로 세션 생존 확인"""
+        await asyncio.wait_for(self.client.nodes.server_state.read_value(), timeout)
+        self.last_used = time.monotonic()
+
+    def _detach(self):
+        client, self.client = self.client, None
+        self.ns_idx = None
+        self.node_cache = {}
+        return client
+
+    async def close(self):
+        client = self._detach()
+        if client is not None:
+            await _disconnect(client)
+
+    def discard(self):
+        """
+        세션을 바로 버리고(다음 사용 시 재접속) 연결 끊기는 백그라운드로
+        취소된 호출처럼 disconnect 를 기다릴 수 없을 때 사용
+        """
+        client = self._detach()
+        if client is not None:
+            task = asyncio.get_running_loop().create_task(_disconnect(client))
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+
+
+class OpcUaSessionPool:
+
+    def __init__(
+        self,
+        url: str,
+        namespace_uri: str,
+        size: int = 2,
+        call_timeout: float = 3.0,
+        health_check_sec: float = 10.0,
+        breaker: CircuitBreaker = None,
+    ):
+        self.url = url
+        self.namespace_uri = namespace_uri
+        self.size = size
+        self.call_timeout = call_timeout
+        self.health_check_sec = health_check_sec
+        self.breaker = breaker or get_breaker(url)
+        self._idle = None
+        self._sessions = []
+        self._health_task = None
+        self._probe_task = None
+
+    async def start(self):
+        """현재 이벤트 루프에서 풀 초기화 (연결은 처음 사용할 때 맺음)"""
+        self._idle = asyncio.Queue()
+        self._sessions = [OpcUaSession(self.url, self.namespace_uri) for _ in range(self.size)]
+        for s in self._sessions:
+            self._idle.put_nowait(s)
+        loop = asyncio.get_running_loop()
+        self._health_task = loop.create_task(self._health_loop())
+        self._probe_task = loop.create_task(self._probe_loop())
+
+    async def close(self):
+        for task in (self._health_task, self._probe_task):
+            if task is not None:
+                task.cancel()
+        for s in self._sessions:
+            await s.close()
+
+    async def _ensure_ready(self, s: OpcUaSession):
+        if not s.connected:
+            await asyncio.wait_for(s.connect(), self.call_timeout)
+        elif time.monotonic() - s.last_used > self.health_check_sec:
+            try:
+                await s.check(self.call_timeout)
+            except Exception as e:
+                print(f"[OPCUA] pool session health check failed: {e}, reconnecting")
+                await s.close()
+                await asyncio.wait_for(s.connect(), self.call_timeout)
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        async with pool.session() as s:
+            await s.client.get_node(...).call_method(...)
+        세션/연결 오류가 나면 세션을 닫아 두고(다음 사용 시 재접속) 예외는 그대로 올린다.
+        breaker 가 열려 있으면 세션을 기다리지 않고 바로 CircuitOpenError.
+        """
+        self.breaker.allow()
+        try:
+            s = await self._idle.get()
+        except BaseException:
+            # 세션 대기 중 취소(call() timeout 등): 서버에 보내지 않았으므로 성공/실패로 치지 않음
+            # HALF_OPEN 시험 기회를 돌려주지 않으면 breaker 가 재시작 전까지 모든 명령을 거부함
+            self.breaker.release_trial()
+            raise
+        try:
+            await self._ensure_ready(s)
+            yield s
+            s.last_used = time.monotonic()
+            self.breaker.record_success()
+        except asyncio.CancelledError:
+            # 호출 측 대기 한도 초과로 취소됨 → timeout 으로 간주
+            # 요청이 이미 나갔을 수 있으므로(늦은 응답) 이 세션은 풀에 되돌리기 전에 버림
+            s.discard()
+            self.breaker.record_failure(TimeoutError("command cancelled"))
+            raise
+        except Exception as e:
+            if is_session_error(e):
+                await s.close()
+                self.breaker.record_failure(e)
+            else:
+                # Method 실패 등 서버가 응답한 오류는 장애가 아님
+                self.breaker.record_success()
+            raise
+        finally:
+            self._idle.put_nowait(s)
+
+    async def call_method(self, object_path: str, method_path: str, arguments: list, timeout: float = None):
+        """
+        Method 1건 호출. asyncua Node.call_method 와 같은 형태로 결과 반환
+        (출력 없음 → None, 1개 → 값, 여러 개 → 리스트), 실패 상태 코드는 예외
+        """
+        res = (await self.call_methods([(object_path, method_path, arguments)], timeout))[0]
+        res.StatusCode.check()
+        outputs = [v.Value for v in (res.OutputArguments or [])]
+        if not outputs:
+            return None
+        return outputs[0] if len(outputs) == 1 else outputs
+
+    async def call_methods(self, calls: list, timeout: float = None) -> list:
+        """
+        여러 Method 를 Call 서비스 요청 1번으로 호출
+        calls: [(object_path, method_path, [ua.Variant, ...]), ...]
+               path 는 "AMR" / "AMR/write_amr_go_move" 같은 browse path (NodeId 문자열도 허용)
+        return: 호출 순서대로 ua.CallMethodResult 리스트 (StatusCode / OutputArguments)
+
+        캐시된 NodeId 로 호출했는데 BadNodeIdUnknown 이 오면(서버 재생성 등)
+        해당 호출만 캐시를 비우고 다시 해석해서 1회 재시도한다.
+        """
+        timeout = timeout or self.call_timeout
+        async with self.session() as s:
+            results = await asyncio.wait_for(self._call(s, calls), timeout)
+
+            stale = [i for i, r in enumerate(results) if r.StatusCode.value in _STALE_NODE_CODES]
+            if stale:
+                retry = [calls[i] for i in stale]
+                print(f"[OPCUA] stale NodeId cache ({[c[1] for c in retry]}), re-resolving")
+                s.invalidate([p for c in retry for p in c[:2]])
+                for i, r in zip(stale, await asyncio.wait_for(self._call(s, retry), timeout)):
+                    results[i] = r
+            return results
+
+    @staticmethod
+    async def _call(s: OpcUaSession, calls: list) -> list:
+        node_ids = await s.resolve([p for c in calls for p in c[:2]])
+        requests = []
+        for i, (_, _, arguments) in enumerate(calls):
+            req = ua.CallMethodRequest()
+            req.ObjectId = node_ids[2 * i]
+            req.MethodId = node_ids[2 * i + 1]
+            req.InputArguments = list(arguments)
+            requests.append(req)
+        return await s.client.uaclient.call(requests)
+
+    async def _health_loop(self):
+        """idle 상태 세션을 주기적으로 점검해서 끊긴 세션을 미리 정리"""
+        while True:
+            await asyncio.sleep(self.health_check_sec)
+            for _ in range(self._idle.qsize()):
+                s = self._idle.get_nowait()
+                try:
+                    if s.connected and time.monotonic() - s.last_used >= self.health_check_sec:
+                        await s.check(self.call_timeout)
+                except Exception as e:
+                    print(f"[OPCUA] pool session dropped: {e}")
+                    await s.close()
+                finally:
+                    self._idle.put_nowait(s)
+
+    async def _probe_loop(self):
+        """breaker 가 OPEN 인 동안 주기적으로 접속 시도, 성공하면 HALF_OPEN 으로 전환"""
+        while True:
+            await asyncio.sleep(self.breaker.probe_interval)
+            if not self.breaker.is_open or self._idle.empty():
+                continue
+            s = self._idle.get_nowait()
+            try:
+                if s.connected:
+                    await s.check(self.call_timeout)
+                else:
+                    await asyncio.wait_for(s.connect(), self.call_timeout)
+                self.breaker.probe_succeeded()
+            except Exception as e:
+                print(f"[OPCUA] breaker probe failed: {e}")
+                await s.close()
+            finally:
+                self._idle.put_nowait(s)
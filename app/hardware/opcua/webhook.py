@@ -4,12 +4,13 @@ import aiohttp
 from .config import API_BASE
 
 
-async def call_webhook(name: str, value, path: str):
+async def call_webhook(name: str, value, path: str, meta: dict = None):
     """OPC UA에서 받은 값을 내부 Flask API로 전달"""
     url = API_BASE + path
     payload = {
         "event": name,
         "value": value,  # 숫자/문자열/구조체 그대로 JSON 직렬화
+        "meta": meta,    # node_id / source_ts / server_ts / received_ts / dispatched_ts
     }
 
     try:
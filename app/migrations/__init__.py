@@ -0,0 +1,156 @@
+# app/migrations/__init__.py
+"""
+버전별 스키마 마이그레이션
+
+db.create_all() 은 없는 테이블만 만들기 때문에 이미 운영 중인 MariaDB 에는
+컬럼/ENUM/인덱스 변경이 반영되지 않는다. 변경 사항은 app/migrations/versions/ 에
+vNNNN_설명.py 로 추가하고, 적용 이력은 schema_migrations 테이블에 남긴다.
+
+- 각 버전 모듈: DESCRIPTION (str), upgrade(conn) (conn: SQLAlchemy Connection)
+- 버전 순서대로 1개씩 트랜잭션으로 적용 후 schema_migrations 에 기록
+  (MariaDB DDL 은 암묵 commit 이므로 upgrade() 는 여러 번 실행돼도 안전하게 작성: *_if_missing 헬퍼 사용)
+- 새 DB: create_all() 이 모델 기준 최신 스키마를 만들고, 마이그레이션은 이미 있는 것을 건너뛰며 기록만 남김
+- 앱 시작 시 run_startup_migrations()
+  DB_AUTO_MIGRATE=0 이면 적용하지 않고, 미적용 버전이 있으면 시작하지 않음(SchemaOutOfDate)
+  → 생성 컬럼 / 요약 테이블 등 이후 코드가 전제하는 스키마 없이 돌지 않도록
+  수동 적용/확인: python -m scripts.db_migrate status | upgrade
+"""
+
+import importlib
+import os
+import pkgutil
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from app import db
+
+MIGRATIONS_TABLE = "schema_migrations"
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "1") == "1"
+
+_VERSIONS_PACKAGE = "app.migrations.versions"
+
+
+class SchemaOutOfDate(RuntimeError):
+    """미적용 마이그레이션이 남은 DB 로 앱을 시작하려 함 (DB_AUTO_MIGRATE=0 또는 적용 실패)"""
+
+
+def discover() -> list:
+    """[(version, module), ...] 버전 순"""
+    package = importlib.import_module(_VERSIONS_PACKAGE)
+    found = []
+    for info in pkgutil.iter_modules(package.__path__):
+        if info.name.startswith("v") and info.name[1:5].isdigit():
+            found.append((info.name, importlib.import_module(f"{_VERSIONS_PACKAGE}.{info.name}")))
+    return sorted(found, key=lambda v: v[0])
+
+
+def _ensure_table(conn):
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version VARCHAR(64) NOT NULL PRIMARY KEY,
+            description VARCHAR(255) NULL,
+            applied_at DATETIME NOT NULL
+        )
+    """))
+
+
+def applied_versions(conn) -> set:
+    _ensure_table(conn)
+    return {row[0] for row in conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))}
+
+
+def pending(engine=None) -> list:
+    engine = engine or db.engine
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+    return [(v, m) for v, m in discover() if v not in done]
+
+
+def upgrade(engine=None, target: str = None) -> list:
+    """
+    미적용 버전을 순서대로 적용 (target 이 있으면 그 버전까지)
+    반환: 적용한 버전 목록
+    """
+    engine = engine or db.engine
+    applied = []
+    for version, module in pending(engine):
+        if target is not None and version > target:
+            break
+        print(f"[MIGRATE] {version}: {module.DESCRIPTION}")
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(
+                text(f"INSERT INTO {MIGRATIONS_TABLE} (version, description, applied_at) "
+                     f"VALUES (:version, :description, CURRENT_TIMESTAMP)"),
+                {"version": version, "description": module.DESCRIPTION[:255]},
+            )
+        applied.append(version)
+    return applied
+
+
+def run_startup_migrations(app):
+    """
+    init_schema() 에서 db.create_all() 뒤 1회
+    미적용 마이그레이션이 남으면(DB_AUTO_MIGRATE=0 / 적용 실패) SchemaOutOfDate → 앱 시작 중단
+    """
+    with app.app_context():
+        if DB_AUTO_MIGRATE:
+            try:
+                applied = upgrade()
+            except Exception as e:
+                raise SchemaOutOfDate(f"마이그레이션 실패: {e}") from e
+            if applied:
+                print(f"[MIGRATE] applied {len(applied)}: {', '.join(applied)}")
+            return
+
+        todo = [v for v, _ in pending()]
+        if todo:
+            raise SchemaOutOfDate(
+                f"미적용 마이그레이션 {len(todo)}개: {', '.join(todo)} "
+                f"(DB_AUTO_MIGRATE=0 → python -m scripts.db_migrate upgrade 후 다시 시작)"
+            )
+
+
+# ==============================================================
+# upgrade() 에서 쓰는 헬퍼 (여러 번 실행돼도 결과가 같도록)
+# ==============================================================
+
+def table_exists(conn, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def index_exists(conn, table: str, name: str) -> bool:
+    return any(ix["name"] == name for ix in inspect(conn).get_indexes(table))
+
+
+def create_index_if_missing(conn, table: str, name: str, columns: list):
+    """
+    인덱스가 없으면 생성.
+    MariaDB 는 ALGORITHM=INPLACE, LOCK=NONE 으로 온라인 생성 (생성 중에도 INSERT/SELECT 가능)
+    """
+    # 테이블이 없으면 create_all() 이 모델 기준(인덱스 포함)으로 만듦
+    if not table_exists(conn, table) or index_exists(conn, table, name):
+        return
+    cols = ", ".join(columns)
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"ALTER TABLE {table} ADD INDEX {name} ({cols}), ALGORITHM=INPLACE, LOCK=NONE"))
+    else:
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({cols})"))
+    print(f"[MIGRATE]   index {table}.{name} ({cols}) created")
+
+
+def column_exists(conn, table: str, name: str) -> bool:
+    return any(col["name"] == name for col in inspect(conn).get_columns(table))
+
+
+def add_column_if_missing(conn, table: str, column):
+    """
+    컬럼이 없으면 추가. column: sqlalchemy Column (타입 / 생성식은 DB 방언에 맞게 렌더링)
+    VIRTUAL 생성 컬럼은 MariaDB 에서 테이블 재작성 없이 추가된다.
+    """
+    if not table_exists(conn, table) or column_exists(conn, table, column.name):
+        return
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl}"))
+    print(f"[MIGRATE]   column {table}.{column.name} added")
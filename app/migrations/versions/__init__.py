@@ -0,0 +1,2 @@
+# app/migrations/versions/__init__.py
+# vNNNN_설명.py : DESCRIPTION + upgrade(conn)
@@ -0,0 +1,28 @@
+# app/migrations/versions/v0001_control_logs_suppressed.py
+"""control_logs.result_status 에 SUPPRESSED 추가 (명령 게이트로 전송 생략한 명령 기록)"""
+
+from sqlalchemy import inspect, text
+
+from app.migrations import table_exists
+
+DESCRIPTION = "control_logs.result_status ENUM += SUPPRESSED"
+
+
+def _has_suppressed(conn) -> bool:
+    for col in inspect(conn).get_columns("control_logs"):
+        if col["name"] == "result_status":
+            return "SUPPRESSED" in getattr(col["type"], "enums", ())
+    return False
+
+
+def upgrade(conn):
+    # SQLite 는 ENUM 을 VARCHAR 로 만들어서 변경 불필요
+    if conn.dialect.name != "mysql":
+        return
+    # 테이블이 없거나(create_all 이 모델 기준으로 만듦) 이미 SUPPRESSED 가 있으면 건너뜀
+    if not table_exists(conn, "control_logs") or _has_suppressed(conn):
+        return
+    conn.execute(text(
+        "ALTER TABLE control_logs MODIFY result_status "
+        "ENUM('SUCCESS','FAIL','TIMEOUT','SUPPRESSED') NOT NULL DEFAULT 'SUCCESS'"
+    ))
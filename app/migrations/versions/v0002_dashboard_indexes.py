@@ -0,0 +1,27 @@
+# app/migrations/versions/v0002_dashboard_indexes.py
+"""
+대시보드 조회 경로 인덱스
+
+- 최신순 목록 (ORDER BY created_at DESC LIMIT n): control_logs, events_logs, mission_camera_logs, maps
+- 장비별 최신 1건 (GROUP BY equipment_id + MAX(시각)): mission_logs, mission_plc_logs, amr_state_log
+  → amr_state_current / mission_latest 백필과 트리거 미설치 시 upsert 쿼리
+"""
+
+from app.migrations import create_index_if_missing
+
+DESCRIPTION = "dashboard query indexes (created_at / (equipment_id, time))"
+
+INDEXES = [
+    ("control_logs", "ix_control_logs_created_at", ["created_at"]),
+    ("events_logs", "ix_events_logs_created_at", ["created_at"]),
+    ("mission_camera_logs", "ix_mission_camera_logs_created_at", ["created_at"]),
+    ("maps", "ix_maps_created_at", ["created_at"]),
+    ("mission_logs", "ix_mission_logs_equipment_created", ["equipment_id", "created_at"]),
+    ("mission_plc_logs", "ix_mission_plc_logs_equipment_created", ["equipment_id", "created_at"]),
+    ("amr_state_log", "ix_amr_state_log_equipment_updated", ["equipment_id", "updated_at"]),
+]
+
+
+def upgrade(conn):
+    for table, name, columns in INDEXES:
+        create_index_if_missing(conn, table, name, columns)
@@ -0,0 +1,43 @@
+# app/migrations/versions/v0003_log_search.py
+"""
+로그 검색 (app/services/log_search.py) 용 생성 컬럼 + 인덱스
+
+- control_logs.request_payload(JSON 문자열)의 move_command / object_info 를 VIRTUAL 생성 컬럼으로 추가
+  (테이블 재작성 없이 추가되고, 값은 INSERT 시점에 계산돼서 인덱스에 저장됨)
+- 검색 필터 컬럼별 (필터 컬럼, created_at) 인덱스
+  → 필터 조건 + ORDER BY created_at DESC LIMIT n 을 인덱스 순서대로 읽고 멈춤
+"""
+
+from sqlalchemy import Column, Computed, String
+
+from app.migrations import add_column_if_missing, create_index_if_missing
+from app.utils.json_sql import json_text
+
+DESCRIPTION = "log search: control_logs payload generated columns + filter indexes"
+
+COLUMNS = [
+    ("control_logs", Column("payload_move_command", String(64),
+                            Computed(json_text("request_payload", "move_command", 64), persisted=False))),
+    ("control_logs", Column("payload_object_info", String(64),
+                            Computed(json_text("request_payload", "object_info", 64), persisted=False))),
+]
+
+INDEXES = [
+    ("control_logs", "ix_control_logs_equipment_created", ["equipment_id", "created_at"]),
+    ("control_logs", "ix_control_logs_action_created", ["action_type", "created_at"]),
+    ("control_logs", "ix_control_logs_status_created", ["result_status", "created_at"]),
+    ("control_logs", "ix_control_logs_move_command_created", ["payload_move_command", "created_at"]),
+    ("control_logs", "ix_control_logs_object_info_created", ["payload_object_info", "created_at"]),
+    ("events_logs", "ix_events_logs_equipment_created", ["equipment_id", "created_at"]),
+    ("events_logs", "ix_events_logs_level_created", ["level", "created_at"]),
+    ("mission_camera_logs", "ix_mission_camera_logs_equipment_created", ["equipment_id", "created_at"]),
+    ("mission_camera_logs", "ix_mission_camera_logs_decision_created", ["decision", "created_at"]),
+    ("mission_camera_logs", "ix_mission_camera_logs_module_created", ["module_type", "created_at"]),
+]
+
+
+def upgrade(conn):
+    for table, column in COLUMNS:
+        add_column_if_missing(conn, table, column)
+    for table, name, columns in INDEXES:
+        create_index_if_missing(conn, table, name, columns)
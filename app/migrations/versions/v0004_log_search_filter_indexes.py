@@ -0,0 +1,26 @@
+# app/migrations/versions/v0004_log_search_filter_indexes.py
+"""
+로그 검색 필터 중 v0003 에서 빠진 (필터 컬럼, created_at) 인덱스
+
+- control_logs: target_type, source
+- events_logs: equipment_type
+- mission_camera_logs: mode
+값 종류가 적은 컬럼이라 단독 인덱스는 의미가 없지만, created_at 과 묶으면
+필터 + ORDER BY created_at DESC LIMIT n 을 인덱스 순서대로 읽고 멈출 수 있다. (app/services/log_search.py)
+"""
+
+from app.migrations import create_index_if_missing
+
+DESCRIPTION = "log search: remaining filter indexes (target_type / source / equipment_type / mode)"
+
+INDEXES = [
+    ("control_logs", "ix_control_logs_target_created", ["target_type", "created_at"]),
+    ("control_logs", "ix_control_logs_source_created", ["source", "created_at"]),
+    ("events_logs", "ix_events_logs_type_created", ["equipment_type", "created_at"]),
+    ("mission_camera_logs", "ix_mission_camera_logs_mode_created", ["mode", "created_at"]),
+]
+
+
+def upgrade(conn):
+    for table, name, columns in INDEXES:
+        create_index_if_missing(conn, table, name, columns)
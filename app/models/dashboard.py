@@ -1,10 +1,23 @@
 # app/models/dashboard.py
 from app import db
+from app.utils.json_sql import json_text
 from datetime import datetime
 
 
 class ControlLog(db.Model):
     __tablename__ = "control_logs"
+    # 인덱스 / 생성 컬럼 변경은 app/migrations/versions/ 에도 추가 (기존 DB 반영)
+    __table_args__ = (
+        db.Index("ix_control_logs_created_at", "created_at"),
+        # 로그 검색 (app/services/log_search.py): 필터 컬럼 + created_at
+        db.Index("ix_control_logs_equipment_created", "equipment_id", "created_at"),
+        db.Index("ix_control_logs_target_created", "target_type", "created_at"),
+        db.Index("ix_control_logs_action_created", "action_type", "created_at"),
+        db.Index("ix_control_logs_status_created", "result_status", "created_at"),
+        db.Index("ix_control_logs_source_created", "source", "created_at"),
+        db.Index("ix_control_logs_move_command_created", "payload_move_command", "created_at"),
+        db.Index("ix_control_logs_object_info_created", "payload_object_info", "created_at"),
+    )
 
     control_id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     equipment_id = db.Column(
@@ -29,27 +42,34 @@ class ControlLog(db.Model):
         db.Text(collation="utf8mb4_bin"),
         nullable=True
     )
+    # SUPPRESSED: 명령 게이트(중복/rate limit)로 전송 생략 (기존 DB: 마이그레이션 v0001)
     result_status = db.Column(
-        db.Enum("SUCCESS", "FAIL", "TIMEOUT"),
+        db.Enum("SUCCESS", "FAIL", "TIMEOUT", "SUPPRESSED"),
         nullable=False,
         default="SUCCESS"
     )
     result_message = db.Column(db.Text, nullable=True)
 
+    # request_payload(JSON 문자열)에서 꺼낸 검색용 키 (VIRTUAL 생성 컬럼, 값은 인덱스에 저장)
+    payload_move_command = db.Column(db.String(64), db.Computed(json_text("request_payload", "move_command", 64), persisted=False))
+    payload_object_info = db.Column(db.String(64), db.Computed(json_text("request_payload", "object_info", 64), persisted=False))
+
     created_at = db.Column(
         db.DateTime(timezone=True),
         nullable=False,
         default=datetime.utcnow
     )
 
+    # 직렬화는 equipment_cache 사용 (조회마다 equipment_info JOIN 하지 않음)
     equipment = db.relationship(
         "EquipmentInfo",
         backref="control_logs",
-        lazy="joined",
         primaryjoin="ControlLog.equipment_id == EquipmentInfo.equipment_id"
     )
 
     def to_dict(self):
+        from app.services.equipment_cache import equipment_cache   # 순환 import 방지
+
         return {
             "control_id": self.control_id,
             "equipment_id": self.equipment_id,
@@ -64,12 +84,18 @@ class ControlLog(db.Model):
                 self.created_at.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
                 if self.created_at else None
             ),
-            "equipment": self.equipment.to_dict() if self.equipment else None
+            "equipment": equipment_cache.get(self.equipment_id),
         }
     
 
 class EventLog(db.Model):
     __tablename__ = "events_logs"
+    __table_args__ = (
+        db.Index("ix_events_logs_created_at", "created_at"),
+        db.Index("ix_events_logs_equipment_created", "equipment_id", "created_at"),
+        db.Index("ix_events_logs_type_created", "equipment_type", "created_at"),
+        db.Index("ix_events_logs_level_created", "level", "created_at"),
+    )
 
     event_id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     equipment_id = db.Column(
@@ -84,6 +110,16 @@ class EventLog(db.Model):
 
     equipment = db.relationship("EquipmentInfo", backref="events_logs")
 
+    def to_dict(self):
+        return {
+            "event_id": self.event_id,
+            "equipment_id": self.equipment_id,
+            "equipment_type": self.equipment_type,
+            "level": self.level,
+            "message": self.message,
+            "created_at": self.created_at.isoformat(sep=" ", timespec="seconds") if self.created_at else None,
+        }
+
 
 class EquipmentInfo(db.Model):
     __tablename__ = "equipment_info"
@@ -114,6 +150,9 @@ class EquipmentInfo(db.Model):
 
 class MissionLog(db.Model):
     __tablename__ = "mission_logs"
+    __table_args__ = (
+        db.Index("ix_mission_logs_equipment_created", "equipment_id", "created_at"),
+    )
 
     mission_id = db.Column(db.BigInteger, primary_key=True)  # PK
     equipment_id = db.Column(
@@ -166,6 +205,9 @@ class MissionLog(db.Model):
 
 class MissionPlcLog(db.Model):
     __tablename__ = "mission_plc_logs"
+    __table_args__ = (
+        db.Index("ix_mission_plc_logs_equipment_created", "equipment_id", "created_at"),
+    )
 
     log_plc_id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     equipment_id = db.Column(
@@ -205,6 +247,9 @@ class MissionPlcLog(db.Model):
     
 class Map(db.Model):
     __tablename__ = "maps"
+    __table_args__ = (
+        db.Index("ix_maps_created_at", "created_at"),
+    )
 
     map_id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     name = db.Column(db.String(64), nullable=False)
@@ -236,9 +281,13 @@ class Map(db.Model):
 
 class AmrStateLog(db.Model):
     __tablename__ = "amr_state_log"
+    __table_args__ = (
+        db.Index("ix_amr_state_log_equipment_updated", "equipment_id", "updated_at"),
+    )
 
+    # SQLite 는 INTEGER PRIMARY KEY 만 자동 증가하므로 로컬 개발 DB 에서는 Integer
     idx = db.Column(
-        db.BigInteger,
+        db.BigInteger().with_variant(db.Integer, "sqlite"),
         primary_key=True,
         autoincrement=True,
     )
@@ -305,3 +354,156 @@ class AmrStateLog(db.Model):
                 if self.updated_at else None
             ),
         }
+
+
+class AmrStateCurrent(db.Model):
+    """
+    AMR 별 최신 상태 1행 (amr_state_log 의 materialized 현재값)
+    amr_state_log INSERT 와 같은 트랜잭션에서 갱신된다 (app/services/amr_state_service.py)
+    """
+    __tablename__ = "amr_state_current"
+
+    equipment_id = db.Column(
+        db.String(32),
+        db.ForeignKey("equipment_info.equipment_id"),
+        primary_key=True,
+    )
+
+    # 이 상태를 만든 amr_state_log.idx
+    log_idx = db.Column(db.BigInteger, nullable=False)
+
+    pos_x = db.Column(db.Float, nullable=False)
+    pos_y = db.Column(db.Float, nullable=False)
+    heading = db.Column(db.Float, nullable=False)
+    battery_pct = db.Column(db.Float, nullable=False)
+    speed = db.Column(db.Float, nullable=False)
+    state_code = db.Column(db.String(16), nullable=True)
+
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+    )
+
+    equipment = db.relationship(
+        "EquipmentInfo",
+        primaryjoin="AmrStateCurrent.equipment_id == EquipmentInfo.equipment_id",
+    )
+
+    def to_dict(self):
+        return {
+            "idx": self.log_idx,
+            "equipment_id": self.equipment_id,
+            "pos_x": self.pos_x,
+            "pos_y": self.pos_y,
+            "heading": self.heading,
+            "battery_pct": self.battery_pct,
+            "speed": self.speed,
+            "state_code": self.state_code,
+            "updated_at": (
+                self.updated_at.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                if self.updated_at else None
+            ),
+        }
+
+
+class MissionLatest(db.Model):
+    """
+    장비별 최신 미션 1행 (mission_logs + mission_plc_logs 요약)
+    두 테이블 INSERT 와 같은 트랜잭션에서 갱신된다 (app/services/mission_latest_service.py)
+    """
+    __tablename__ = "mission_latest"
+
+    equipment_id = db.Column(
+        db.String(32),
+        db.ForeignKey("equipment_info.equipment_id"),
+        primary_key=True,
+    )
+
+    # 원본 행: "mission_logs" / "mission_plc_logs" + 해당 테이블 PK
+    src_table = db.Column(db.String(32), nullable=False)
+    src_id = db.Column(db.BigInteger, nullable=False)
+
+    equipment_type = db.Column(db.String(16), nullable=False)   # mission_plc_logs 는 'PLC'
+    status = db.Column(db.String(16), nullable=True)            # mission_plc_logs 는 NULL
+    description = db.Column(db.String(255), nullable=True)
+    source = db.Column(db.String(16), nullable=True)
+
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
+
+    equipment = db.relationship(
+        "EquipmentInfo",
+        primaryjoin="MissionLatest.equipment_id == EquipmentInfo.equipment_id",
+    )
+
+
+class AmrStateRollupMixin:
+    """
+    amr_state_log 시간 버킷 집계 공통 컬럼 (app/services/amr_rollup.py)
+    같은 버킷에 늦게 들어온 행도 합칠 수 있도록 평균 대신 speed_sum / samples 로 저장
+    """
+    equipment_id = db.Column(db.String(32), primary_key=True)
+    bucket_start = db.Column(db.DateTime(timezone=True), primary_key=True)
+
+    samples = db.Column(db.Integer, nullable=False)
+
+    # 버킷 안 마지막 샘플 (last_at 기준)
+    last_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    pos_x = db.Column(db.Float, nullable=False)
+    pos_y = db.Column(db.Float, nullable=False)
+    heading = db.Column(db.Float, nullable=False)
+    battery_pct = db.Column(db.Float, nullable=False)
+    state_code = db.Column(db.String(16), nullable=True)
+
+    battery_min = db.Column(db.Float, nullable=False)
+    battery_max = db.Column(db.Float, nullable=False)
+    speed_sum = db.Column(db.Float, nullable=False)
+
+    def to_dict(self):
+        return {
+            "equipment_id": self.equipment_id,
+            "bucket_start": (
+                self.bucket_start.strftime("%Y-%m-%d %H:%M:%S")
+                if self.bucket_start else None
+            ),
+            "samples": self.samples,
+            "pos_x": self.pos_x,
+            "pos_y": self.pos_y,
+            "heading": self.heading,
+            "battery_pct": self.battery_pct,
+            "battery_min": self.battery_min,
+            "battery_max": self.battery_max,
+            "speed_avg": self.speed_sum / self.samples if self.samples else None,
+            "state_code": self.state_code,
+            "updated_at": (
+                self.last_at.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                if self.last_at else None
+            ),
+        }
+
+
+class AmrStateRollup1s(AmrStateRollupMixin, db.Model):
+    __tablename__ = "amr_state_rollup_1s"
+
+
+class AmrStateRollup1m(AmrStateRollupMixin, db.Model):
+    __tablename__ = "amr_state_rollup_1m"
+
+
+class JobWatermark(db.Model):
+    """백그라운드 작업별 처리 위치 (예: amr_state_log 를 어느 idx 까지 집계했는지)"""
+    __tablename__ = "job_watermarks"
+
+    name = db.Column(db.String(64), primary_key=True)
+    last_id = db.Column(db.BigInteger, nullable=False, default=0)
+
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
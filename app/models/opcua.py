@@ -4,6 +4,15 @@ from datetime import datetime
 
 class MissionCameraLog(db.Model):
     __tablename__ = "mission_camera_logs"
+    # 인덱스 변경은 app/migrations/versions/ 에도 추가 (기존 DB 반영)
+    __table_args__ = (
+        db.Index("ix_mission_camera_logs_created_at", "created_at"),
+        # 로그 검색 (app/services/log_search.py)
+        db.Index("ix_mission_camera_logs_equipment_created", "equipment_id", "created_at"),
+        db.Index("ix_mission_camera_logs_mode_created", "mode", "created_at"),
+        db.Index("ix_mission_camera_logs_decision_created", "decision", "created_at"),
+        db.Index("ix_mission_camera_logs_module_created", "module_type", "created_at"),
+    )
 
     # PK
     log_camera_id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
@@ -23,11 +32,13 @@ class MissionCameraLog(db.Model):
         server_default="ANOMALY",
     )
 
-    # 이미지 파일 경로 (선택)
+    # 이미지 파일 경로: app/services/image_store.py 저장소 기준 상대 경로 (<sha256>.jpg)
     image_path = db.Column(db.String(255))
 
-    # 캡처 원본 이미지 (JPEG/PNG 바이너리)
-    image_data = db.Column(db.LargeBinary)
+    # 캡처 원본 이미지 (JPEG/PNG 바이너리) - 예전 행만 사용, 새 이미지는 image_path 파일로 저장
+    # 목록 조회 때 BLOB 을 같이 읽지 않도록 접근할 때만 로드
+    # (기존 BLOB → 파일 이동: python -m scripts.migrate_camera_images)
+    image_data = db.deferred(db.Column(db.LargeBinary))
 
     # 모듈 분류 결과 (MB102, L298N, ESP32 등)
     module_type = db.Column(db.String(64))
@@ -64,11 +75,54 @@ class MissionCameraLog(db.Model):
     equipment = db.relationship(
         "EquipmentInfo",
         backref=db.backref("mission_camera_logs", lazy="dynamic"),
-        lazy="joined",
     )
 
+    def to_dict(self):
+        # image_data(BLOB) 는 포함하지 않음 → 이미지는 /vision/mission-camera-logs/image/<id>
+        return {
+            "log_camera_id": self.log_camera_id,
+            "equipment_id": self.equipment_id,
+            "mode": self.mode,
+            "image_path": self.image_path,
+            "module_type": self.module_type,
+            "classification_confidence": self.classification_confidence,
+            "anomaly_flag": self.anomaly_flag,
+            "anomaly_score": self.anomaly_score,
+            "decision": self.decision,
+            "pick_coord": self.pick_coord,
+            "created_at": (
+                self.created_at.strftime("%Y-%m-%d %H:%M:%S")
+                if self.created_at else None
+            ),
+        }
+
     def __repr__(self):
         return (
             f"<MissionCameraLog id={self.log_camera_id} "
             f"eq={self.equipment_id} mode={self.mode} decision={self.decision}>"
-        )
\ No newline at end of file
+        )
+
+class EventIngestState(db.Model):
+    """
+    OPC UA 노드별 마지막으로 처리한 이벤트 (app/services/event_ingest.py)
+    재접속 후 재전달된 값 / 순서가 뒤바뀐 이벤트를 걸러내는 기준
+    """
+    __tablename__ = "event_ingest_state"
+
+    # 이벤트를 보낸 노드 NodeId (meta 에 없으면 이벤트 이름)
+    node_id = db.Column(db.String(128), primary_key=True)
+
+    event_name = db.Column(db.String(64), nullable=False)
+
+    # 마지막 처리 이벤트의 SourceTimestamp (없으면 ServerTimestamp), epoch 마이크로초
+    last_ts_us = db.Column(db.BigInteger, nullable=False)
+
+    # 마지막 처리 값의 crc32 (같은 타임스탬프에 값만 다른 경우 구분용)
+    last_value_crc = db.Column(db.BigInteger, nullable=False, default=0)
+
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
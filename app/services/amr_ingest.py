@@ -0,0 +1,225 @@
+# app/services/amr_ingest.py
+"""
+AMR 텔레메트리 대량 수집 (amr_state_log)
+
+AMR(또는 게이트웨이)이 여러 샘플을 한 번에 POST 하면
+  파싱 → numpy 배열 단위 검증 → writer 큐 → multi-row INSERT (save_amr_states)
+순서로 저장한다. amr_state_current 는 save_amr_states 가 같은 트랜잭션에서 갱신(트리거 / 직접 upsert).
+
+입력 형식 (샘플 1개 = 1행)
+- NDJSON (application/x-ndjson): 줄마다
+    {"equipment_id": "AMR01", "ts": 1767225600.125, "pos_x": 1.2, "pos_y": 3.4,
+     "heading": 90.0, "battery_pct": 87.5, "speed": 0.4, "state_code": "RUN"}
+  ts 는 UTC epoch 초 (소수 가능)
+- 바이너리 (application/octet-stream): BINARY_DTYPE 고정 길이 레코드를 이어 붙인 것 (little-endian, 60 bytes)
+  Python 예: np.array(rows, dtype=BINARY_DTYPE).tobytes()
+
+검증 (배열 단위, 행마다 Python 루프 없음)
+- equipment_id / state_code: UTF-8 이고 amr_state_log 컬럼 길이 이하 (잘라서 저장하지 않음)
+  NDJSON 은 배치의 가장 긴 값에 맞춘 폭으로 읽으므로 파싱 단계에서 잘리지 않는다.
+  바이너리는 16 bytes 고정이라 멀티바이트 글자가 중간에 잘린 값은 UTF-8 검사에서 거부
+- 숫자 값이 모두 유한한 값, battery_pct 0~100
+- ts: 현재보다 AMR_INGEST_MAX_FUTURE_SEC 이상 미래 / AMR_INGEST_MAX_AGE_SEC 이상 과거면 거부
+- equipment_id 가 equipment_info 에 있는 AMR
+  → 통과한 행만 저장, 거부된 행은 개수와 사유(앞쪽 몇 개)를 응답에 돌려줌
+
+백프레셔
+- writer 큐에 쌓인 행이 AMR_INGEST_QUEUE_MAX_ROWS 를 넘으면 배치 전체를 받지 않고 submit() 이 False
+  → API 가 429 + Retry-After 로 응답 (클라이언트는 같은 배치를 다시 보냄)
+- 큐가 AMR_INGEST_SLOWDOWN_RATIO 이상 차면 받기는 하되 응답에 slow_down=true
+
+202 는 "저장 대기열에 넣음" 이다. DB 저장이 실패하면 writer 가 몇 번 재시도하고(그동안 큐가 차서 429),
+그래도 실패한 행은 버린다 → GET /api/v1/amr/telemetry/status 의 dropped / last_error 로 확인
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+from app.models.dashboard import AmrStateLog
+from app.services.amr_state_service import save_amr_states
+from app.services.batch_writer import BatchWriter
+from app.services.equipment_cache import equipment_cache
+
+AMR_INGEST_BATCH_ROWS = 1000          # INSERT 1번에 넣는 최대 행 수
+AMR_INGEST_FLUSH_MS = 100
+AMR_INGEST_QUEUE_MAX_ROWS = int(os.getenv("AMR_INGEST_QUEUE_MAX_ROWS", "20000"))
+AMR_INGEST_SLOWDOWN_RATIO = 0.5
+AMR_INGEST_MAX_REQUEST_ROWS = 10000   # 요청 1건 최대 샘플 수
+AMR_INGEST_MAX_FUTURE_SEC = 5.0       # AMR 시계 오차 허용
+AMR_INGEST_MAX_AGE_SEC = 3600.0       # 재전송 버퍼 허용 범위
+AMR_INGEST_WRITE_MODE = os.getenv("AMR_INGEST_WRITE_MODE", "async")   # "async" | "sync"
+MAX_ERRORS = 10
+
+BINARY_DTYPE = np.dtype([
+    ("equipment_id", "S16"),
+    ("ts", "<f8"),
+    ("pos_x", "<f4"),
+    ("pos_y", "<f4"),
+    ("heading", "<f4"),
+    ("battery_pct", "<f4"),
+    ("speed", "<f4"),
+    ("state_code", "S16"),
+])
+
+NUMERIC_FIELDS = ("pos_x", "pos_y", "heading", "battery_pct", "speed")
+TEXT_FIELDS = ("equipment_id", "state_code")
+
+# 문자 컬럼 최대 글자 수 (amr_state_log)
+TEXT_MAX_CHARS = {f: AmrStateLog.__table__.c[f].type.length for f in TEXT_FIELDS}
+
+
+class IngestError(ValueError):
+    """요청 전체를 받을 수 없는 형식 오류 (400)"""
+
+
+# ───────── 파싱 ─────────
+
+def parse_binary(body: bytes) -> np.ndarray:
+    if len(body) % BINARY_DTYPE.itemsize:
+        raise IngestError(f"body length {len(body)} is not a multiple of {BINARY_DTYPE.itemsize}")
+    return np.frombuffer(body, dtype=BINARY_DTYPE)
+
+
+def _ndjson_dtype(samples: list) -> np.dtype:
+    """BINARY_DTYPE 과 같은 필드, 문자 필드 폭만 배치의 가장 긴 값에 맞춤 (S16 으로 잘리지 않도록)"""
+    widths = {
+        "equipment_id": max((len(s[0]) for s in samples), default=1),
+        "state_code": max((len(s[-1]) for s in samples), default=1),
+    }
+    return np.dtype([
+        (name, f"S{max(widths[name], 1)}" if name in widths else BINARY_DTYPE[name])
+        for name in BINARY_DTYPE.names
+    ])
+
+
+def parse_ndjson(body: bytes) -> np.ndarray:
+    samples = []
+    for n, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            s = json.loads(line)
+            samples.append((
+                str(s["equipment_id"]).encode("utf-8"),
+                float(s["ts"]),
+                *(float(s[f]) for f in NUMERIC_FIELDS),
+                str(s.get("state_code") or "").encode("utf-8"),
+            ))
+        except (ValueError, KeyError, TypeError) as e:
+            raise IngestError(f"line {n}: {e!r}") from e
+    return np.array(samples, dtype=_ndjson_dtype(samples))
+
+
+def parse(body: bytes, content_type: str) -> np.ndarray:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type == "application/octet-stream":
+        arr = parse_binary(body)
+    elif content_type in ("application/x-ndjson", "application/jsonl", "text/plain", ""):
+        arr = parse_ndjson(body)
+    else:
+        raise IngestError(f"unsupported content type: {content_type}")
+    if len(arr) > AMR_INGEST_MAX_REQUEST_ROWS:
+        raise IngestError(f"too many samples: {len(arr)} > {AMR_INGEST_MAX_REQUEST_ROWS}")
+    return arr
+
+
+# ───────── 검증 ─────────
+
+_amr_ids = {"ids": np.array([], dtype="S32"), "version": None}
+
+
+def known_amr_ids() -> np.ndarray:
+    """equipment_info 의 AMR id (equipment_cache 가 다시 읽을 때만 배열 갱신)"""
+    ids = equipment_cache.ids("AMR")
+    if _amr_ids["version"] != equipment_cache.version:
+        encoded = sorted(i.encode("utf-8") for i in ids)
+        # 폭은 가장 긴 id 에 맞춤 (멀티바이트 id 가 잘려서 다른 id 와 같아지지 않도록)
+        width = max(map(len, encoded), default=32)
+        _amr_ids["ids"] = np.array(encoded, dtype=f"S{width}")
+        _amr_ids["version"] = equipment_cache.version
+    return _amr_ids["ids"]
+
+
+def _text_ok(column: np.ndarray, max_chars: int) -> np.ndarray:
+    """
+    UTF-8 로 디코딩되고 max_chars 글자 이하인 행
+    (값 종류가 장비 / 상태 코드 수만큼이라 고유 값만 확인해서 행으로 펼침)
+    """
+    values, inverse = np.unique(column, return_inverse=True)
+    ok = np.zeros(len(values), dtype=bool)
+    for i, v in enumerate(values):
+        try:
+            ok[i] = len(v.decode("utf-8")) <= max_chars
+        except UnicodeDecodeError:
+            pass
+    return ok[inverse.reshape(-1)]
+
+
+def validate(arr: np.ndarray, now: float = None) -> tuple:
+    """
+    반환: (통과한 행 배열, 거부 행 수, 사유 목록 [{"index", "error"}, ...])
+    """
+    now = time.time() if now is None else now
+    checks = [
+        *((f"{f} too long or not UTF-8", _text_ok(arr[f], TEXT_MAX_CHARS[f])) for f in TEXT_FIELDS),
+        ("unknown equipment_id", np.isin(arr["equipment_id"], known_amr_ids())),
+        ("non-finite value", np.logical_and.reduce([np.isfinite(arr[f]) for f in NUMERIC_FIELDS + ("ts",)])),
+        ("battery_pct out of range", (arr["battery_pct"] >= 0) & (arr["battery_pct"] <= 100)),
+        ("ts in the future", arr["ts"] <= now + AMR_INGEST_MAX_FUTURE_SEC),
+        ("ts too old", arr["ts"] >= now - AMR_INGEST_MAX_AGE_SEC),
+    ]
+    ok = np.ones(len(arr), dtype=bool)
+    errors = []
+    for reason, passed in checks:
+        failed = np.flatnonzero(ok & ~passed)
+        errors += [{"index": int(i), "error": reason} for i in failed[:MAX_ERRORS - len(errors)]]
+        ok &= passed
+    return arr[ok], int(len(arr) - ok.sum()), errors
+
+
+def to_rows(arr: np.ndarray) -> list:
+    """검증된 배열 → save_amr_states 용 dict 리스트 (updated_at: naive UTC datetime)"""
+    updated_at = (arr["ts"] * 1e6).astype("datetime64[us]").tolist()
+    columns = {f: arr[f].astype(float).tolist() for f in NUMERIC_FIELDS}
+    equipment_ids = np.char.decode(arr["equipment_id"], "utf-8").tolist()
+    state_codes = np.char.decode(arr["state_code"], "utf-8").tolist()
+    return [
+        {
+            "equipment_id": equipment_ids[i],
+            **{f: columns[f][i] for f in NUMERIC_FIELDS},
+            "state_code": state_codes[i] or None,
+            "updated_at": updated_at[i],
+        }
+        for i in range(len(arr))
+    ]
+
+
+# ───────── writer ─────────
+
+# amr_state_log multi-row INSERT (+ amr_state_current 갱신) 을 AMR_INGEST_BATCH_ROWS 행씩 (app/services/batch_writer.py)
+amr_ingest_writer = BatchWriter(
+    "AMR_INGEST", "amr-ingest-writer", save_amr_states,
+    AMR_INGEST_BATCH_ROWS, AMR_INGEST_FLUSH_MS, AMR_INGEST_WRITE_MODE, max_rows=AMR_INGEST_QUEUE_MAX_ROWS,
+)
+
+
+def ingest(body: bytes, content_type: str) -> dict:
+    """
+    요청 본문 1건 처리. 형식 오류면 IngestError
+    반환: {"accepted", "rejected", "errors", "throttled", "slow_down", "queue_rows"}
+    """
+    arr = parse(body, content_type)
+    valid, rejected, errors = validate(arr)
+    rows = to_rows(valid)
+    submitted = amr_ingest_writer.submit(rows)
+    return {
+        "accepted": len(rows) if submitted else 0,
+        "rejected": rejected,
+        "errors": errors,
+        "throttled": not submitted,
+        "slow_down": amr_ingest_writer.fill_ratio >= AMR_INGEST_SLOWDOWN_RATIO,
+        "queue_rows": amr_ingest_writer.pending,
+    }
@@ -0,0 +1,348 @@
+# app/services/amr_rollup.py
+"""
+AMR 텔레메트리(amr_state_log) 시간 버킷 집계 + 보관 기간 정리
+
+- 집계: 백그라운드 스레드가 AMR_ROLLUP_INTERVAL_SEC 마다 새로 들어온 raw 행(idx 기준 증분)을
+  1초 / 1분 버킷으로 합쳐서 amr_state_rollup_1s / amr_state_rollup_1m 에 upsert
+  * 버킷 값: 마지막 위치/방향/배터리/상태, 배터리 min/max, 평균 속도(speed_sum / samples)
+  * 처리 위치는 job_watermarks("amr_state_log") 에 저장 → 재시작해도 이어서 집계
+  * 배치마다 watermark 행을 FOR UPDATE 로 잠그고 다시 읽음 → 여러 프로세스가 돌아도 중복 집계 없음
+  * 커밋이 늦게 끝난 트랜잭션의 행을 건너뛰지 않도록, 이번 주기에는 "직전 주기에 본 MAX(idx)" 까지만 집계
+- 정리: AMR_RETENTION_INTERVAL_SEC 마다 보관 기간(AMR_RETENTION_SEC)이 지난 행을 PK 범위로
+  AMR_DELETE_BATCH_ROWS 건씩 삭제하고 배치 사이에 쉰다 (긴 트랜잭션 / 테이블 락 없음)
+  * raw 행은 집계가 끝난 것(idx <= watermark)만 삭제
+- 조회: get_amr_history() 가 요청 구간의 실제 행 수에 맞는 해상도(raw / 1s / 1m)를 골라서 반환
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, literal, select, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.dashboard import AmrStateLog, AmrStateRollup1m, AmrStateRollup1s, JobWatermark
+
+AMR_ROLLUP_INTERVAL_SEC = float(os.getenv("AMR_ROLLUP_INTERVAL_SEC", "1.0"))
+AMR_ROLLUP_BATCH_ROWS = 5000
+AMR_RETENTION_INTERVAL_SEC = 60.0
+AMR_DELETE_BATCH_ROWS = 1000
+AMR_DELETE_PAUSE_SEC = 0.05
+
+# 해상도별 보관 기간 (None = 삭제 안 함)
+AMR_RETENTION_SEC = {
+    "raw": int(os.getenv("AMR_RAW_RETENTION_SEC", str(24 * 3600))),
+    "1s": int(os.getenv("AMR_1S_RETENTION_SEC", str(7 * 24 * 3600))),
+    "1m": None,
+}
+
+# 조회 해상도: (이름, 버킷 초, 모델), 세밀한 것부터
+# raw 는 전송 주기가 AMR / 설정마다 달라서 (10 ~ 100 Hz) 점 개수를 구간 길이로 추정하지 않고 실제 행 수로 판단
+RESOLUTIONS = [
+    ("raw", None, AmrStateLog),
+    ("1s", 1, AmrStateRollup1s),
+    ("1m", 60, AmrStateRollup1m),
+]
+HISTORY_MAX_POINTS = 2000
+
+WATERMARK_NAME = "amr_state_log"
+
+_ROLLUP_TABLES = {1: AmrStateRollup1s, 60: AmrStateRollup1m}
+_LAST_COLUMNS = ("pos_x", "pos_y", "heading", "battery_pct", "state_code")
+
+
+def _bucket(ts: datetime, seconds: int) -> datetime:
+    if seconds == 60:
+        return ts.replace(second=0, microsecond=0)
+    return ts.replace(microsecond=0)
+
+
+def aggregate(rows, seconds: int) -> list:
+    """raw 행 → [{equipment_id, bucket_start, samples, last_at, ..., speed_sum}, ...]"""
+    buckets = {}
+    for r in rows:
+        key = (r.equipment_id, _bucket(r.updated_at, seconds))
+        b = buckets.get(key)
+        if b is None:
+            buckets[key] = {
+                "equipment_id": key[0],
+                "bucket_start": key[1],
+                "samples": 1,
+                "last_at": r.updated_at,
+                **{c: getattr(r, c) for c in _LAST_COLUMNS},
+                "battery_min": r.battery_pct,
+                "battery_max": r.battery_pct,
+                "speed_sum": r.speed,
+            }
+            continue
+        b["samples"] += 1
+        b["speed_sum"] += r.speed
+        b["battery_min"] = min(b["battery_min"], r.battery_pct)
+        b["battery_max"] = max(b["battery_max"], r.battery_pct)
+        if r.updated_at >= b["last_at"]:
+            b["last_at"] = r.updated_at
+            for c in _LAST_COLUMNS:
+                b[c] = getattr(r, c)
+    return list(buckets.values())
+
+
+def _merge_statement(model, rows: list):
+    """이미 있는 버킷이면 합치는 multi-row upsert (MariaDB / SQLite)"""
+    table = model.__table__
+    dialect = db.engine.dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table).values(rows)
+        new = stmt.inserted
+        least, greatest = func.least, func.greatest
+    else:
+        stmt = sqlite.insert(table).values(rows)
+        new = stmt.excluded
+        least, greatest = func.min, func.max
+
+    newer = new.last_at >= table.c.last_at
+    # MariaDB 는 SET 을 왼쪽부터 적용하므로 비교 기준인 last_at 을 마지막에 갱신
+    sets = [(table.c[c], case((newer, new[c]), else_=table.c[c])) for c in _LAST_COLUMNS]
+    sets += [
+        (table.c.samples, table.c.samples + new.samples),
+        (table.c.speed_sum, table.c.speed_sum + new.speed_sum),
+        (table.c.battery_min, least(table.c.battery_min, new.battery_min)),
+        (table.c.battery_max, greatest(table.c.battery_max, new.battery_max)),
+        (table.c.last_at, greatest(table.c.last_at, new.last_at)),
+    ]
+
+    if dialect == "mysql":
+        return stmt.on_duplicate_key_update(sets)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.equipment_id, table.c.bucket_start],
+        set_={col.name: value for col, value in sets},
+    )
+
+
+def _get_watermark() -> int:
+    wm = db.session.get(JobWatermark, WATERMARK_NAME)
+    return wm.last_id if wm else 0
+
+
+def _lock_watermark() -> JobWatermark:
+    """
+    watermark 행을 잠그고 DB 에서 다시 읽음 (트랜잭션 끝까지 유지)
+    서버 프로세스가 여러 개(gunicorn 워커 등)라 집계 스레드가 동시에 돌아도
+    같은 구간을 두 번 더하지 않도록, 다른 프로세스는 commit 될 때까지 기다렸다가 새 값을 읽는다.
+    - MariaDB: SELECT ... FOR UPDATE
+    - SQLite: FOR UPDATE 가 없으므로 같은 행을 그대로 UPDATE 해서 DB 쓰기 잠금을 먼저 잡음
+    """
+    for attempt in range(2):
+        if db.engine.dialect.name == "sqlite":
+            db.session.execute(
+                update(JobWatermark)
+                .where(JobWatermark.name == WATERMARK_NAME)
+                .values(last_id=JobWatermark.last_id)
+            )
+        wm = db.session.get(JobWatermark, WATERMARK_NAME, with_for_update=True, populate_existing=True)
+        if wm is not None or attempt:
+            return wm
+        # 첫 실행: 행을 만든 뒤 다시 잠금 (동시에 만들면 한쪽은 PK 중복 → 무시)
+        try:
+            db.session.add(JobWatermark(name=WATERMARK_NAME, last_id=0))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
+
+def rollup_once(upper_idx: int) -> int:
+    """
+    watermark < idx <= upper_idx 인 raw 행을 배치 단위로 집계 (app context 안에서 호출)
+    반환: 집계한 raw 행 수
+    """
+    total = 0
+    while True:
+        try:
+            # 배치마다 잠근 watermark 를 기준으로 읽고, 집계 결과와 watermark 를 같은 트랜잭션으로 commit
+            wm = _lock_watermark()
+            if wm.last_id >= upper_idx:
+                db.session.commit()
+                return total
+            rows = db.session.execute(
+                select(AmrStateLog.idx, AmrStateLog.equipment_id, AmrStateLog.updated_at,
+                       AmrStateLog.pos_x, AmrStateLog.pos_y, AmrStateLog.heading,
+                       AmrStateLog.battery_pct, AmrStateLog.speed, AmrStateLog.state_code)
+                .where(AmrStateLog.idx > wm.last_id, AmrStateLog.idx <= upper_idx)
+                .order_by(AmrStateLog.idx)
+                .limit(AMR_ROLLUP_BATCH_ROWS)
+            ).all()
+
+            for seconds, model in _ROLLUP_TABLES.items():
+                buckets = aggregate(rows, seconds)
+                if buckets:
+                    db.session.execute(_merge_statement(model, buckets))
+            wm.last_id = rows[-1].idx if rows else upper_idx
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        total += len(rows)
+
+
+def _delete_batches(model, key_filter: tuple, key_col, time_col, cutoff: datetime) -> int:
+    """
+    key_col 순으로 앞에서부터 AMR_DELETE_BATCH_ROWS 건씩, cutoff 이전 행만 key 범위로 삭제
+    (배치마다 짧은 트랜잭션 → 집계 / INSERT 와 락 경합 최소화)
+    """
+    deleted = 0
+    while True:
+        head = db.session.execute(
+            select(key_col, time_col)
+            .where(*key_filter)
+            .order_by(key_col)
+            .limit(AMR_DELETE_BATCH_ROWS)
+        ).all()
+        # 시간 순서가 key 순서와 다를 수 있으므로 cutoff 이전인 앞부분까지만
+        n = 0
+        while n < len(head) and head[n][1] < cutoff:
+            n += 1
+        if n == 0:
+            return deleted
+
+        result = db.session.execute(
+            model.__table__.delete().where(*key_filter, key_col <= head[n - 1][0])
+        )
+        db.session.commit()
+        deleted += result.rowcount
+        if n < len(head) or len(head) < AMR_DELETE_BATCH_ROWS:
+            return deleted
+        time.sleep(AMR_DELETE_PAUSE_SEC)
+
+
+def apply_retention(now: datetime = None) -> dict:
+    """보관 기간이 지난 raw / 1s 행 삭제 (app context 안에서 호출). 반환: 해상도별 삭제 행 수"""
+    now = now or datetime.utcnow()
+    result = {}
+
+    raw_sec = AMR_RETENTION_SEC["raw"]
+    if raw_sec:
+        watermark = _get_watermark()
+        result["raw"] = _delete_batches(
+            AmrStateLog, (AmrStateLog.idx <= watermark,),
+            AmrStateLog.idx, AmrStateLog.updated_at, now - timedelta(seconds=raw_sec),
+        )
+
+    for name, seconds, model in RESOLUTIONS[1:]:
+        keep = AMR_RETENTION_SEC.get(name)
+        if not keep:
+            continue
+        cutoff = now - timedelta(seconds=keep)
+        equipment_ids = db.session.execute(select(model.equipment_id).distinct()).scalars().all()
+        result[name] = sum(
+            _delete_batches(model, (model.equipment_id == eq,), model.bucket_start, model.bucket_start, cutoff)
+            for eq in equipment_ids
+        )
+    return result
+
+
+def _time_col(model):
+    return model.updated_at if model is AmrStateLog else model.bucket_start
+
+
+def _range_filter(model, equipment_id: str, start: datetime, end: datetime) -> tuple:
+    # (equipment_id, 시간) 인덱스 범위
+    time_col = _time_col(model)
+    return model.equipment_id == equipment_id, time_col >= start, time_col < end
+
+
+def _count_upto(model, equipment_id: str, start: datetime, end: datetime, limit: int) -> int:
+    """구간 행 수 (limit 까지만 셈 → 인덱스 범위를 끝까지 읽지 않음)"""
+    sub = (
+        select(literal(1))
+        .select_from(model)
+        .where(*_range_filter(model, equipment_id, start, end))
+        .limit(limit)
+        .subquery()
+    )
+    return db.session.execute(select(func.count()).select_from(sub)).scalar()
+
+
+def choose_resolution(equipment_id: str, start: datetime, end: datetime, max_points: int,
+                      now: datetime = None):
+    """
+    요청 구간을 max_points 이하로 보여줄 수 있는 가장 세밀한 해상도 (실제 행 수 기준).
+    보관 기간 때문에 start 시점 데이터가 없는 해상도는 건너뜀.
+    버킷 해상도는 행 수가 구간 / 버킷 초를 넘지 않으므로 그 안이면 세지 않고 바로 선택
+    반환: (이름, 모델), 어느 것도 max_points 이하가 아니면 가장 거친 해상도
+    """
+    now = now or datetime.utcnow()
+    span = max((end - start).total_seconds(), 0.0)
+    for name, step, model in RESOLUTIONS[:-1]:
+        keep = AMR_RETENTION_SEC.get(name)
+        if keep and start < now - timedelta(seconds=keep):
+            continue
+        if step is not None and span / step <= max_points:
+            return name, model
+        if _count_upto(model, equipment_id, start, end, max_points + 1) <= max_points:
+            return name, model
+    name, _, model = RESOLUTIONS[-1]
+    return name, model
+
+
+def get_amr_history(equipment_id: str, start: datetime, end: datetime,
+                    max_points: int = HISTORY_MAX_POINTS) -> dict:
+    """
+    AMR 1대의 [start, end) 상태 이력 (해상도 자동 선택)
+    가장 거친 해상도로도 max_points 를 넘으면 앞에서부터 max_points 건만 주고 truncated=True
+    """
+    name, model = choose_resolution(equipment_id, start, end, max_points)
+    rows = (
+        model.query
+        .filter(*_range_filter(model, equipment_id, start, end))
+        .order_by(_time_col(model).asc())
+        .limit(max_points + 1)
+        .all()
+    )
+    truncated = len(rows) > max_points
+    rows = rows[:max_points]
+    return {"resolution": name, "items": [r.to_dict() for r in rows], "count": len(rows), "truncated": truncated}
+
+
+class AmrRollupJob:
+
+    def __init__(self, interval_sec: float, retention_interval_sec: float):
+        self.interval_sec = interval_sec
+        self.retention_interval_sec = retention_interval_sec
+        self._app = None
+        self._thread = None
+
+    def start(self, app):
+        """집계 / 정리 스레드 시작 (start_background_jobs 에서 1회)"""
+        if self._thread is not None:
+            return
+        self._app = app
+        self._thread = threading.Thread(target=self._run, name="amr-rollup", daemon=True)
+        self._thread.start()
+        print(f"[AMR_ROLLUP] started (interval={self.interval_sec}s, retention={AMR_RETENTION_SEC})")
+
+    def _run(self):
+        upper = None
+        next_retention = time.monotonic() + self.retention_interval_sec
+        while True:
+            time.sleep(self.interval_sec)
+            with self._app.app_context():
+                try:
+                    seen = db.session.execute(select(func.max(AmrStateLog.idx))).scalar() or 0
+                    if upper is not None:
+                        rollup_once(upper)
+                    upper = seen
+
+                    if time.monotonic() >= next_retention:
+                        next_retention = time.monotonic() + self.retention_interval_sec
+                        deleted = apply_retention()
+                        if any(deleted.values()):
+                            print(f"[AMR_ROLLUP] retention deleted {deleted}")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"[AMR_ROLLUP] 오류: {e}")
+
+
+amr_rollup_job = AmrRollupJob(AMR_ROLLUP_INTERVAL_SEC, AMR_RETENTION_INTERVAL_SEC)
@@ -0,0 +1,101 @@
+# app/services/amr_state_service.py
+"""
+AMR 현재 상태 테이블 (amr_state_current) 관리
+
+amr_state_log 는 위치 이력이 계속 쌓이므로 "AMR 별 최신 1건" 을 매번 GROUP BY 로 구하면
+이력 기간에 비례해서 느려진다. AMR 당 1행인 amr_state_current 를 두고
+amr_state_log INSERT 트리거로 같은 트랜잭션 안에서 upsert 한다.
+(amr_state_log 는 AMR 쪽에서 DB 에 직접 쓰기도 하므로 앱 코드가 아니라 트리거로 보장)
+
+- updated_at 이 기존 값보다 오래된 행(지연 도착)은 현재값을 덮어쓰지 않는다.
+- 앱 시작 시 install_amr_state_current():
+  트리거가 없으면 생성, amr_state_current 가 비어 있으면 이력에서 1회 채움
+- 트리거를 만들 권한이 없으면 AMR 이 DB 에 직접 쓴 행이 amr_state_current 에 반영되지 않으므로
+  get_current_amr_states() 는 기존처럼 이력에서 GROUP BY 로 구한다 (느리지만 최신값 보장).
+"""
+
+from sqlalchemy import bindparam, text
+
+from app import db
+from app.models.dashboard import AmrStateCurrent, AmrStateLog
+from app.services import db_triggers
+from app.services.dashboard_feed import dashboard_feed
+
+TAG = "AMR_STATE"
+TRIGGER_NAME = "trg_amr_state_log_current"
+
+_COLUMNS = ["equipment_id", "log_idx", "pos_x", "pos_y", "heading", "battery_pct", "speed", "state_code", "updated_at"]
+_NEW_ROW = "VALUES (NEW.equipment_id, NEW.idx, NEW.pos_x, NEW.pos_y, NEW.heading, NEW.battery_pct, NEW.speed, NEW.state_code, NEW.updated_at)"
+
+# 이력에서 equipment_id 별 최신 1건 (기존 /amr_states 쿼리와 같은 기준)
+_LATEST_FROM_LOG = """
+    SELECT l.equipment_id, l.idx, l.pos_x, l.pos_y, l.heading, l.battery_pct, l.speed, l.state_code, l.updated_at
+    FROM amr_state_log AS l
+    JOIN (
+        SELECT equipment_id, MAX(updated_at) AS max_updated_at
+        FROM amr_state_log
+        {where}
+        GROUP BY equipment_id
+    ) AS m ON l.equipment_id = m.equipment_id AND l.updated_at = m.max_updated_at
+"""
+
+_trigger_installed = False
+
+
+def trigger_installed() -> bool:
+    """요약 테이블이 INSERT 트리거로 갱신되는지 (아니면 DB 에 직접 쓴 행은 반영되지 않음)"""
+    return _trigger_installed
+
+
+def _upsert(source: str) -> str:
+    return db_triggers.upsert_sql("amr_state_current", "equipment_id", _COLUMNS, "updated_at", source)
+
+
+def install_amr_state_current(app):
+    """트리거 생성 + (비어 있으면) 이력에서 현재값 채우기. start_background_jobs 에서 db.create_all() 뒤 1회"""
+    global _trigger_installed
+
+    with app.app_context():
+        _trigger_installed = db_triggers.install_triggers(TAG, {
+            TRIGGER_NAME: db_triggers.trigger_sql(TRIGGER_NAME, "amr_state_log", _upsert(_NEW_ROW)),
+        })
+        if not _trigger_installed:
+            print(f"[{TAG}] 트리거 없음 → /amr_states 는 amr_state_log GROUP BY 로 조회")
+        db_triggers.backfill_if_empty(TAG, "amr_state_current", _upsert(_LATEST_FROM_LOG.format(where="")))
+
+
+def save_amr_states(rows: list):
+    """
+    앱에서 AMR 상태를 기록할 때 사용: amr_state_log multi-row INSERT (+ 현재값 upsert) 를 한 트랜잭션으로
+    rows: [{"equipment_id", "pos_x", "pos_y", "heading", "battery_pct", "speed", "state_code", "updated_at"}, ...]
+    """
+    if not rows:
+        return
+    try:
+        db.session.execute(AmrStateLog.__table__.insert().values(rows))
+        if not _trigger_installed:
+            # 트리거가 없으면 방금 넣은 장비들만 이력 최신값으로 직접 upsert
+            sql = text(_upsert(_LATEST_FROM_LOG.format(where="WHERE equipment_id IN :ids")))
+            sql = sql.bindparams(bindparam("ids", expanding=True))
+            db.session.execute(sql, {"ids": sorted({r["equipment_id"] for r in rows})})
+        db.session.commit()
+        dashboard_feed.notify()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def get_current_amr_states() -> list:
+    """AMR 별 최신 상태 (equipment_id 순)"""
+    if _trigger_installed:
+        return AmrStateCurrent.query.order_by(AmrStateCurrent.equipment_id.asc()).all()
+
+    # 트리거가 없으면 amr_state_current 가 오래됐을 수 있음 → 이력에서 직접 (세션에 추가하지 않는 임시 객체)
+    # (문자열 SQL 결과도 DateTime 등 모델 타입으로 변환되도록 컬럼 타입 지정)
+    sql = text(_LATEST_FROM_LOG.format(where="") + " ORDER BY l.equipment_id").columns(
+        **{c.name: c.type for c in AmrStateLog.__table__.columns}
+    )
+    return [
+        AmrStateCurrent(log_idx=r["idx"], **{c: r[c] for c in _COLUMNS if c != "log_idx"})
+        for r in db.session.execute(sql).mappings()
+    ]
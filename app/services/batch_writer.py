@@ -0,0 +1,166 @@
+# app/services/batch_writer.py
+"""
+버퍼 writer 공통 (control_log_writer, amr_ingest)
+
+요청 / 명령 처리 스레드는 행(dict) 리스트를 큐에 넣기만 하고, 백그라운드 스레드가
+batch_rows 행이 모이거나 flush_ms 가 지나면 write_batch(rows) 1번(multi-row INSERT + commit)으로 저장한다.
+→ 호출 쪽 지연에 DB commit 왕복이 포함되지 않고, 몰려도 단건 트랜잭션이 쌓이지 않는다.
+
+- 큐: queue.SimpleQueue (C 구현, put 에 락 경합 없음), 항목 = submit() 1번의 행 리스트
+- max_rows > 0 이면 대기 행 수 상한: 넘으면 submit() 이 아무것도 넣지 않고 False (호출 쪽에서 429 등)
+- 저장 실패(DB 재시작, 락 타임아웃 등)는 BATCH_WRITER_RETRY_DELAYS 간격으로 재시도
+  재시도하는 동안 대기 행 수가 줄지 않으므로 max_rows 가 있으면 호출 쪽에 백프레셔(429)가 걸린다.
+  재시도가 모두 실패한 행은 버리고 stats["dropped"] / stats["last_error"] 로 드러냄
+  (write_batch 는 한 트랜잭션이라 실패하면 아무 행도 남지 않음 → 재시도해도 중복 없음)
+- 종료 시(atexit / stop()) 남은 행 모두 저장
+- 동기 모드(mode="sync" 또는 start() 전): 호출 스레드에서 바로 저장, DB 오류는 그대로 raise
+  (테스트 / 스크립트용)
+"""
+
+import atexit
+import queue
+import threading
+import time
+
+BATCH_WRITER_RETRY_DELAYS = (0.2, 1.0, 3.0)    # 저장 실패 후 재시도 간격 (초)
+
+_STOP = object()
+
+
+class BatchWriter:
+
+    def __init__(self, tag: str, name: str, write_batch, batch_rows: int, flush_ms: int, mode: str,
+                 max_rows: int = 0, retry_delays: tuple = BATCH_WRITER_RETRY_DELAYS):
+        """
+        write_batch(rows): 행 batch_rows 개 이하 저장 (app context 안에서 호출, 실패하면 rollback 후 raise)
+        """
+        self.tag = tag
+        self.name = name
+        self.write_batch = write_batch
+        self.batch_rows = batch_rows
+        self.flush_sec = flush_ms / 1000.0
+        self.max_rows = max_rows
+        self.retry_delays = retry_delays
+        self.sync = mode == "sync"
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._app = None
+        self._thread = None
+        self.stats = {"written": 0, "retries": 0, "dropped": 0, "throttled": 0, "last_flush_ms": 0.0,
+                      "last_error": None}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def fill_ratio(self) -> float:
+        return self._pending / self.max_rows if self.max_rows else 0.0
+
+    def start(self, app):
+        """백그라운드 writer 시작 (start_background_jobs 에서 1회, 동기 모드면 아무것도 안 함)"""
+        if self.sync or self._thread is not None:
+            return
+        self._app = app
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        print(f"[{self.tag}] buffered writer started (rows={self.batch_rows}, flush={self.flush_sec * 1000:.0f}ms, "
+              f"queue max={self.max_rows or 'unbounded'})")
+
+    def _chunks(self, rows: list):
+        for i in range(0, len(rows), self.batch_rows):
+            yield rows[i:i + self.batch_rows]
+
+    def submit(self, rows: list) -> bool:
+        """
+        rows 를 저장 대기열에 추가. 대기 행이 max_rows 를 넘으면 아무것도 넣지 않고 False
+        동기 모드(또는 writer 미시작)면 호출 스레드에서 바로 저장
+        """
+        if not rows:
+            return True
+        if self.sync or not self.running:
+            for chunk in self._chunks(rows):
+                self.write_batch(chunk)
+                self.stats["written"] += len(chunk)
+            return True
+        with self._lock:
+            if self.max_rows and self._pending + len(rows) > self.max_rows:
+                self.stats["throttled"] += len(rows)
+                return False
+            self._pending += len(rows)
+        self._queue.put(rows)
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        """남은 행을 모두 저장하고 writer 종료"""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _write_with_retry(self, chunk: list) -> bool:
+        for attempt, delay in enumerate((0.0,) + tuple(self.retry_delays)):
+            if delay:
+                time.sleep(delay)
+                self.stats["retries"] += 1
+            try:
+                with self._app.app_context():
+                    self.write_batch(chunk)
+                return True
+            except Exception as e:
+                self.stats["last_error"] = str(e)[:200]
+                print(f"[{self.tag}] insert error ({len(chunk)} rows, attempt {attempt + 1}): {e}")
+        return False
+
+    def _flush(self, batch: list):
+        started = time.perf_counter()
+        for chunk in self._chunks(batch):
+            if self._write_with_retry(chunk):
+                self.stats["written"] += len(chunk)
+            else:
+                self.stats["dropped"] += len(chunk)
+                print(f"[{self.tag}] dropped {len(chunk)} rows after {len(self.retry_delays)} retries")
+        self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        with self._lock:
+            self._pending -= len(batch)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            # 첫 항목이 올 때까지 대기, 그 뒤 flush_sec 동안 또는 batch_rows 까지 모음
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = list(item)
+            deadline = time.monotonic() + self.flush_sec
+            while len(batch) < self.batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.extend(item)
+            self._flush(batch)
+
+        # 종료: 큐에 남은 행 저장
+        rest = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                rest.extend(item)
+        if rest:
+            self._flush(rest)
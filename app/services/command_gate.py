@@ -0,0 +1,101 @@
+# app/services/command_gate.py
+"""
+장비 명령 게이트 (sender.py 앞단)
+
+센서 알림이 몰려 들어오면 같은 명령이 1초 안에 여러 번 나갈 수 있어서
+OPC UA 호출 전에 두 가지를 확인한다.
+
+- 중복 제거: 같은 장비(equipment_id) + action_type + payload 명령이
+  COMMAND_DEDUP_WINDOW_SEC 안에 이미 나갔으면 생략
+- 장비별 token bucket: 초당 rate 개, 최대 burst 개까지 허용
+
+생략된 명령은 호출 측(device_command_service)이 control_logs 에
+result_status="SUPPRESSED" 와 사유로 남긴다.
+전송이 실패한 명령은 forget() 으로 중복 기록을 지우고 token 도 돌려줘서 바로 재시도할 수 있게 한다.
+(breaker open / timeout 중 재시도가 bucket 을 비워서 복구 직후 첫 명령이 rate limited 되지 않도록)
+"""
+
+import json
+import threading
+import time
+
+from app.hardware.opcua.config import COMMAND_DEDUP_WINDOW_SEC, COMMAND_RATE_LIMIT
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def refund(self):
+        """take() 로 쓴 token 1개 반환 (burst 를 넘지 않음)"""
+        self.tokens = min(self.burst, self.tokens + 1.0)
+
+
+class CommandGate:
+
+    def __init__(self, dedup_window_sec: float, rate_limits: dict):
+        """
+        rate_limits: {"default": {"rate": 초당 개수, "burst": 최대 연속}, "AMR01": {...}, ...}
+        """
+        self.dedup_window_sec = dedup_window_sec
+        self.rate_limits = rate_limits
+        self._lock = threading.Lock()
+        self._last_sent = {}    # (equipment_id, action_type, payload json) -> monotonic ts
+        self._buckets = {}      # equipment_id -> TokenBucket
+
+    @staticmethod
+    def _key(equipment_id, action_type, payload):
+        return equipment_id, action_type, json.dumps(payload, ensure_ascii=False, sort_keys=True)
+
+    def _bucket(self, equipment_id):
+        bucket = self._buckets.get(equipment_id)
+        if bucket is None:
+            limit = self.rate_limits.get(equipment_id) or self.rate_limits["default"]
+            bucket = self._buckets[equipment_id] = TokenBucket(limit["rate"], limit["burst"])
+        return bucket
+
+    def check(self, equipment_id: str, action_type: str, payload) -> str:
+        """
+        전송 가능하면 None, 생략해야 하면 사유 문자열 반환.
+        통과한 명령은 이 시점에 전송된 것으로 기록한다.
+        """
+        key = self._key(equipment_id, action_type, payload)
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_sent.get(key)
+            if last is not None and now - last < self.dedup_window_sec:
+                return f"duplicate within {self.dedup_window_sec}s"
+            if not self._bucket(equipment_id).take(now):
+                return "rate limited"
+            self._last_sent[key] = now
+
+            # 오래된 중복 기록 정리
+            if len(self._last_sent) > 1024:
+                expired = [k for k, ts in self._last_sent.items() if now - ts >= self.dedup_window_sec]
+                for k in expired:
+                    del self._last_sent[k]
+        return None
+
+    def forget(self, equipment_id: str, action_type: str, payload):
+        """전송 실패한 명령의 중복 기록 제거 + token 반환 (재시도가 막히지 않도록)"""
+        with self._lock:
+            if self._last_sent.pop(self._key(equipment_id, action_type, payload), None) is None:
+                return
+            bucket = self._buckets.get(equipment_id)
+            if bucket is not None:
+                bucket.refund()
+
+
+command_gate = CommandGate(COMMAND_DEDUP_WINDOW_SEC, COMMAND_RATE_LIMIT)
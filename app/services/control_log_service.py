@@ -1,10 +1,22 @@
 # app/services/control_log_service.py
 
 import json
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from app.services.control_log_writer import control_log_writer
+
+
+def _payload_to_str(request_payload: Any) -> Optional[str]:
+    """request_payload 에 dict / list / str 뭐가 와도 결국 문자열로"""
+    if request_payload is None:
+        return None
+    if isinstance(request_payload, (dict, list)):
+        # dict/list 는 JSON 문자열로
+        return json.dumps(request_payload, ensure_ascii=False)
+    # 나머지는 그냥 str() 한 번
+    return str(request_payload)
 
-from app import db
-from app.models.dashboard import ControlLog  # 실제 모델 경로/이름에 맞게 수정
 
 def log_control_action(
     *,
@@ -14,39 +26,47 @@ def log_control_action(
     operator_name: Optional[str] = None,
     source: str = "API",       # 'WEB' | 'API' | 'SCRIPT'
     request_payload: Any = None,
-    result_status: str = "SUCCESS",   # 'SUCCESS' | 'FAIL' | 'TIMEOUT'
+    result_status: str = "SUCCESS",   # 'SUCCESS' | 'FAIL' | 'TIMEOUT' | 'SUPPRESSED'
     result_message: Optional[str] = None,
 ) -> None:
     """
     control_logs 테이블에 한 줄 로그를 남기는 공통 함수.
     request_payload 에 dict / list / str 뭐가 와도 결국 문자열로 저장.
     """
-    try:
-        payload_str: Optional[str] = None
-
-        if request_payload is None:
-            payload_str = None
-        elif isinstance(request_payload, (dict, list)):
-            # dict/list 는 JSON 문자열로
-            payload_str = json.dumps(request_payload, ensure_ascii=False)
-        else:
-            # 나머지는 그냥 str() 한 번
-            payload_str = str(request_payload)
-
-        log = ControlLog(
-            equipment_id=equipment_id,
-            target_type=target_type,
-            action_type=action_type,
-            operator_name=operator_name,
-            source=source,
-            request_payload=payload_str,
-            result_status=result_status,
-            result_message=result_message,
-        )
-
-        db.session.add(log)
-        db.session.commit()
-
-    except Exception as e:
-        db.session.rollback()
-        print(f"[CONTROL_LOG] insert error: {e}")
\ No newline at end of file
+    log_control_actions([{
+        "equipment_id": equipment_id,
+        "target_type": target_type,
+        "action_type": action_type,
+        "operator_name": operator_name,
+        "source": source,
+        "request_payload": request_payload,
+        "result_status": result_status,
+        "result_message": result_message,
+    }])
+
+
+def log_control_actions(records: List[Dict[str, Any]]) -> None:
+    """
+    여러 건의 control_logs 저장.
+    records 의 각 항목은 log_control_action 의 키워드 인자와 같은 dict.
+    기본은 버퍼 writer 에 넘기고 바로 반환 (multi-row INSERT 로 모아서 저장, control_log_writer.py)
+    created_at 은 저장 시각이 아니라 이 함수가 호출된 시각으로 기록한다.
+    """
+    if not records:
+        return
+
+    now = datetime.utcnow()
+    control_log_writer.write([
+        {
+            "equipment_id": r.get("equipment_id"),
+            "target_type": r["target_type"],
+            "action_type": r["action_type"],
+            "operator_name": r.get("operator_name"),
+            "source": r.get("source", "API"),
+            "request_payload": _payload_to_str(r.get("request_payload")),
+            "result_status": r.get("result_status", "SUCCESS"),
+            "result_message": r.get("result_message"),
+            "created_at": now,
+        }
+        for r in records
+    ])
@@ -0,0 +1,53 @@
+# app/services/control_log_writer.py
+"""
+control_logs 버퍼 writer
+
+명령 처리 스레드는 행(dict)을 큐에 넣기만 하고, 백그라운드 스레드가
+CONTROL_LOG_BATCH_ROWS 행이 모이거나 CONTROL_LOG_FLUSH_MS 가 지나면
+multi-row INSERT 1번 + commit 1번으로 저장한다. (공통 동작은 app/services/batch_writer.py)
+→ 명령 지연에 MariaDB commit 왕복이 포함되지 않고, 명령이 몰려도 단건 트랜잭션이 쌓이지 않는다.
+
+- 동기 모드(CONTROL_LOG_WRITE_MODE=sync 또는 start() 전): 호출 스레드에서 바로 INSERT + commit
+  (테스트 / 스크립트용), 이때도 DB 오류는 로그만 남기고 명령 처리는 계속
+"""
+
+import os
+
+from app import db
+from app.models.dashboard import ControlLog
+from app.services.batch_writer import BatchWriter
+from app.services.dashboard_feed import dashboard_feed
+
+CONTROL_LOG_BATCH_ROWS = 100
+CONTROL_LOG_FLUSH_MS = 200
+CONTROL_LOG_WRITE_MODE = os.getenv("CONTROL_LOG_WRITE_MODE", "async")   # "async" | "sync"
+
+
+def insert_rows(rows: list):
+    """control_logs multi-row INSERT + commit (app context 안에서 호출, 실패하면 rollback 후 raise)"""
+    try:
+        db.session.execute(ControlLog.__table__.insert().values(rows))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    dashboard_feed.notify()
+
+
+class ControlLogWriter(BatchWriter):
+
+    def write(self, rows: list):
+        """
+        rows: control_logs 컬럼 dict 리스트
+        비동기 모드면 큐에 넣고 바로 반환, 동기 모드(또는 writer 미시작)면 바로 저장
+        """
+        try:
+            self.submit(rows)
+        except Exception as e:
+            print(f"[{self.tag}] insert error ({len(rows)} rows): {e}")
+
+
+control_log_writer = ControlLogWriter(
+    "CONTROL_LOG", "control-log-writer", insert_rows,
+    CONTROL_LOG_BATCH_ROWS, CONTROL_LOG_FLUSH_MS, CONTROL_LOG_WRITE_MODE,
+)
@@ -0,0 +1,342 @@
+# app/services/dashboard_feed.py
+"""
+대시보드 SSE 변경 피드
+
+예전에는 /stream 이 3초마다 tick 만 보내고, 브라우저마다 tick 때 4개 API 를 다시 호출했다.
+(DB 부하 = 접속자 수 × 4 쿼리 / 3초, 바뀐 것이 없어도)
+이제 서버가 바뀐 행만 타입별 delta 이벤트로 보내고 dashboard.js 가 화면에 반영한다.
+
+구성
+  - dashboard_broadcaster: SSE 클라이언트마다 크기 제한 큐 (DASHBOARD_CLIENT_QUEUE_MAX)
+      느린 클라이언트 큐가 가득 차면 밀린 이벤트를 버리고 {"type": "resync"} 1개만 남김
+      → 브라우저가 REST API 로 전체를 다시 읽음 (다른 클라이언트 / 발행 쪽은 막히지 않음)
+  - dashboard_feed: 프로세스당 1개 스레드가 커서 이후 바뀐 행만 읽어서 발행
+      control_logs / events_logs 는 PK 커서
+      amr_state_current / mission_latest 는 행을 만든 이력 PK(log_idx / src_table 별 src_id)를 워터마크로
+      써서 같은 방식으로 커서 뒤만 읽음 (장비당 1행 전체나 이력 GROUP BY 를 매번 읽지 않음)
+      AUTO_INCREMENT id 는 commit 순서와 달라서(먼저 id 를 받은 트랜잭션이 늦게 commit) 커서 뒤
+      DASHBOARD_FEED_ID_WINDOW 개 id 는 매번 다시 확인하고, 이미 보낸 id 는 기억해서 다시 보내지 않음
+      요약 테이블 트리거가 없는 DB 에서는 요약 테이블이 DB 직접 쓰기를 놓치므로 amr_states / mission_logs
+      delta 를 보내지 않음 (화면은 hello / resync 때 REST 로드 값, 이력 GROUP BY 를 주기적으로 돌리지 않음)
+      events_logs / mission_logs / amr_state_log 는 AMR·PLC 가 DB 에 직접 쓰기도 하므로
+      앱 writer 가 직접 발행하지 않고 이 스레드가 DB 에서 읽는다 (같은 모양, 누락 없음).
+      앱 안 writer(control_log_writer, save_amr_states, save_mission_*)는 commit 후 notify() 로 바로 깨움,
+      그 밖의 변경은 DASHBOARD_FEED_POLL_SEC 주기로 확인. 구독자가 없으면 DB 를 읽지 않음.
+  - 검사 작업 상태(inspection_job)처럼 DB 를 거치지 않는 이벤트는 publish_dashboard_event() 로 바로 발행
+
+이벤트 (data: JSON, {"type", "payload"})
+  hello / resync                 → 클라이언트가 REST 로 전체 로드
+      hello 를 보내기 전에 피드 기준점을 잡아 둠(prime) → 그 뒤 변경은 모두 delta 로 옴
+  control_logs / events_logs     → {"items": [...]} 새 행 (id 오름차순, REST 목록과 같은 모양)
+  amr_states / mission_logs      → {"items": [...]} 바뀐 장비의 현재 행
+  opcua_status                   → {"items": breaker_states()} 바뀌었을 때만
+  inspection_job                 → 검사 작업 상태 (app/services/inspection_jobs.py)
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import and_, func, or_, select
+
+from app import db
+from app.hardware.opcua.circuit_breaker import breaker_states
+from app.models.dashboard import AmrStateCurrent, ControlLog, EventLog, MissionLatest
+from app.services.equipment_cache import equipment_cache
+
+DASHBOARD_CLIENT_QUEUE_MAX = 256
+DASHBOARD_FEED_POLL_SEC = float(os.getenv("DASHBOARD_FEED_POLL_SEC", "1.0"))
+DASHBOARD_FEED_MIN_GAP_SEC = 0.2        # notify() 가 몰려도 최소 간격
+DASHBOARD_FEED_MAX_ROWS = 50            # 한 번에 보낼 새 로그 행 (화면은 최근 10건만 표시)
+DASHBOARD_FEED_ID_WINDOW = 500          # 늦게 commit 되는 id 를 다시 확인할 커서 뒤 범위
+DASHBOARD_KEEPALIVE_SEC = 15.0
+
+
+# ───────── 직렬화 (REST 목록과 delta 가 같은 모양) ─────────
+
+def event_item(ev: EventLog):
+    """equipment_info 에 없는 장비의 이벤트는 None (예전 INNER JOIN 처럼 목록에서 뺌)"""
+    equipment = equipment_cache.get(ev.equipment_id)
+    if equipment is None:
+        return None
+    data = ev.to_dict()
+    data["equipment"] = equipment
+    return data
+
+
+def mission_item(row: MissionLatest) -> dict:
+    return {
+        "equipment_id": row.equipment_id,
+        "equipment_type": row.equipment_type,
+        "status": row.status,
+        "description": row.description,
+        "source": row.source,
+        "created_at": (
+            row.created_at.strftime("%Y-%m-%d %H:%M:%S")
+            if row.created_at is not None else None
+        ),
+        # 프론트에서 m.equipment?.equipment_name 로 쓰기 좋게 nested 구조
+        "equipment": equipment_cache.get(row.equipment_id),
+    }
+
+
+def amr_state_item(row: AmrStateCurrent) -> dict:
+    data = row.to_dict()
+    equipment = equipment_cache.get(row.equipment_id)
+    if equipment:
+        data["equipment"] = equipment
+    return data
+
+
+# ───────── 클라이언트 큐 ─────────
+
+class DashboardBroadcaster:
+
+    def __init__(self, queue_max: int):
+        self.queue_max = queue_max
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self.stats = {"published": 0, "resyncs": 0}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> queue.Queue:
+        q = queue.Queue(maxsize=self.queue_max)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.stats["published"] += 1
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                self._overflow(q)
+
+    def _overflow(self, q: queue.Queue):
+        """밀린 이벤트를 버리고 resync 1개로 교체 (클라이언트가 REST 로 다시 읽음)"""
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            q.put_nowait({"type": "resync", "payload": {"reason": "client queue overflow"}})
+        except queue.Full:
+            pass
+        with self._lock:
+            self.stats["resyncs"] += 1
+
+
+dashboard_broadcaster = DashboardBroadcaster(DASHBOARD_CLIENT_QUEUE_MAX)
+
+
+def publish_dashboard_event(event: dict):
+    """
+    대시보드로 푸시할 이벤트 공통 함수.
+    예) publish_dashboard_event({"type": "inspection_job", "payload": {...}})
+    """
+    dashboard_broadcaster.publish(event)
+
+
+def sse_stream(hello_payload: dict):
+    """SSE 응답 generator: 구독 → hello → 이벤트 / keepalive, 연결이 끊기면 구독 해제"""
+    q = dashboard_broadcaster.subscribe()
+    try:
+        # 구독 후 기준점을 잡고 나서 hello → 클라이언트 REST 로드와 delta 사이에 빈틈 / 중복 resync 없음
+        dashboard_feed.prime()
+        hello = {"type": "hello", "payload": hello_payload}
+        yield f"data: {json.dumps(hello, ensure_ascii=False)}\n\n"
+        while True:
+            try:
+                event = q.get(timeout=DASHBOARD_KEEPALIVE_SEC)
+            except queue.Empty:
+                # 프록시 유휴 타임아웃 방지 + 끊긴 연결 감지
+                yield ": keepalive\n\n"
+                continue
+            yield f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+    finally:
+        dashboard_broadcaster.unsubscribe(q)
+
+
+# ───────── 변경 피드 ─────────
+
+class DashboardFeed:
+
+    def __init__(self, poll_sec: float, min_gap_sec: float, max_rows: int, id_window: int):
+        self.poll_sec = poll_sec
+        self.min_gap_sec = min_gap_sec
+        self.max_rows = max_rows
+        self.id_window = id_window
+        self._wake = threading.Event()
+        self._lock = threading.Lock()     # 기준점 / 커서 (피드 스레드 + SSE 요청 스레드의 prime)
+        self._app = None
+        self._thread = None
+        self._reset()
+
+    def _reset(self):
+        # None = 아직 기준점 없음
+        self._control = None            # {"last": 최대 id, "seen": 커서 뒤 id_window 안에서 이미 본 id}
+        self._events = None
+        self._amr = None                # {"last": {None: 최대 log_idx}, "seen": {(None, log_idx), ...}}
+        self._mission = None            # {"last": {src_table: 최대 src_id}, "seen": {(src_table, src_id), ...}}
+        self._opcua_seen = None
+
+    def start(self, app):
+        """변경 피드 스레드 시작 (start_background_jobs 에서 1회)"""
+        if self._thread is not None:
+            return
+        self._app = app
+        self._thread = threading.Thread(target=self._run, name="dashboard-feed", daemon=True)
+        self._thread.start()
+        print(f"[DASHBOARD_FEED] started (poll={self.poll_sec}s)")
+        for kind, live in self._current_live().items():
+            if not live:
+                print(f"[DASHBOARD_FEED] {kind}: 요약 테이블 트리거 없음 → delta 없음 (hello / resync 때 REST 로드)")
+
+    def notify(self):
+        """앱 안 writer 가 commit 후 호출: 다음 주기를 기다리지 않고 바로 확인"""
+        self._wake.set()
+
+    def prime(self):
+        """
+        기준점이 없으면 지금 값으로 잡음 (새 SSE 구독자에게 hello 를 보내기 전, app context 안에서 호출)
+        실패하면 피드 스레드가 나중에 기준점을 잡고 resync 를 보냄
+        """
+        try:
+            with self._lock:
+                if self._control is None:
+                    self._poll_all()
+        except Exception as e:
+            db.session.rollback()
+            print(f"[DASHBOARD_FEED] 기준점 오류: {e}")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_sec)
+            self._wake.clear()
+            with self._lock:
+                if not dashboard_broadcaster.subscriber_count:
+                    # 보는 사람이 없으면 DB 를 읽지 않음, 다시 접속하면 prime → hello → REST 전체 로드
+                    self._reset()
+                    continue
+                with self._app.app_context():
+                    try:
+                        self.poll()
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"[DASHBOARD_FEED] 오류: {e}")
+            time.sleep(self.min_gap_sec)
+
+    def poll(self):
+        """커서 이후 바뀐 행을 읽어서 타입별로 1건씩 발행 (app context 안에서 호출)"""
+        fresh = self._control is None
+        self._poll_all()
+        if fresh:
+            # prime 이 실패해서 hello 전에 기준점이 없었음 → 그 사이 변경을 놓쳤을 수 있으므로 다시 읽게 함
+            publish_dashboard_event({"type": "resync", "payload": {"reason": "feed started"}})
+
+    @staticmethod
+    def _current_live() -> dict:
+        """요약 테이블이 트리거로 최신 상태인지 (아니면 delta 를 보내지 않음)"""
+        # (두 서비스가 commit 후 notify() 를 부르므로 모듈 로드 시 순환 import 를 피해 여기서 import)
+        from app.services import amr_state_service, mission_latest_service
+
+        return {
+            "amr_states": amr_state_service.trigger_installed(),
+            "mission_logs": mission_latest_service.trigger_installed(),
+        }
+
+    def _poll_all(self):
+        self._poll_log("control_logs", ControlLog, ControlLog.control_id, "_control", ControlLog.to_dict)
+        self._poll_log("events_logs", EventLog, EventLog.event_id, "_events", event_item)
+
+        live = self._current_live()
+        if live["amr_states"]:
+            self._poll_current("amr_states", AmrStateCurrent, AmrStateCurrent.log_idx, "_amr", amr_state_item)
+        if live["mission_logs"]:
+            self._poll_current("mission_logs", MissionLatest, MissionLatest.src_id, "_mission", mission_item,
+                               group_col=MissionLatest.src_table)
+
+        states = breaker_states()
+        if self._opcua_seen is not None and states != self._opcua_seen:
+            publish_dashboard_event({"type": "opcua_status", "payload": {"items": states}})
+        self._opcua_seen = states
+
+    def _poll_log(self, kind: str, model, id_col, cursor_attr: str, serialize):
+        cursor = getattr(self, cursor_attr)
+        if cursor is None:
+            # 기준점: 지금 있는 행은 hello 뒤 REST 로드에 들어감
+            last = db.session.query(func.max(id_col)).scalar() or 0
+            ids = db.session.execute(select(id_col).where(id_col > last - self.id_window)).scalars()
+            setattr(self, cursor_attr, {"last": last, "seen": set(ids)})
+            return
+
+        # 커서 뒤 id_window 부터 id 만 읽음 (PK range) → 커서보다 작은 id 가 늦게 commit 돼도 확인
+        ids = set(db.session.execute(select(id_col).where(id_col > cursor["last"] - self.id_window)).scalars())
+        new_ids = sorted(ids - cursor["seen"])
+        if not new_ids:
+            return
+        cursor["last"] = max(cursor["last"], new_ids[-1])
+        cursor["seen"] = {i for i in ids if i > cursor["last"] - self.id_window}
+        # 너무 많으면 최신 max_rows 건만 (id 오름차순)
+        rows = model.query.filter(id_col.in_(new_ids[-self.max_rows:])).order_by(id_col.asc()).all()
+        items = [item for item in map(serialize, rows) if item is not None]
+        if items:
+            publish_dashboard_event({"type": kind, "payload": {"items": items}})
+
+    def _current_window(self, model, id_col, group_col, cursor) -> list:
+        """[((그룹, 이력 PK), 행), ...] 커서 뒤 id_window 안의 행 (처음 보는 그룹은 전부)"""
+        if group_col is None:
+            cond = id_col > cursor["last"][None] - self.id_window
+        else:
+            cond = or_(
+                *(and_(group_col == g, id_col > last - self.id_window) for g, last in cursor["last"].items()),
+                group_col.notin_(list(cursor["last"])),
+            )
+        rows = model.query.filter(cond).order_by(id_col.asc()).all()
+        group = (lambda row: None) if group_col is None else (lambda row: getattr(row, group_col.key))
+        return [((group(row), getattr(row, id_col.key)), row) for row in rows]
+
+    def _poll_current(self, kind: str, model, id_col, cursor_attr: str, serialize, group_col=None):
+        """
+        장비당 1행 요약 테이블: 행이 바뀌면 행을 만든 이력 PK(id_col)도 바뀌므로
+        _poll_log 와 같은 워터마크 + id_window 로 커서 뒤 행만 읽는다.
+        group_col: 이력 PK 가 원본 테이블마다 따로면 (mission_latest.src_table) 그룹별 워터마크
+        """
+        cursor = getattr(self, cursor_attr)
+        if cursor is None:
+            if group_col is None:
+                last = {None: db.session.query(func.max(id_col)).scalar() or 0}
+            else:
+                last = dict(db.session.execute(select(group_col, func.max(id_col)).group_by(group_col)).all())
+            cursor = {"last": last, "seen": set()}
+            cursor["seen"] = {key for key, _ in self._current_window(model, id_col, group_col, cursor)}
+            setattr(self, cursor_attr, cursor)
+            return
+
+        rows = self._current_window(model, id_col, group_col, cursor)
+        new = [(key, row) for key, row in rows if key not in cursor["seen"]]
+        if not new:
+            return
+        for (g, i), _ in new:
+            cursor["last"][g] = max(cursor["last"].get(g, 0), i)
+        cursor["seen"] = {(g, i) for (g, i), _ in rows if i > cursor["last"][g] - self.id_window}
+        items = [item for item in (serialize(row) for _, row in new) if item is not None]
+        if items:
+            publish_dashboard_event({"type": kind, "payload": {"items": items}})
+
+dashboard_feed = DashboardFeed(
+    DASHBOARD_FEED_POLL_SEC, DASHBOARD_FEED_MIN_GAP_SEC, DASHBOARD_FEED_MAX_ROWS, DASHBOARD_FEED_ID_WINDOW,
+)
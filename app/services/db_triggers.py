@@ -0,0 +1,96 @@
+# app/services/db_triggers.py
+"""
+"이력 테이블 INSERT → 요약(현재값) 테이블 upsert" 트리거 공통 SQL
+
+amr_state_current, mission_latest 처럼 키당 1행인 요약 테이블을
+이력 테이블 AFTER INSERT 트리거로 같은 트랜잭션 안에서 갱신할 때 사용한다.
+- MariaDB/MySQL: INSERT ... ON DUPLICATE KEY UPDATE
+- SQLite(로컬 개발): INSERT ... ON CONFLICT DO UPDATE
+- ts_column 이 기존 값보다 오래된 행(지연 도착)은 요약 값을 덮어쓰지 않는다.
+"""
+
+from sqlalchemy import text
+
+from app import db
+
+SUPPORTED_DIALECTS = ("mysql", "sqlite")
+
+
+def dialect() -> str:
+    return db.engine.dialect.name
+
+
+def upsert_sql(table: str, key: str, columns: list, ts_column: str, source: str) -> str:
+    """
+    source(VALUES (...) 또는 SELECT ...) 를 table 에 upsert 하는 SQL
+    columns: key / ts_column 포함 전체 컬럼 (source 의 컬럼 순서와 같아야 함)
+    """
+    cols = ", ".join(columns)
+    others = [c for c in columns if c not in (key, ts_column)]
+
+    if dialect() == "mysql":
+        # ON DUPLICATE KEY UPDATE 는 왼쪽부터 적용되므로 비교 기준인 ts_column 을 마지막에 갱신
+        # 기존 값은 {table}.{col} 로 지정: INSERT ... SELECT 의 원본(alias l / x)에도 같은 이름이 있어서
+        # 그냥 쓰면 ambiguous column (1052)
+        newer = f"VALUES({ts_column}) >= {table}.{ts_column}"
+        sets = [f"{table}.{c} = IF({newer}, VALUES({c}), {table}.{c})" for c in others]
+        sets.append(f"{table}.{ts_column} = GREATEST(VALUES({ts_column}), {table}.{ts_column})")
+        return f"INSERT INTO {table} ({cols}) {source} ON DUPLICATE KEY UPDATE {', '.join(sets)}"
+
+    sets = ", ".join(f"{c} = excluded.{c}" for c in others + [ts_column])
+    if source.lstrip().upper().startswith("SELECT"):
+        # INSERT ... SELECT 뒤 ON CONFLICT 는 WHERE 절이 있어야 파싱 모호성이 없음
+        source = f"SELECT * FROM ({source}) WHERE true"
+    return (
+        f"INSERT INTO {table} ({cols}) {source} "
+        f"ON CONFLICT({key}) DO UPDATE SET {sets} "
+        f"WHERE excluded.{ts_column} >= {table}.{ts_column}"
+    )
+
+
+def trigger_sql(name: str, on_table: str, body: str) -> str:
+    """AFTER INSERT 트리거 DDL (body: NEW.* 를 쓰는 SQL 1개)"""
+    if dialect() == "mysql":
+        return f"CREATE TRIGGER {name} AFTER INSERT ON {on_table} FOR EACH ROW {body}"
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER INSERT ON {on_table} FOR EACH ROW BEGIN {body}; END"
+
+
+def trigger_exists(name: str) -> bool:
+    if dialect() == "mysql":
+        sql = "SELECT COUNT(*) FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE() AND TRIGGER_NAME = :name"
+    else:
+        sql = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name = :name"
+    return bool(db.session.execute(text(sql), {"name": name}).scalar())
+
+
+def install_triggers(tag: str, triggers: dict) -> bool:
+    """
+    triggers: {name: DDL} 중 없는 것만 생성 (app context 안에서 호출)
+    모두 준비되면 True, 미지원 DB 이거나 권한 부족 등으로 실패하면 False
+    """
+    if dialect() not in SUPPORTED_DIALECTS:
+        print(f"[{tag}] {dialect()} 는 트리거 미지원")
+        return False
+    try:
+        for name, ddl in triggers.items():
+            if not trigger_exists(name):
+                db.session.execute(text(ddl))
+                db.session.commit()
+                print(f"[{tag}] trigger {name} created")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        print(f"[{tag}] trigger 생성 실패: {e}")
+        return False
+
+
+def backfill_if_empty(tag: str, table: str, sql: str, params: dict = None):
+    """요약 테이블이 비어 있으면 이력에서 1회 채움"""
+    try:
+        if db.session.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first() is None:
+            db.session.execute(text(sql), params or {})
+            db.session.commit()
+            print(f"[{tag}] {table} backfilled")
+    except Exception as e:
+        db.session.rollback()
+        print(f"[{tag}] {table} backfill 실패: {e}")
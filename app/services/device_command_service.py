@@ -0,0 +1,116 @@
+# app/services/device_command_service.py
+
+import asyncio
+import concurrent.futures
+from typing import Any, Dict, List, Tuple
+
+from app.hardware.opcua.circuit_breaker import CircuitOpenError
+from app.hardware.opcua.sender import write_batch
+from app.services.command_gate import command_gate
+from app.services.control_log_service import log_control_actions
+
+
+def command_error_status(e: Exception) -> Tuple[str, str]:
+    """
+    write_* 호출 예외 → control_logs (result_status, result_message)
+      - 대기 한도 초과        : TIMEOUT
+      - breaker open(서버 다운): FAIL  (즉시 실패, 전송 안 함)
+      - 그 외 접속/호출 오류   : FAIL
+    """
+    if isinstance(e, CircuitOpenError):
+        return "FAIL", "OPCUA circuit open"
+    if isinstance(e, (TimeoutError, asyncio.TimeoutError, concurrent.futures.TimeoutError)):
+        return "TIMEOUT", "OPCUA timeout"
+    return "FAIL", "OPCUA access fail "
+
+
+def send_device_commands(
+    commands: List[Dict[str, Any]],
+    *,
+    operator_name: str = "SYSTEM",
+    source: str = "API",
+) -> List[Dict[str, Any]]:
+    """
+    센서 이벤트에 대한 (복합) 장비 명령을 명령 게이트(중복 제거 / 장비별 rate limit)에 통과시킨 뒤
+    남은 명령을 OPC UA Call 1번으로 보내고, 결과를 control_logs 에 한 트랜잭션으로 기록한다.
+    게이트에서 걸러진 명령은 전송하지 않고 result_status="SUPPRESSED" 로 기록.
+
+    commands 예:
+        [
+            {"equipment_id": "AMR01", "target_type": "AMR",
+             "action_type": "amr_go_move", "payload": {"move_command": "pick_up_zone"}},
+            {"equipment_id": "ARM01", "target_type": "ARM",
+             "action_type": "arm_go_move", "payload": {"move_command": "go_home"}},
+        ]
+    return: 명령 순서대로 {"action_type", "equipment_id", "result_status", "result_message"}
+    """
+    outcomes = [None] * len(commands)   # (status, msg)
+    to_send = []
+    for i, cmd in enumerate(commands):
+        reason = command_gate.check(cmd["equipment_id"], cmd["action_type"], cmd["payload"])
+        if reason:
+            print(f"[COMMAND] {cmd['equipment_id']} {cmd['action_type']} 생략: {reason}")
+            outcomes[i] = ("SUPPRESSED", reason)
+        else:
+            to_send.append(i)
+
+    if to_send:
+        try:
+            results = write_batch([
+                {"action_type": commands[i]["action_type"], "payload": commands[i]["payload"]}
+                for i in to_send
+            ])
+        except Exception as e:
+            print(f"[COMMAND] batch 전송 실패: {e!r}")
+            results = [{"ok": False, "status": None, "error": e} for _ in to_send]
+
+        for i, res in zip(to_send, results):
+            if res["ok"]:
+                outcomes[i] = ("SUCCESS", None)
+                continue
+            if res["status"]:
+                # 요청은 갔지만 해당 Method 만 실패
+                outcomes[i] = ("FAIL", f"OPCUA method fail: {res['status']}")
+            else:
+                outcomes[i] = command_error_status(res["error"])
+            cmd = commands[i]
+            command_gate.forget(cmd["equipment_id"], cmd["action_type"], cmd["payload"])
+
+    records = []
+    summary = []
+    for cmd, (status, msg) in zip(commands, outcomes):
+        records.append({
+            "equipment_id": cmd["equipment_id"],
+            "target_type": cmd["target_type"],
+            "action_type": cmd["action_type"],
+            "operator_name": operator_name,
+            "source": source,
+            "request_payload": cmd["payload"],
+            "result_status": status,
+            "result_message": msg,
+        })
+        summary.append({
+            "action_type": cmd["action_type"],
+            "equipment_id": cmd["equipment_id"],
+            "result_status": status,
+            "result_message": msg,
+        })
+
+    log_control_actions(records)
+    return summary
+
+
+def send_device_command(
+    equipment_id: str,
+    target_type: str,
+    action_type: str,
+    payload: Dict[str, Any],
+    **kwargs,
+) -> Dict[str, Any]:
+    """장비 명령 1건용 send_device_commands"""
+    return send_device_commands([{
+        "equipment_id": equipment_id,
+        "target_type": target_type,
+        "action_type": action_type,
+        "payload": payload,
+    }], **kwargs)[0]
@@ -0,0 +1,119 @@
+# app/services/equipment_cache.py
+"""
+equipment_info 프로세스 내 캐시
+
+equipment_info 는 장비 수만큼(수십 행)만 있고 거의 바뀌지 않는데,
+대시보드 조회마다 JOIN(ControlLog.equipment lazy="joined", /events_logs, /mission_logs, /amr_states)으로
+같은 행을 다시 읽고 ORM 객체로 만들었다. 테이블 전체를 한 번 읽어 두고 id 로 꺼내 쓴다.
+
+무효화
+  1) 앱에서 EquipmentInfo 를 INSERT / UPDATE / DELETE 하고 commit 하면 바로 무효화 (session 이벤트)
+  2) 다른 프로세스 / DB 직접 수정은 버전 스탬프로 감지:
+     EQUIPMENT_CACHE_CHECK_SEC 마다 (COUNT(*), MAX(updated_at), MAX(last_seen_at)) 를 읽어서 바뀌었으면 다시 읽음
+  3) 스탬프에 안 잡히는 수정(updated_at 을 안 바꾼 status 변경 등)은 EQUIPMENT_CACHE_MAX_AGE_SEC 마다 전체 재로딩
+
+값은 EquipmentInfo.to_dict() 결과 dict (읽기 전용으로 사용, 수정하지 말 것)
+app context 안에서 호출
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.dashboard import EquipmentInfo
+
+EQUIPMENT_CACHE_CHECK_SEC = float(os.getenv("EQUIPMENT_CACHE_CHECK_SEC", "5"))
+EQUIPMENT_CACHE_MAX_AGE_SEC = 300.0
+
+_SESSION_FLAG = "equipment_info_changed"
+
+
+class EquipmentCache:
+
+    def __init__(self, check_sec: float, max_age_sec: float):
+        self.check_sec = check_sec
+        self.max_age_sec = max_age_sec
+        self._lock = threading.Lock()
+        self._items = {}            # equipment_id -> to_dict()
+        self._stamp = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        # invalidate() 마다 +1, 로딩 시작 시점 값을 _loaded_gen 에 기록
+        # → 로딩 도중 무효화되면 다음 조회에서 다시 읽음
+        self._gen = 1
+        self._loaded_gen = 0
+        self.version = 0            # 다시 읽을 때마다 +1 (파생 캐시 갱신 기준)
+
+    def invalidate(self):
+        self._gen += 1
+
+    def _stamp_now(self) -> tuple:
+        t = EquipmentInfo.__table__
+        return tuple(db.session.execute(
+            select(func.count(), func.max(t.c.updated_at), func.max(t.c.last_seen_at))
+        ).one())
+
+    def _load(self) -> dict:
+        rows = db.session.execute(select(EquipmentInfo.__table__)).mappings().all()
+        # 세션에 붙지 않은 임시 객체로 to_dict() 형식을 그대로 사용
+        return {row["equipment_id"]: EquipmentInfo(**row).to_dict() for row in rows}
+
+    def _current(self) -> dict:
+        now = time.monotonic()
+        if self._loaded_gen == self._gen and now - self._checked_at < self.check_sec:
+            return self._items
+
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_gen == self._gen and now - self._checked_at < self.check_sec:
+                return self._items
+            gen = self._gen
+            stamp = self._stamp_now()
+            if self._loaded_gen != gen or stamp != self._stamp or now - self._loaded_at > self.max_age_sec:
+                self._items = self._load()
+                self._stamp = stamp
+                self._loaded_at = now
+                self.version += 1
+            self._loaded_gen = gen
+            self._checked_at = now
+            return self._items
+
+    def get(self, equipment_id: str):
+        """장비 1대 dict (없으면 None)"""
+        if equipment_id is None:
+            return None
+        return self._current().get(equipment_id)
+
+    def all(self) -> dict:
+        """{equipment_id: dict}"""
+        return self._current()
+
+    def ids(self, equipment_type: str = None) -> set:
+        items = self._current()
+        return {k for k, v in items.items() if equipment_type is None or v["equipment_type"] == equipment_type}
+
+
+equipment_cache = EquipmentCache(EQUIPMENT_CACHE_CHECK_SEC, EQUIPMENT_CACHE_MAX_AGE_SEC)
+
+
+# ───────── write-through 무효화 ─────────
+
+@event.listens_for(Session, "after_flush")
+def _mark_equipment_changed(session, flush_context):
+    if any(isinstance(obj, EquipmentInfo) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop(_SESSION_FLAG, False):
+        equipment_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop(_SESSION_FLAG, None)
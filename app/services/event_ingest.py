@@ -0,0 +1,149 @@
+# app/services/event_ingest.py
+"""
+OPC UA 이벤트 중복/역순 필터 (idempotent ingestion)
+
+asyncua 는 재접속할 때마다 구독 노드의 현재 값을 다시 보내므로,
+참(True) 상태로 남아 있는 센서 값이 AMR/ARM 명령을 다시 일으킬 수 있다.
+
+- 워커가 보내는 meta 의 node_id + source_ts(없으면 server_ts) 를 기준으로
+  노드별 마지막 처리 이벤트를 기억하고, 그보다 오래되었거나 같은 이벤트는
+  핸들러 실행 전에(명령/검사/DB 작업 전) 버린다.
+  * 타임스탬프가 같아도 값이 다르면 새 이벤트로 처리 (값 crc32 비교)
+- 인덱스는 메모리 dict 로 판정하고, 바뀐 항목만 EVENT_INGEST_FLUSH_SEC 마다
+  event_ingest_state 테이블에 저장 → 프로세스 재시작 후에도 재전달 이벤트를 거른다.
+- meta 가 없는 요청(수동 호출 등)이나 타임스탬프가 없는(숫자가 아닌) 이벤트는 그대로 통과
+- 판정(check)과 기록(commit)을 나눈다: dispatch_event 는 핸들러가 5xx 없이 끝난 뒤에만 commit
+  → 핸들러가 실패한 이벤트(DB 장애, OPC UA 타임아웃)는 워커가 다시 보내면 다시 처리된다.
+"""
+
+import atexit
+import json
+import math
+import threading
+import time
+import zlib
+
+from app import db
+from app.models.opcua import EventIngestState
+
+EVENT_INGEST_FLUSH_SEC = 1.0
+
+
+def epoch_ts(ts):
+    """meta 타임스탬프(epoch 초)가 유한한 숫자면 그대로, 아니면 None (문자열 / bool / NaN 등)"""
+    if isinstance(ts, bool) or not isinstance(ts, (int, float)) or not math.isfinite(ts):
+        return None
+    return ts
+
+
+def _value_crc(value) -> int:
+    try:
+        raw = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        raw = repr(value)
+    return zlib.crc32(raw.encode("utf-8"))
+
+
+class EventIngestIndex:
+
+    def __init__(self, flush_sec: float):
+        self.flush_sec = flush_sec
+        self._lock = threading.Lock()
+        self._last = {}     # node_id -> (ts_us, value_crc)
+        self._dirty = {}    # node_id -> (event_name, ts_us, value_crc)
+        self._app = None
+        self._thread = None
+
+    def start(self, app):
+        """DB 에 저장된 인덱스를 읽어 오고 주기 저장 스레드 시작 (start_background_jobs 에서 1회)"""
+        if self._thread is not None:
+            return
+        self._app = app
+        with app.app_context():
+            rows = EventIngestState.query.all()
+        with self._lock:
+            for r in rows:
+                self._last.setdefault(r.node_id, (r.last_ts_us, r.last_value_crc))
+        self._thread = threading.Thread(target=self._flush_loop, name="event-ingest-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self._flush_at_exit)
+        print(f"[EVENT] ingest index loaded ({len(rows)} nodes)")
+
+    def event_key(self, name: str, value, meta: dict):
+        """
+        중복 판정 키 (node_id, event_name, ts_us, value_crc), meta / 타임스탬프가 없으면 None (항상 처리)
+        """
+        if not meta:
+            return None
+        ts = epoch_ts(meta.get("source_ts")) or epoch_ts(meta.get("server_ts"))
+        if not ts:
+            return None
+
+        node_id = meta.get("node_id")
+        if not isinstance(node_id, str) or not node_id:
+            node_id = name
+        return node_id, name, int(ts * 1_000_000), _value_crc(value)
+
+    def is_processed(self, key) -> bool:
+        """이미 처리했거나(같은 ts + 같은 값) 처리한 것보다 오래된 이벤트면 True"""
+        if key is None:
+            return False
+        node_id, _, ts_us, crc = key
+        with self._lock:
+            last = self._last.get(node_id)
+        if last is None:
+            return False
+        last_ts_us, last_crc = last
+        return ts_us < last_ts_us or (ts_us == last_ts_us and crc == last_crc)
+
+    def commit(self, key):
+        """핸들러가 끝난 이벤트를 인덱스에 기록 (그 사이 더 새 이벤트가 기록됐으면 유지)"""
+        if key is None:
+            return
+        node_id, name, ts_us, crc = key
+        with self._lock:
+            last = self._last.get(node_id)
+            if last is not None and ts_us < last[0]:
+                return
+            self._last[node_id] = (ts_us, crc)
+            self._dirty[node_id] = (name, ts_us, crc)
+
+    def flush(self):
+        """바뀐 항목만 event_ingest_state 에 저장 (app context 안에서 호출)"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+
+        try:
+            for node_id, (name, ts_us, crc) in dirty.items():
+                db.session.merge(EventIngestState(
+                    node_id=node_id,
+                    event_name=name,
+                    last_ts_us=ts_us,
+                    last_value_crc=crc,
+                ))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"[EVENT] ingest index flush 오류: {e}")
+            # 다음 주기에 다시 저장 (그 사이 더 새 값이 들어왔으면 그 값 유지)
+            with self._lock:
+                for node_id, item in dirty.items():
+                    self._dirty.setdefault(node_id, item)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_sec)
+            with self._app.app_context():
+                self.flush()
+
+    def _flush_at_exit(self):
+        try:
+            with self._app.app_context():
+                self.flush()
+        except Exception as e:
+            print(f"[EVENT] ingest index 종료 저장 실패: {e}")
+
+
+ingest_index = EventIngestIndex(EVENT_INGEST_FLUSH_SEC)
@@ -0,0 +1,242 @@
+# app/services/event_router.py
+"""
+OPC UA 이벤트 라우터
+
+- 이벤트 처리 흐름은 app/services/event_routes.py 의 EVENT_ROUTES 테이블로 선언하고,
+  앱 시작 시 init_event_routes() 가 이벤트별 핸들러로 미리 컴파일해서 EVENT_HANDLERS 에 등록한다.
+- dispatch_event() 가 유일한 실행 진입점 (HTTP webhook / Unix 소켓 / embedded 모드 공통)
+- 테이블로 표현하기 어려운 이벤트는 @event_handler 로 직접 등록할 수 있다.
+- 핸들러 실행 전에 노드별 마지막 처리 이벤트와 비교해서 재전달/역순 이벤트를 버린다
+  (app/services/event_ingest.py)
+"""
+
+import json
+import time
+
+from flask import request, jsonify
+from werkzeug.exceptions import BadRequest
+
+from app.services.event_ingest import epoch_ts, ingest_index
+from app.utils import metrics
+
+# meta 의 epoch 초 타임스탬프 (숫자가 아니면 webhook 400)
+META_TS_FIELDS = ("source_ts", "server_ts", "received_ts", "dispatched_ts")
+
+# event name -> handler(value) -> (body: dict, http_status: int)
+EVENT_HANDLERS = {}
+
+
+def event_handler(name: str):
+    """
+    OPC UA 이벤트 핸들러 등록 데코레이터.
+    등록된 함수는 HTTP webhook 라우트 / Unix 소켓 / embedded 모드에서 공통으로 호출된다.
+    """
+    def decorator(func):
+        EVENT_HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def dispatch_event(name: str, value, meta: dict = None):
+    """
+    이벤트 이름으로 핸들러를 찾아 실행하고 (body, status) 를 반환.
+    DB 를 사용하므로 app context 안에서 호출해야 한다.
+
+    meta: 워커가 붙여 보내는 타임스탬프 (node_id, source_ts, server_ts, received_ts, dispatched_ts)
+          → 중복/역순 이벤트 판정 + 구간별 지연 히스토그램(app.utils.metrics)에 기록
+    """
+    handler = EVENT_HANDLERS.get(name)
+    if handler is None:
+        return {"ok": False, "error": f"unknown event: {name}"}, 404
+
+    # 재접속 후 재전달된 값 / 이미 처리한 것보다 오래된 값은 명령·검사·DB 작업 전에 버림
+    key = ingest_index.event_key(name, value, meta)
+    if ingest_index.is_processed(key):
+        print(f"[EVENT] {name} 이미 처리한 이벤트 무시: value={value}, source_ts={meta.get('source_ts')}")
+        return {"ok": True, "action": "duplicate_skipped"}, 200
+
+    started = time.time()
+    with metrics.event_scope(name), metrics.timed("handler"):
+        body, status = handler(value)
+    # 핸들러가 raise 하거나 5xx 면 처리한 것으로 기록하지 않음 → 워커 재전송 시 다시 처리
+    if status < 500:
+        ingest_index.commit(key)
+    metrics.record_event_timestamps(name, meta, started, time.time())
+    return body, status
+
+
+def handle_webhook(name: str):
+    """webhook 라우트 공통 처리: JSON body 의 value 를 dispatch_event 로 전달"""
+    try:
+        data = request.get_json(force=True)
+    except BadRequest as e:
+        # 잘못된 JSON 은 클라이언트 오류 (예외 내용은 로그에만)
+        print(f"[EVENT] {name} webhook parse 오류: {e}")
+        return jsonify({"ok": False, "error": "invalid JSON body"}), 400
+    if not isinstance(data, dict):
+        return jsonify({"ok": False, "error": "body must be a JSON object"}), 400
+    value = data.get("value")
+    meta = data.get("meta")
+    if meta is not None and not isinstance(meta, dict):
+        return jsonify({"ok": False, "error": "meta must be a JSON object"}), 400
+    for field in META_TS_FIELDS:
+        if meta and meta.get(field) is not None and epoch_ts(meta[field]) is None:
+            return jsonify({"ok": False, "error": f"meta.{field} must be a number"}), 400
+
+    body, status = dispatch_event(name, value, meta)
+    return jsonify(body), status
+
+
+# ==============================================================
+# 테이블 기반 라우팅 (EVENT_ROUTES → 핸들러 컴파일)
+# ==============================================================
+
+def _normalize_bool(value):
+    return bool(value)
+
+
+def _status_str(value):
+    # routes 키로 쓸 수 있는 문자열만 (list / dict / 숫자 등은 매칭 대상 아님)
+    return value if isinstance(value, str) else None
+
+
+def _normalize_status(value):
+    """{"status": "PICK"} / '{"status": "PICK"}' / '"PICK"' / 'PICK' → 'PICK', 그 밖의 형태는 None"""
+    if isinstance(value, dict):
+        return _status_str(value.get("status"))
+    if isinstance(value, str):
+        # JSON 으로 보이는 문자열만 파싱 (일반 문자열은 그대로 status)
+        if value[:1] in ("{", '"'):
+            try:
+                parsed = json.loads(value)
+            except ValueError:
+                return value
+            return _status_str(parsed.get("status") if isinstance(parsed, dict) else parsed)
+        return value
+    return None
+
+
+NORMALIZERS = {
+    "bool": _normalize_bool,
+    "status": _normalize_status,
+}
+
+
+# 각 step 빌더는 테이블 항목(dict)을 받아 run(value, body) -> http_status | None 함수를 만든다.
+# (무거운 모듈은 컴파일 시점에 import → 벤치마크 등에서 필요한 것만 로드)
+
+def _build_commands_step(spec: dict):
+    from app.services.device_command_service import send_device_commands
+
+    commands = [dict(c) for c in spec["commands"]]
+    operator_name = spec.get("operator_name", "SYSTEM")   # 자동 제어면 SYSTEM
+    source = spec.get("source", "API")
+
+    def run(value, body):
+        # 전송 + control_logs 기록 (중복/rate limit 이면 SUPPRESSED 로 기록만)
+        body["commands"] = send_device_commands(commands, operator_name=operator_name, source=source)
+
+    return run
+
+
+def _build_write_step(spec: dict):
+    from app.hardware.opcua.sender import WRITERS
+
+    writer = WRITERS[spec["action_type"]]
+    payload = spec["payload"]
+
+    def run(value, body):
+        writer(payload)
+
+    return run
+
+
+def _build_inspection_step(spec: dict):
+    from flask import current_app
+    from app.services.inspection_jobs import InspectionQueueFull, inspection_jobs
+
+    def run(value, body):
+        # 비전 검사 + DB 저장 + PLC OK/NG 회신은 검사 워커에서 처리하고 바로 응답
+        # (진행 상태: GET /api/v1/plc/inspection_jobs/<job_id>, 대시보드 SSE "inspection_job")
+        try:
+            job = inspection_jobs.submit(current_app._get_current_object(), trigger=value)
+        except InspectionQueueFull as e:
+            print(f"[EVENT] 검사 대기열 초과: {e}")
+            body.update(ok=False, error=str(e))
+            return 503
+        body["job_id"] = job["job_id"]
+        body["status"] = job["status"]
+        return 202
+
+    return run
+
+
+STEP_BUILDERS = {
+    "commands": _build_commands_step,
+    "write": _build_write_step,
+    "inspection": _build_inspection_step,
+}
+
+
+def compile_event(name: str, spec: dict):
+    """EVENT_ROUTES 항목 1개 → handler(value) -> (body, status)"""
+    normalize = NORMALIZERS[spec.get("normalize", "bool")]
+    routes = {
+        key: (route["action"], tuple(STEP_BUILDERS[s["type"]](s) for s in route.get("steps", ())))
+        for key, route in spec["routes"].items()
+    }
+
+    def handler(value):
+        if value == "Ready":
+            return {"action": "Ready pass"}, 200
+
+        print(f"[EVENT] {name} 수신: value={value}")
+
+        try:
+            route = routes.get(normalize(value))
+        except Exception as e:
+            print(f"[EVENT] {name} 잘못된 값: {value!r} ({e})")
+            return {"ok": False, "error": f"invalid value: {e}"}, 400
+        if route is None:
+            return {"ok": True, "action": "no_action"}, 200
+
+        action, steps = route
+        body = {"ok": True, "action": action}
+        status = 200
+        try:
+            for step in steps:
+                status = step(value, body) or status
+                if status >= 400:
+                    break
+        except Exception as e:
+            print(f"[EVENT] {name} 오류: {e}")
+            return {"ok": False, "error": str(e)}, 500
+        return body, status
+
+    handler.__name__ = f"handle_{name}"
+    return handler
+
+
+def _webhook_view(name):
+    return handle_webhook(name)
+
+
+def init_event_routes(app, routes: dict = None):
+    """
+    EVENT_ROUTES 를 핸들러로 컴파일해서 등록하고, 각 webhook 경로에 POST 라우트를 붙인다.
+    create_app() 에서 1회 호출.
+    """
+    if routes is None:
+        from app.services.event_routes import EVENT_ROUTES
+        routes = EVENT_ROUTES
+
+    for name, spec in routes.items():
+        EVENT_HANDLERS[name] = compile_event(name, spec)
+        if spec.get("webhook"):
+            app.add_url_rule(
+                spec["webhook"],
+                endpoint=f"event_{name}",
+                view_func=_webhook_view,
+                defaults={"name": name},
+                methods=["POST"],
+            )
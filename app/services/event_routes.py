@@ -0,0 +1,122 @@
+# app/services/event_routes.py
+"""
+OPC UA 이벤트 → 동작 테이블 (여기만 수정해서 이벤트 처리 흐름을 관리)
+
+이벤트 이름별 항목
+  - webhook   : HTTP 수신 경로 (SUBSCRIBE_NODES 의 "webhook" 과 동일해야 함)
+  - normalize : 값 정규화 방식
+                "bool"   → 참/거짓 (routes 키: True)
+                "status" → {"status": "..."} / JSON 문자열 / 일반 문자열에서 status 추출
+  - routes    : 정규화된 값 → {"action": 응답 action 이름, "steps": [동작, ...]}
+                (routes 에 없는 값은 no_action, 'Ready' 값은 항상 통과)
+
+steps 종류
+  - {"type": "commands", "commands": [...]}           : 명령 게이트 + OPC UA Call 1번 + control_logs 기록
+  - {"type": "write", "action_type": ..., "payload": ...} : 게이트/로그 없이 Method 단건 호출 (PLC 회신 등)
+  - {"type": "inspection"}                             : 비전 검사 작업 등록 (202 + job_id)
+
+앱 시작 시 event_router.init_event_routes() 가 이 테이블을 핸들러로 미리 컴파일한다.
+"""
+
+EVENT_ROUTES = {
+
+    # ───────── PLC ─────────
+    # 컨베이어 센서 체크 → 비전 검사 → PLC 에 OK/NG 회신 (검사 워커에서)
+    "conveyor_sensor_check": {
+        "webhook": "/api/v1/plc/conveyor_sensor_check",
+        "normalize": "bool",
+        "routes": {
+            True: {
+                "action": "conveyor_sensor_triggered",
+                "steps": [{"type": "inspection"}],
+            },
+        },
+    },
+    # 로봇암 센서 체크 → AMR pick_up_zone 이동 + ARM go_home (Call 1번)
+    "robotarm_sensor_check": {
+        "webhook": "/api/v1/plc/robotarm_sensor_check",
+        "normalize": "bool",
+        "routes": {
+            True: {
+                "action": "amr_mission_state_triggered",
+                "steps": [{
+                    "type": "commands",
+                    "commands": [
+                        {"equipment_id": "AMR01", "target_type": "AMR",
+                         "action_type": "amr_go_move", "payload": {"move_command": "pick_up_zone"}},
+                        {"equipment_id": "ARM01", "target_type": "ARM",
+                         "action_type": "arm_go_move", "payload": {"move_command": "go_home"}},
+                    ],
+                }],
+            },
+        },
+    },
+
+    # ───────── ARM ─────────
+    # Detection 체크용 이미지 (이미지 체크 및 데이터 저장은 추후)
+    "arm_img": {
+        "webhook": "/api/v1/arm/arm_img",
+        "normalize": "bool",
+        "routes": {
+            True: {"action": "arm_img_triggered", "steps": []},
+        },
+    },
+    # Place 단건 수행 완료 → PLC ready_state
+    "arm_place_single": {
+        "webhook": "/api/v1/arm/arm_place_single",
+        "normalize": "bool",
+        "routes": {
+            True: {
+                "action": "arm_place_single_triggered",
+                "steps": [{"type": "write", "action_type": "ready_state", "payload": {"move_command": True}}],
+            },
+        },
+    },
+    # Place 전체 수행 완료 → AMR 운송 시작
+    "arm_place_completed": {
+        "webhook": "/api/v1/arm/arm_place_completed",
+        "normalize": "bool",
+        "routes": {
+            True: {
+                "action": "arm_place_completed_triggered",
+                "steps": [{
+                    "type": "commands",
+                    "commands": [
+                        {"equipment_id": "AMR01", "target_type": "AMR",
+                         "action_type": "amr_go_positions", "payload": {"object_info": "esp32"}},
+                    ],
+                }],
+            },
+        },
+    },
+
+    # ───────── AMR ─────────
+    # 미션 상태: DONE(모든 미션 완료) / PICK(픽업존 도착) / ERR(이동불가)
+    "amr_mission_state": {
+        "webhook": "/api/v1/amr/amr_mission_state",
+        "normalize": "status",
+        "routes": {
+            "DONE": {"action": "mission_done", "steps": []},
+            "PICK": {
+                "action": "pick_start",
+                "steps": [{
+                    "type": "commands",
+                    "commands": [
+                        {"equipment_id": "ARM01", "target_type": "ARM",
+                         "action_type": "arm_go_move", "payload": {"move_command": "mission_start"}},
+                    ],
+                }],
+            },
+            "ERR": {
+                "action": "error_handle",
+                "steps": [{
+                    "type": "commands",
+                    "commands": [
+                        {"equipment_id": "AMR01", "target_type": "AMR",
+                         "action_type": "amr_go_move", "payload": {"move_command": "go_home"}},
+                    ],
+                }],
+            },
+        },
+    },
+}
@@ -0,0 +1,128 @@
+# app/services/event_socket.py
+"""
+Flask 프로세스 쪽 Unix 도메인 소켓 이벤트 수신기.
+
+OPC UA 워커가 EVENT_DELIVERY="unix" 모드일 때 HTTP 대신 이 소켓으로 이벤트를 보낸다.
+수신한 이벤트는 /api/v1/plc|arm|amr/* 라우트와 같은 dispatch_event 로 처리한다.
+"""
+
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.hardware.opcua.config import EVENT_DELIVERY, EVENT_SOCKET_PATH
+from app.hardware.opcua.ipc import (
+    HEADER,
+    KIND_EVENT,
+    KIND_REPLY,
+    FrameError,
+    decode_body,
+    encode_frame,
+    parse_header,
+)
+from app.services.event_router import dispatch_event
+
+
+def _recv_exact(conn: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = conn.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("socket closed")
+        buf += chunk
+    return bytes(buf)
+
+
+class EventSocketServer:
+    """
+    - 연결마다 읽기 스레드 1개
+    - 이벤트 처리는 ThreadPoolExecutor 에서 app context 를 열고 실행
+    - 응답은 request_id 를 붙여서 돌려주므로 한 연결에서 여러 이벤트가 동시에 처리될 수 있음
+    """
+
+    def __init__(self, app, path: str, max_workers: int = 8):
+        self.app = app
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="event-sock")
+        self._sock = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        # 이전 실행에서 남은 소켓 파일 정리
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.path)
+        self._sock.listen()
+
+        threading.Thread(target=self._accept_loop, name="event-sock-accept", daemon=True).start()
+        print(f"[EVENT] unix socket listening: {self.path}")
+
+    def stop(self):
+        self._stopped.set()
+        try:
+            self._sock.close()
+        except Exception:
+            pass
+        self.executor.shutdown(wait=False)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _accept_loop(self):
+        while not self._stopped.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            threading.Thread(
+                target=self._serve_connection, args=(conn,), name="event-sock-conn", daemon=True
+            ).start()
+
+    def _serve_connection(self, conn: socket.socket):
+        write_lock = threading.Lock()
+        try:
+            while True:
+                kind, request_id, body_len = parse_header(_recv_exact(conn, HEADER.size))
+                msg = decode_body(_recv_exact(conn, body_len))
+                if kind != KIND_EVENT or not isinstance(msg, dict):
+                    raise FrameError(f"unexpected frame kind={kind}")
+                self.executor.submit(self._handle, conn, write_lock, request_id, msg)
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"[EVENT] unix socket connection error: {e}")
+        finally:
+            conn.close()
+
+    def _handle(self, conn, write_lock, request_id: int, msg: dict):
+        try:
+            with self.app.app_context():
+                body, status = dispatch_event(msg.get("event"), msg.get("value"), msg.get("meta"))
+        except Exception as e:
+            print(f"[EVENT] dispatch error ({msg.get('event')}): {e}")
+            body, status = {"ok": False, "error": str(e)}, 500
+
+        frame = encode_frame(KIND_REPLY, request_id, {"status": status, "body": body})
+        try:
+            with write_lock:
+                conn.sendall(frame)
+        except OSError as e:
+            print(f"[EVENT] unix socket reply error: {e}")
+
+
+def start_event_socket_server(app):
+    """
+    워커가 unix 모드일 때만 소켓 서버 시작.
+    debug reloader 사용 시 자식 프로세스가 같은 경로로 다시 bind 하므로 마지막 프로세스가 수신한다.
+    """
+    if EVENT_DELIVERY != "unix":
+        return None
+    if not hasattr(socket, "AF_UNIX"):
+        print("[EVENT] AF_UNIX not supported on this platform, unix delivery disabled")
+        return None
+
+    server = EventSocketServer(app, EVENT_SOCKET_PATH)
+    server.start()
+    return server
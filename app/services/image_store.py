@@ -0,0 +1,60 @@
+# app/services/image_store.py
+"""
+검사 이미지 파일 저장소 (content-addressed)
+
+mission_camera_logs.image_data(BLOB) 대신 이미지를 디스크에 저장하고 image_path 에 상대 경로만 남긴다.
+- 경로: <IMAGE_STORE_DIR>/<sha256[:2]>/<sha256[2:4]>/<sha256>.<ext>
+  → 같은 이미지는 한 번만 저장, 파일 내용이 바뀌지 않으므로 sha256 을 그대로 ETag / 장기 캐시에 사용
+- 임시 파일에 쓴 뒤 os.replace 로 옮겨서, 읽는 쪽이 덜 쓰인 파일을 보지 않게 한다.
+"""
+
+import hashlib
+import os
+
+from app.utils.files import atomic_write, data_dir
+
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", data_dir("images"))
+
+MIMETYPES = {
+    "jpg": "image/jpeg",
+    "png": "image/png",
+    "bin": "application/octet-stream",
+}
+
+
+def guess_ext(data: bytes) -> str:
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    return "bin"
+
+
+def digest_of(rel_path: str) -> str:
+    """image_path → sha256 (ETag 용)"""
+    return os.path.splitext(os.path.basename(rel_path))[0]
+
+
+def mimetype_of(rel_path: str) -> str:
+    return MIMETYPES.get(os.path.splitext(rel_path)[1].lstrip("."), MIMETYPES["bin"])
+
+
+def abs_path(rel_path: str) -> str:
+    path = os.path.abspath(os.path.join(IMAGE_STORE_DIR, rel_path))
+    # image_path 는 DB 값이므로 저장소 밖을 가리키지 않는지 확인
+    if os.path.commonpath([path, os.path.abspath(IMAGE_STORE_DIR)]) != os.path.abspath(IMAGE_STORE_DIR):
+        raise ValueError(f"invalid image path: {rel_path}")
+    return path
+
+
+def save_image(data: bytes) -> str:
+    """이미지를 저장하고 image_path 에 넣을 상대 경로 반환 (이미 있으면 쓰지 않음)"""
+    digest = hashlib.sha256(data).hexdigest()
+    rel_path = os.path.join(digest[:2], digest[2:4], f"{digest}.{guess_ext(data)}")
+    path = abs_path(rel_path)
+    if os.path.exists(path):
+        return rel_path
+
+    with atomic_write(path) as f:
+        f.write(data)
+    return rel_path
@@ -0,0 +1,157 @@
+# app/services/inspection_jobs.py
+"""
+컨베이어 비전 검사 비동기 작업
+
+conveyor_sensor_check webhook 은 작업을 큐에 넣고 바로 202 + job_id 를 돌려주고,
+카메라 캡처 + 모델 추론 + DB 저장 + PLC OK/NG 회신은 아래 워커 풀에서 처리한다.
+(워커의 webhook 대기 한도 5초 안에 검사가 끝나지 않아도 실패로 보이지 않도록)
+
+- 워커 수 INSPECTION_WORKERS (카메라가 1대라 기본 1), 대기 작업 최대 INSPECTION_QUEUE_MAX
+  → 넘치면 InspectionQueueFull (라우트는 503)
+- 작업 상태: queued → running → done | failed
+  조회: GET /api/v1/plc/inspection_jobs/<job_id>
+  상태가 바뀔 때마다 대시보드 SSE 로 {"type": "inspection_job", "payload": job} 푸시
+- 최근 JOB_HISTORY_MAX 건만 메모리에 보관
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app import db
+from app.hardware.opcua.sender import write_ok_ng_value
+from app.hardware.vision_anomaly import run_anomaly_inspection_once
+from app.models.opcua import MissionCameraLog
+from app.services.dashboard_feed import publish_dashboard_event
+from app.services.image_store import save_image
+from app.utils import metrics
+
+INSPECTION_WORKERS = 1
+INSPECTION_QUEUE_MAX = 8
+JOB_HISTORY_MAX = 200
+
+EVENT_NAME = "conveyor_sensor_check"
+
+
+class InspectionQueueFull(RuntimeError):
+    pass
+
+
+def _inspect_and_reply() -> dict:
+    """검사 1회 실행 → mission_camera_logs 저장 → PLC 에 OK/NG 회신"""
+    # ------------------ 1) 비전 검사 실행 ------------------
+    with metrics.timed("inspection"):
+        inspection = run_anomaly_inspection_once()
+
+    # ------------------ 2) 검사 결과 저장 ------------------
+    image_bytes = inspection.get("image_bytes")
+    log = MissionCameraLog(
+        equipment_id="SENSER01",
+        mode="ANOMALY",
+        # 이미지는 DB 가 아니라 파일 저장소에 (경로만 저장)
+        image_path=save_image(image_bytes) if image_bytes else None,
+        module_type=inspection["module_type"],
+        classification_confidence=inspection["classification_confidence"],
+        anomaly_flag=inspection["anomaly_flag"],
+        anomaly_score=inspection["anomaly_score"],
+        decision=inspection["decision"],
+    )
+    db.session.add(log)
+    db.session.commit()
+
+    # ------------------ 3) PLC에 Anomaly 결과 회신 ------------------
+    # anomaly_flag → 'NG' / 'OK' 변환
+    anomaly_str = "NG" if inspection["anomaly_flag"] else "OK"
+    write_ok_ng_value({"Anomaly": anomaly_str})
+
+    return {
+        "module_type": inspection["module_type"],
+        "anomaly_flag": inspection["anomaly_flag"],
+        "anomaly_score": inspection["anomaly_score"],
+        "decision": inspection["decision"],
+        "log_camera_id": log.log_camera_id,
+        "reply": anomaly_str,
+    }
+
+
+class InspectionJobs:
+
+    def __init__(self, workers: int, queue_max: int, history_max: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inspection")
+        # 실행 중 + 대기 중 작업 수 제한
+        self._slots = threading.BoundedSemaphore(workers + queue_max)
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self.history_max = history_max
+
+    def _update(self, job: dict, **fields):
+        with self._lock:
+            job.update(fields)
+            snapshot = dict(job)
+        publish_dashboard_event({"type": "inspection_job", "payload": snapshot})
+
+    def submit(self, app, trigger=None) -> dict:
+        """
+        검사 작업을 큐에 넣고 job dict 반환 (app: 작업 스레드에서 쓸 Flask app)
+        대기열이 꽉 차면 InspectionQueueFull
+        """
+        if not self._slots.acquire(blocking=False):
+            raise InspectionQueueFull("inspection queue full")
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "trigger": trigger,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job["job_id"]] = job
+            while len(self._jobs) > self.history_max:
+                self._jobs.popitem(last=False)
+
+        snapshot = dict(job)
+        publish_dashboard_event({"type": "inspection_job", "payload": snapshot})
+        try:
+            self._executor.submit(self._run, app, job)
+        except Exception:
+            self._slots.release()
+            raise
+        return snapshot
+
+    def _run(self, app, job: dict):
+        try:
+            started = time.time()
+            self._update(job, status="running", started_at=started)
+            with app.app_context(), metrics.event_scope(EVENT_NAME):
+                metrics.observe("inspection_queue", started - job["created_at"])
+                try:
+                    with metrics.timed("inspection_job"):
+                        result = _inspect_and_reply()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"[PLC] inspection job {job['job_id']} 실패: {e}")
+                    self._update(job, status="failed", error=str(e), finished_at=time.time())
+                    return
+            print(f"[PLC] inspection job {job['job_id']} 완료: {result['decision']}")
+            self._update(job, status="done", result=result, finished_at=time.time())
+        finally:
+            self._slots.release()
+
+    def get(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def recent(self, limit: int = 20) -> list:
+        with self._lock:
+            jobs = list(self._jobs.values())[-limit:]
+            return [dict(j) for j in reversed(jobs)]
+
+
+inspection_jobs = InspectionJobs(INSPECTION_WORKERS, INSPECTION_QUEUE_MAX, JOB_HISTORY_MAX)
@@ -0,0 +1,233 @@
+# app/services/log_archive.py
+"""
+오래된 로그 행 보관 파일 이동 (archival)
+
+control_logs / events_logs / mission_logs / mission_plc_logs / mission_camera_logs 에서
+보관 기간(LOG_ARCHIVE_DAYS)이 지난 행을 압축 파일로 옮기고 DB 에서는 지운다.
+테이블이 계속 커지면 created_at 정렬 조회와 백업이 느려지기 때문.
+
+파일: <LOG_ARCHIVE_DIR>/<table>/<YYYY-MM-DD>/<첫 PK>-<마지막 PK>.jsonl.gz
+  - 날짜(시간 컬럼 기준, UTC)별 디렉터리, 줄마다 행 1개 JSON (datetime 은 ISO 문자열)
+  - 임시 파일에 쓰고 fsync 후 os.replace → 덜 쓰인 파일이 보이지 않음
+
+처리 순서 (배치마다, 배치 = PK 순 LOG_ARCHIVE_BATCH_ROWS 행)
+  1) 시간 컬럼 < cutoff 인 행을 PK 순으로 읽음
+  2) 날짜별 파일 저장
+  3) 같은 PK 범위 + 시간 조건으로 DELETE, 지운 행 수가 파일에 쓴 행 수와 다르면 rollback
+  4) commit 후 LOG_ARCHIVE_PAUSE_SEC 쉼 → 긴 트랜잭션 / 락 없음
+  2) 와 3) 사이에 멈추면 다음 실행이 같은 행을 다시 저장(같은 파일명으로 덮어씀)한 뒤 지운다.
+
+- mission_camera_logs: 예전 행의 image_data(BLOB)는 이미지 저장소(image_store)로 옮기고 파일에는 image_path 만 기록
+- 조회: read_archive() / GET /api/v1/archive/<table> / python -m scripts.log_archive read
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app import db
+from app.models.dashboard import ControlLog, EventLog, MissionLog, MissionPlcLog
+from app.models.opcua import MissionCameraLog
+from app.services.image_store import save_image
+from app.utils.files import atomic_write, data_dir
+
+LOG_ARCHIVE_DIR = os.getenv("LOG_ARCHIVE_DIR", data_dir("archive"))
+LOG_ARCHIVE_DAYS = int(os.getenv("LOG_ARCHIVE_DAYS", "90"))      # 0 = 보관 이동 안 함
+LOG_ARCHIVE_INTERVAL_SEC = 3600.0
+LOG_ARCHIVE_BATCH_ROWS = 1000
+LOG_ARCHIVE_PAUSE_SEC = 0.05
+LOG_ARCHIVE_MAX_QUERY_DAYS = 31
+
+ARCHIVE_TABLES = {
+    "control_logs": {"model": ControlLog, "time": "created_at"},
+    "events_logs": {"model": EventLog, "time": "created_at"},
+    "mission_logs": {"model": MissionLog, "time": "created_at"},
+    "mission_plc_logs": {"model": MissionPlcLog, "time": "created_at"},
+    # BLOB 이 남아 있는 예전 행은 이미지가 커서 배치를 작게
+    "mission_camera_logs": {"model": MissionCameraLog, "time": "created_at", "batch": 100},
+}
+
+
+def _columns(table):
+    return [c for c in table.columns if c.computed is None]
+
+
+def _pk(table):
+    (pk,) = table.primary_key.columns
+    return pk
+
+
+def _to_record(name: str, row: dict) -> dict:
+    record = {}
+    for key, value in row.items():
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        record[key] = value
+    if name == "mission_camera_logs":
+        data = record.pop("image_data", None)
+        if data and not record.get("image_path"):
+            record["image_path"] = save_image(data)
+    return record
+
+
+def _write_file(path: str, records: list):
+    with atomic_write(path) as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as gz:
+            for record in records:
+                gz.write(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+                gz.write(b"\n")
+
+
+def archive_batch(name: str, cutoff: datetime) -> int:
+    """
+    cutoff 이전 행을 PK 순으로 1배치 저장 + 삭제 (app context 안에서 호출)
+    반환: 옮긴 행 수 (배치 크기보다 작으면 남은 대상 없음)
+    """
+    spec = ARCHIVE_TABLES[name]
+    table = spec["model"].__table__
+    pk, time_col = _pk(table), table.c[spec["time"]]
+    batch = spec.get("batch", LOG_ARCHIVE_BATCH_ROWS)
+
+    try:
+        rows = db.session.execute(
+            select(*_columns(table)).where(time_col < cutoff).order_by(pk).limit(batch)
+        ).mappings().all()
+        if not rows:
+            return 0
+
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(row[time_col.name].date(), []).append(_to_record(name, dict(row)))
+        for day, records in by_day.items():
+            first, last = records[0][pk.name], records[-1][pk.name]
+            _write_file(os.path.join(LOG_ARCHIVE_DIR, name, day.isoformat(), f"{first:012d}-{last:012d}.jsonl.gz"),
+                        records)
+
+        first, last = rows[0][pk.name], rows[-1][pk.name]
+        result = db.session.execute(
+            table.delete().where(pk >= first, pk <= last, time_col < cutoff)
+        )
+        if result.rowcount != len(rows):
+            # 읽은 뒤 같은 범위에 행이 생기거나 지워짐 → 이번 배치는 지우지 않고 다음 실행에서 다시
+            db.session.rollback()
+            print(f"[LOG_ARCHIVE] {name} {first}-{last}: 삭제 {result.rowcount} != 저장 {len(rows)}, 건너뜀")
+            return 0
+        db.session.commit()
+        return len(rows)
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def archive_table(name: str, cutoff: datetime) -> int:
+    """cutoff 이전 행을 모두 옮길 때까지 배치 반복. 반환: 옮긴 행 수"""
+    batch = ARCHIVE_TABLES[name].get("batch", LOG_ARCHIVE_BATCH_ROWS)
+    total = 0
+    while True:
+        moved = archive_batch(name, cutoff)
+        total += moved
+        if moved < batch:
+            return total
+        time.sleep(LOG_ARCHIVE_PAUSE_SEC)
+
+
+def run_archive(now: datetime = None, days: int = LOG_ARCHIVE_DAYS, tables: list = None) -> dict:
+    """보관 기간이 지난 행을 테이블별로 이동. 반환: {table: 행 수}"""
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=days)
+    return {name: archive_table(name, cutoff) for name in (tables or ARCHIVE_TABLES)}
+
+
+# ───────── 조회 ─────────
+
+def _days(start: datetime, end: datetime):
+    day, last = start.date(), (end - timedelta(microseconds=1)).date()
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+def read_archive(name: str, start: datetime, end: datetime, equipment_id: str = None):
+    """
+    보관 파일에서 시간 컬럼이 [start, end) 인 행 (날짜 → PK 순), dict generator
+    (2) 뒤에 멈췄다가 다시 저장된 행이 두 파일에 있을 수 있으므로 PK 중복은 건너뜀
+    """
+    if name not in ARCHIVE_TABLES:
+        raise ValueError(f"unknown archive table: {name} (available: {', '.join(ARCHIVE_TABLES)})")
+    spec = ARCHIVE_TABLES[name]
+    time_key, pk_key = spec["time"], _pk(spec["model"].__table__).name
+
+    seen = set()
+    for day in _days(start, end):
+        day_dir = os.path.join(LOG_ARCHIVE_DIR, name, day.isoformat())
+        if not os.path.isdir(day_dir):
+            continue
+        for filename in sorted(f for f in os.listdir(day_dir) if f.endswith(".jsonl.gz")):
+            with gzip.open(os.path.join(day_dir, filename), "rt", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record[pk_key] in seen:
+                        continue
+                    t = datetime.fromisoformat(record[time_key])
+                    if t < start or t >= end:
+                        continue
+                    if equipment_id and record.get("equipment_id") != equipment_id:
+                        continue
+                    seen.add(record[pk_key])
+                    yield record
+
+
+def archive_status() -> dict:
+    """테이블별 보관 파일 현황 {table: {"first_day", "last_day", "days", "files", "bytes"}}"""
+    status = {}
+    for name in ARCHIVE_TABLES:
+        table_dir = os.path.join(LOG_ARCHIVE_DIR, name)
+        days = sorted(os.listdir(table_dir)) if os.path.isdir(table_dir) else []
+        files = [os.path.join(table_dir, d, f) for d in days for f in os.listdir(os.path.join(table_dir, d))
+                 if f.endswith(".jsonl.gz")]
+        status[name] = {
+            "first_day": days[0] if days else None,
+            "last_day": days[-1] if days else None,
+            "days": len(days),
+            "files": len(files),
+            "bytes": sum(os.path.getsize(f) for f in files),
+        }
+    return status
+
+
+class LogArchiveJob:
+
+    def __init__(self, interval_sec: float, days: int):
+        self.interval_sec = interval_sec
+        self.days = days
+        self._app = None
+        self._thread = None
+
+    def start(self, app):
+        """보관 이동 스레드 시작 (start_background_jobs 에서 1회, LOG_ARCHIVE_DAYS=0 이면 시작 안 함)"""
+        if not self.days or self._thread is not None:
+            return
+        self._app = app
+        self._thread = threading.Thread(target=self._run, name="log-archive", daemon=True)
+        self._thread.start()
+        print(f"[LOG_ARCHIVE] started (older than {self.days} days → {LOG_ARCHIVE_DIR})")
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval_sec)
+            with self._app.app_context():
+                try:
+                    moved = run_archive(days=self.days)
+                    if any(moved.values()):
+                        print(f"[LOG_ARCHIVE] archived {moved}")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"[LOG_ARCHIVE] 오류: {e}")
+
+
+log_archive_job = LogArchiveJob(LOG_ARCHIVE_INTERVAL_SEC, LOG_ARCHIVE_DAYS)
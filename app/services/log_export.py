@@ -0,0 +1,201 @@
+# app/services/log_export.py
+"""
+로그 테이블 스트리밍 내보내기 (CSV / Parquet)
+
+범위 전체를 .all() 로 읽으면 행 수만큼 메모리를 쓰므로,
+  server-side cursor (stream_results + yield_per) 로 EXPORT_CHUNK_ROWS 행씩 받아서
+  → 그 청크만 CSV 텍스트 / Parquet row group 으로 인코딩해서 바로 내보낸다.
+메모리 사용량은 범위 크기와 상관없이 청크 1개 분량으로 일정하다.
+
+- 정렬: PK 순 (INSERT 순서 ≈ 시간 순, 정렬용 임시 테이블 / filesort 없음)
+- 필터: start / end (시간 컬럼 [start, end)), equipment_id
+- BLOB(mission_camera_logs.image_data)과 생성 컬럼은 내보내지 않음
+- MariaDB(pymysql) 는 stream_results 면 SSCursor 로 서버에서 행을 나눠 받는다.
+  SSCursor 는 닫을 때 남은 행을 끝까지 읽어 버리므로, 중간에 끊기면(클라이언트 연결 종료 등)
+  커넥션을 풀에 돌려주지 않고 폐기한다.
+- Parquet 는 pyarrow 필요 (없으면 ExportError)
+
+export_rows(kind, fmt, ...) 는 bytes 청크 generator → Flask Response(stream_with_context(...)) / 파일 쓰기 공용
+"""
+
+import csv
+import io
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, select
+
+from app import db
+from app.models.dashboard import AmrStateLog, ControlLog, MissionLog
+from app.models.opcua import MissionCameraLog
+
+EXPORT_CHUNK_ROWS = 5000
+
+EXPORTS = {
+    "control_logs": {"model": ControlLog, "time": "created_at"},
+    "camera_logs": {"model": MissionCameraLog, "time": "created_at", "exclude": {"image_data"}},
+    "mission_logs": {"model": MissionLog, "time": "created_at"},
+    "amr_state_log": {"model": AmrStateLog, "time": "updated_at"},
+}
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportError(ValueError):
+    """잘못된 내보내기 요청 (400)"""
+
+
+def export_columns(kind: str) -> list:
+    spec = EXPORTS[kind]
+    table = spec["model"].__table__
+    exclude = spec.get("exclude", set())
+    return [c for c in table.columns if c.name not in exclude and c.computed is None]
+
+
+def _statement(kind: str, start: datetime = None, end: datetime = None, equipment_id: str = None):
+    spec = EXPORTS[kind]
+    table = spec["model"].__table__
+    time_col = table.c[spec["time"]]
+    stmt = select(*export_columns(kind)).order_by(*table.primary_key.columns)
+    if start:
+        stmt = stmt.where(time_col >= start)
+    if end:
+        stmt = stmt.where(time_col < end)
+    if equipment_id:
+        stmt = stmt.where(table.c.equipment_id == equipment_id)
+    return stmt
+
+
+def _stream_chunks(stmt):
+    """server-side cursor 로 EXPORT_CHUNK_ROWS 행씩 (list of Row)"""
+    conn = db.engine.connect().execution_options(stream_results=True, yield_per=EXPORT_CHUNK_ROWS)
+    finished = False
+    try:
+        for part in conn.execute(stmt).partitions():
+            yield part
+        finished = True
+    finally:
+        if not finished:
+            # 남은 행을 다 읽지 않고 버림 (SSCursor drain 방지)
+            conn.invalidate()
+        conn.close()
+
+
+# ───────── CSV ─────────
+
+def _csv_value(v):
+    if isinstance(v, datetime):
+        return v.isoformat(sep=" ")
+    return v
+
+
+def _encode_csv(columns: list, chunks):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([c.name for c in columns])
+    for rows in chunks:
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+# ───────── Parquet ─────────
+
+class _ChunkSink:
+    """ParquetWriter 출력 버퍼: write 된 bytes 를 모았다가 drain() 으로 꺼냄"""
+
+    def __init__(self):
+        self._parts = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema(pa, columns: list):
+    def arrow_type(col):
+        t = col.type
+        if isinstance(t, Boolean):
+            return pa.bool_()
+        if isinstance(t, Integer):
+            return pa.int64()
+        if isinstance(t, Float):
+            return pa.float64()
+        if isinstance(t, DateTime):
+            return pa.timestamp("us")
+        return pa.string()
+
+    return pa.schema([(c.name, arrow_type(c)) for c in columns])
+
+
+def _encode_parquet(columns: list, chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    # 청크 1개 = row group 1개
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in chunks:
+            batch = {c.name: [row[i] for row in rows] for i, c in enumerate(columns)}
+            writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_rows(kind: str, fmt: str, start: datetime = None, end: datetime = None,
+                equipment_id: str = None):
+    """
+    kind 테이블을 fmt(csv / parquet) 로 인코딩한 bytes 청크 generator
+    (app context 안에서 소비, 잘못된 kind / fmt 면 호출 즉시 ExportError)
+    """
+    if kind not in EXPORTS:
+        raise ExportError(f"unknown export: {kind} (available: {', '.join(EXPORTS)})")
+    if fmt not in FORMATS:
+        raise ExportError(f"unknown format: {fmt} (available: {', '.join(FORMATS)})")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401  (응답 시작 전에 확인)
+        except ImportError:
+            raise ExportError("parquet export requires pyarrow (pip install pyarrow)")
+
+    return _generate(kind, fmt, _statement(kind, start, end, equipment_id))
+
+
+def _generate(kind: str, fmt: str, stmt):
+    columns = export_columns(kind)
+    chunks = _stream_chunks(stmt)
+    encode = _encode_csv if fmt == "csv" else _encode_parquet
+    try:
+        yield from encode(columns, chunks)
+    finally:
+        # 중간에 끊겨도 커서 / 커넥션을 바로 정리
+        chunks.close()
@@ -0,0 +1,122 @@
+# app/services/log_search.py
+"""
+로그 검색 (control_logs / events_logs / mission_camera_logs)
+
+  GET /api/v1/search/control_logs?equipment_id=AMR01&action_type=amr_go_move&result_status=FAIL
+                                  &payload.move_command=go_home&start=2026-01-05T00:00:00&end=...
+
+- 필터: SEARCHES[kind]["filters"] 의 컬럼만 허용 (값을 콤마로 여러 개 주면 IN)
+- payload.<key>: control_logs.request_payload 의 JSON 키. 생성 컬럼으로 꺼내서 인덱스가 있는 키만 허용
+  (app/utils/json_sql.py, 마이그레이션 v0003) → 새 키를 검색하려면 생성 컬럼 + 인덱스를 먼저 추가
+- start / end: created_at 범위 [start, end) (ISO, UTC)
+- 정렬은 항상 created_at DESC, id DESC + keyset 페이지네이션(before=<next_cursor>)
+  필터마다 (필터 컬럼, created_at) 인덱스가 있어서 조건에 맞는 행을 인덱스 순서대로 읽고 limit 에서 멈춘다.
+
+허용하지 않은 인자는 무시하지 않고 ValueError (→ 400): 오타 난 필터로 전체 범위를 읽지 않도록
+"""
+
+from datetime import datetime
+
+from app.models.dashboard import ControlLog, EventLog
+from app.models.opcua import MissionCameraLog
+from app.utils.pagination import keyset_page
+
+PAYLOAD_PREFIX = "payload."
+RESERVED_ARGS = {"start", "end", "limit", "before"}
+
+SEARCHES = {
+    "control_logs": {
+        "model": ControlLog,
+        "time": ControlLog.created_at,
+        "id": ControlLog.control_id,
+        "filters": {
+            "equipment_id": ControlLog.equipment_id,
+            "target_type": ControlLog.target_type,
+            "action_type": ControlLog.action_type,
+            "result_status": ControlLog.result_status,
+            "source": ControlLog.source,
+        },
+        "payload": {
+            "move_command": ControlLog.payload_move_command,
+            "object_info": ControlLog.payload_object_info,
+        },
+    },
+    "events_logs": {
+        "model": EventLog,
+        "time": EventLog.created_at,
+        "id": EventLog.event_id,
+        "filters": {
+            "equipment_id": EventLog.equipment_id,
+            "equipment_type": EventLog.equipment_type,
+            "level": EventLog.level,
+        },
+        "payload": {},
+    },
+    "camera_logs": {
+        "model": MissionCameraLog,
+        "time": MissionCameraLog.created_at,
+        "id": MissionCameraLog.log_camera_id,
+        "filters": {
+            "equipment_id": MissionCameraLog.equipment_id,
+            "mode": MissionCameraLog.mode,
+            "decision": MissionCameraLog.decision,
+            "module_type": MissionCameraLog.module_type,
+        },
+        "payload": {},
+    },
+}
+
+
+def _parse_time(args, name: str):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"invalid {name}: {value}")
+
+
+def _column_for(spec: dict, name: str):
+    if name.startswith(PAYLOAD_PREFIX):
+        key = name[len(PAYLOAD_PREFIX):]
+        if key not in spec["payload"]:
+            raise ValueError(f"payload key not searchable: {key} (available: {', '.join(spec['payload']) or '-'})")
+        return spec["payload"][key]
+    if name not in spec["filters"]:
+        raise ValueError(f"unknown filter: {name} (available: {', '.join(spec['filters'])})")
+    return spec["filters"][name]
+
+
+def search_logs(kind: str, args, limit: int) -> dict:
+    """
+    kind: SEARCHES 키, args: request.args (MultiDict)
+    반환: keyset_page 결과 (items 는 모델 객체). 잘못된 인자면 ValueError
+    """
+    spec = SEARCHES.get(kind)
+    if spec is None:
+        raise ValueError(f"unknown log type: {kind}")
+
+    model, time_col = spec["model"], spec["time"]
+    query = model.query
+    for name in args:
+        if name in RESERVED_ARGS:
+            continue
+        values = [v for raw in args.getlist(name) for v in raw.split(",") if v]
+        if not values:
+            continue
+        col = _column_for(spec, name)
+        query = query.filter(col == values[0] if len(values) == 1 else col.in_(values))
+
+    start, end = _parse_time(args, "start"), _parse_time(args, "end")
+    if start:
+        query = query.filter(time_col >= start)
+    if end:
+        query = query.filter(time_col < end)
+
+    id_col = spec["id"]
+    return keyset_page(
+        query, time_col, id_col, limit,
+        row_key=lambda row: (getattr(row, time_col.key), getattr(row, id_col.key)),
+        before=args.get("before"),
+    )
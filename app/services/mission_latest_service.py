@@ -0,0 +1,153 @@
+# app/services/mission_latest_service.py
+"""
+장비별 최신 미션 요약 테이블 (mission_latest) 관리
+
+/mission_logs 는 대시보드마다 3초 주기로 호출되는데, 기존 쿼리는 mission_logs + mission_plc_logs
+전체 이력을 UNION 두 번 + GROUP BY 해서 이력이 쌓일수록 느려졌다.
+장비당 1행인 mission_latest 를 두 이력 테이블의 INSERT 트리거로 같은 트랜잭션에서 갱신하고
+/mission_logs 는 이 테이블만 읽는다. (amr_state_current 와 같은 방식, app/services/db_triggers.py)
+
+- created_at 이 기존 값보다 오래된 행은 덮어쓰지 않는다.
+- equipment_id 가 NULL 인 mission_logs 행은 기존 쿼리에서도 나오지 않았으므로 제외
+- 앱 시작 시 install_mission_latest(): 트리거 생성 + 비어 있으면 이력에서 1회 채움
+- 트리거를 만들 수 없는 환경이면 PLC / 외부 프로세스가 직접 쓴 이력이 mission_latest 에 반영되지 않으므로
+  get_latest_missions() 는 기존처럼 두 이력 테이블 UNION + GROUP BY 로 구한다 (느리지만 최신값 보장).
+"""
+
+from sqlalchemy import text
+
+from app import db
+from app.models.dashboard import MissionLatest, MissionLog, MissionPlcLog
+from app.services import db_triggers
+from app.services.dashboard_feed import dashboard_feed
+
+TAG = "MISSION_LATEST"
+
+_COLUMNS = ["equipment_id", "src_table", "src_id", "equipment_type", "status", "description", "source", "created_at"]
+
+# 이력 행 → mission_latest 컬럼 (기존 /mission_logs 쿼리의 UNION 두 갈래와 같은 매핑)
+_MISSION_EXPRS = ["{p}equipment_id", "'mission_logs'", "{p}mission_id", "{p}equipment_type",
+                  "{p}status", "{p}description", "{p}source", "{p}created_at"]
+_PLC_EXPRS = ["{p}equipment_id", "'mission_plc_logs'", "{p}log_plc_id", "'PLC'",
+              "NULL", "{p}description", "{p}source", "{p}created_at"]
+
+
+def _select(exprs: list, prefix: str) -> str:
+    return "SELECT " + ", ".join(f"{e.format(p=prefix)} AS {c}" for e, c in zip(exprs, _COLUMNS))
+
+
+# 트리거: NEW 행 1건 (FROM (SELECT 1) 은 MariaDB/SQLite 공통으로 WHERE 를 붙이기 위한 것)
+_NEW_WHERE = " FROM (SELECT 1) AS one WHERE NEW.equipment_id IS NOT NULL"
+
+TRIGGERS = {
+    "trg_mission_logs_latest": ("mission_logs", _select(_MISSION_EXPRS, "NEW.") + _NEW_WHERE),
+    "trg_mission_plc_logs_latest": ("mission_plc_logs", _select(_PLC_EXPRS, "NEW.") + _NEW_WHERE),
+}
+
+# 백필: 두 이력 테이블 전체를 upsert (created_at 비교로 장비별 최신 1건만 남음)
+_ALL_LOGS = f"""
+    SELECT x.* FROM (
+        {_select(_PLC_EXPRS, "mpl.")} FROM mission_plc_logs AS mpl
+        UNION ALL
+        {_select(_MISSION_EXPRS, "ml.")} FROM mission_logs AS ml WHERE ml.equipment_id IS NOT NULL
+    ) AS x
+"""
+
+# 트리거가 없을 때 조회: 이력에서 장비별 최신 1건 (기존 /mission_logs 쿼리와 같은 기준)
+_LATEST_FROM_LOGS = f"""
+    SELECT h.* FROM ({_ALL_LOGS}) AS h
+    JOIN (
+        SELECT g.equipment_id, MAX(g.created_at) AS max_created_at
+        FROM ({_ALL_LOGS}) AS g
+        GROUP BY g.equipment_id
+    ) AS m ON h.equipment_id = m.equipment_id AND h.created_at = m.max_created_at
+    ORDER BY h.created_at DESC
+"""
+
+_trigger_installed = False
+
+
+def trigger_installed() -> bool:
+    """요약 테이블이 INSERT 트리거로 갱신되는지 (아니면 DB 에 직접 쓴 행은 반영되지 않음)"""
+    return _trigger_installed
+
+
+def _upsert(source: str) -> str:
+    return db_triggers.upsert_sql("mission_latest", "equipment_id", _COLUMNS, "created_at", source)
+
+
+def install_mission_latest(app):
+    """트리거 생성 + (비어 있으면) 이력에서 채우기. start_background_jobs 에서 db.create_all() 뒤 1회"""
+    global _trigger_installed
+
+    with app.app_context():
+        _trigger_installed = db_triggers.install_triggers(TAG, {
+            name: db_triggers.trigger_sql(name, table, _upsert(select))
+            for name, (table, select) in TRIGGERS.items()
+        })
+        if not _trigger_installed:
+            print(f"[{TAG}] 트리거 없음 → /mission_logs 는 이력 테이블 GROUP BY 로 조회")
+        db_triggers.backfill_if_empty(TAG, "mission_latest", _upsert(_ALL_LOGS))
+
+
+def _upsert_row(row: dict):
+    params = {c: row.get(c) for c in _COLUMNS}
+    source = "VALUES (" + ", ".join(f":{c}" for c in _COLUMNS) + ")"
+    db.session.execute(text(_upsert(source)), params)
+
+
+def save_mission_log(log: MissionLog):
+    """mission_logs 1건 저장 (+ 트리거가 없으면 mission_latest 직접 갱신) 을 한 트랜잭션으로"""
+    try:
+        db.session.add(log)
+        db.session.flush()
+        if not _trigger_installed and log.equipment_id is not None:
+            _upsert_row({
+                **log.to_dict(),
+                "src_table": "mission_logs",
+                "src_id": log.mission_id,
+                "created_at": log.created_at,
+            })
+        db.session.commit()
+        dashboard_feed.notify()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def save_mission_plc_log(log: MissionPlcLog):
+    """mission_plc_logs 1건 저장 (+ 트리거가 없으면 mission_latest 직접 갱신) 을 한 트랜잭션으로"""
+    try:
+        db.session.add(log)
+        db.session.flush()
+        if not _trigger_installed:
+            _upsert_row({
+                **log.to_dict(),
+                "src_table": "mission_plc_logs",
+                "src_id": log.log_plc_id,
+                "equipment_type": "PLC",
+                "status": None,
+                "created_at": log.created_at,
+            })
+        db.session.commit()
+        dashboard_feed.notify()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def get_latest_missions(limit: int = None) -> list:
+    """장비별 최신 미션 (created_at 최신순, limit 건, None 이면 전체)"""
+    if _trigger_installed:
+        return (
+            MissionLatest.query
+            .order_by(MissionLatest.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    # 트리거가 없으면 mission_latest 가 오래됐을 수 있음 → 이력에서 직접 (세션에 추가하지 않는 임시 객체)
+    # (문자열 SQL 결과도 DateTime 등 모델 타입으로 변환되도록 컬럼 타입 지정)
+    sql = _LATEST_FROM_LOGS + (" LIMIT :limit" if limit is not None else "")
+    sql = text(sql).columns(**{c.name: c.type for c in MissionLatest.__table__.columns})
+    return [MissionLatest(**r) for r in db.session.execute(sql, {"limit": limit}).mappings()]
@@ -29,18 +29,23 @@ function initDashboardStream() {
       const data = JSON.parse(event.data);
       const { type, payload } = data;
 
-      if (type === "hello") {
-        console.log("[SSE] connected:", payload);
+      if (type === "hello" || type === "resync") {
+        // 접속 / 재접속 / 서버 쪽 큐 overflow → REST 로 전체 1회 로드, 이후는 delta 만 반영
+        console.log(`[SSE] ${type}:`, payload);
+        loadDashboard();
         return;
       }
 
-      if (type === "tick") {
-        // 🔁 여기서 주기적으로 최신 데이터 재요청
-        //    (필요한 것만 골라서 호출해도 됨)
-        loadAmrStates();    // AGV 위치 재렌더
-        loadEvents();       // 이벤트 로그 최신화
-        loadControlLogs();  // 제어 로그 최신화
-        loadMissionLogs();  // 미션 로그 최신화
+      // 바뀐 행만 받아서 화면에 반영 (payload.items)
+      const applyDelta = DELTA_HANDLERS[type];
+      if (applyDelta) {
+        applyDelta(payload.items || []);
+        return;
+      }
+
+      if (type === "inspection_job") {
+        // 컨베이어 비전 검사 작업 상태 (queued / running / done / failed)
+        console.log("[SSE] inspection job:", payload.job_id, payload.status, payload.result || payload.error || "");
         return;
       }
 
@@ -52,10 +57,55 @@ function initDashboardStream() {
 
   es.onerror = (err) => {
     console.error("[SSE] error", err);
-    // 브라우저가 자동 재연결 시도하니까 보통은 그냥 로그만
+    // 브라우저가 자동 재연결 시도 → 다시 hello 를 받으면 전체 로드
   };
 }
 
+function loadDashboard() {
+  loadAmrStates();    // AGV 위치 / 상태
+  loadEvents();       // 이벤트 로그
+  loadControlLogs();  // 제어 로그
+  loadMissionLogs();  // 미션 로그
+  loadOpcuaStatus();  // OPC UA 연결(breaker) 상태
+}
+
+// SSE delta 이벤트 type → 반영 함수 (app/services/dashboard_feed.py)
+const DELTA_HANDLERS = {
+  control_logs: (items) => {
+    const merged = mergeLogItems("control", "control_id", items.slice().reverse(), 10);
+    if (merged) renderControlLogs(merged);
+  },
+  events_logs: (items) => {
+    const merged = mergeLogItems("events", "event_id", items.slice().reverse(), 10);
+    if (merged) renderEvents(merged);
+  },
+  mission_logs: (items) => {
+    renderMissionLogs(upsertByEquipment(missionItems, items)
+      .sort((a, b) => (b.created_at || "").localeCompare(a.created_at || ""))
+      .slice(0, 5));
+  },
+  amr_states: (items) => {
+    renderAmrStates(upsertByEquipment(amrStates, items));
+  },
+  opcua_status: (items) => {
+    renderOpcuaStatus(items);
+  },
+};
+
+// 장비당 1행 목록에 바뀐 행 반영 (새 배열 반환)
+function upsertByEquipment(current, items) {
+  const next = current.slice();
+  items.forEach((item) => {
+    const i = next.findIndex((x) => x.equipment_id === item.equipment_id);
+    if (i >= 0) {
+      next[i] = item;
+    } else {
+      next.push(item);
+    }
+  });
+  return next;
+}
+
 
 // -------------------- Mock 데이터 --------------------
 const classifyStats = [
@@ -209,46 +259,80 @@ function createEventRow(e) {
 
   return row;
 }
-let lastEventsJson = null;
+// -------------------- 로그 증분 갱신 (keyset 커서) --------------------
+// 처음에는 최신 limit 건, 이후에는 since=<cursor> 로 새 행만 받아서 앞에 붙임
+// 반환: 화면에 보여줄 목록 (새 행이 없으면 null → 렌더 스킵)
+const logFeeds = {};
+
+function getLogFeed(key) {
+  return logFeeds[key] || (logFeeds[key] = { cursor: null, items: [] });
+}
+
+// 새 행(최신순)을 앞에 붙임. REST 응답과 SSE delta 가 겹칠 수 있어서 id 로 중복 제거
+// 반환: 갱신된 목록 (새 행이 없으면 null)
+function mergeLogItems(key, idKey, newItems, limit) {
+  const feed = getLogFeed(key);
+  const known = new Set(feed.items.map((it) => it[idKey]));
+  const fresh = newItems.filter((it) => !known.has(it[idKey]));
+  if (fresh.length === 0) return null;
+  feed.items = fresh.concat(feed.items).slice(0, limit);
+  return feed.items;
+}
+
+async function fetchLogFeed(key, url, idKey, limit) {
+  const feed = getLogFeed(key);
+  const since = feed.cursor ? `&since=${encodeURIComponent(feed.cursor)}` : "";
+
+  const res = await fetch(`${url}?limit=${limit}${since}`);
+  if (!res.ok) {
+    throw new Error(`failed to fetch ${key}: ${res.status}`);
+  }
+  const data = await res.json();
+  const items = data.items || [];
+
+  const reset = !feed.cursor || data.reset;
+  feed.cursor = data.cursor || feed.cursor;
+  if (reset) {
+    // 첫 로드 / 밀린 행이 너무 많음 → 전체 교체
+    feed.items = items;
+    return feed.items;
+  }
+  return mergeLogItems(key, idKey, items, limit);
+}
 
 async function loadEvents() {
   const eventsTable = document.getElementById("events-table");
   if (!eventsTable) return;
 
   try {
-    const res = await fetch("/api/v1/dashboard/events_logs?limit=10");
-    if (!res.ok) {
-      console.error("failed to fetch events", res.status);
-      return;
-    }
-    const data = await res.json();
-    const items = data.items || [];
-
-    // 🔍 1) 직전 데이터와 완전 동일하면 DOM 갱신 스킵
-    const newJson = JSON.stringify(items);
-    if (newJson === lastEventsJson) {
-      // console.log("[events] no change, skip render");
-      return;
-    }
-    lastEventsJson = newJson;
+    // 🔍 1) 새 이벤트가 없으면 DOM 갱신 스킵
+    const items = await fetchLogFeed("events", "/api/v1/dashboard/events_logs", "event_id", 10);
+    if (items === null) return;
 
     // 🔁 2) 바뀐 경우에만 DOM 다시 그림
-    // 헤더를 제외하고 기존 행 제거
-    while (eventsTable.children.length > 1) {
-      eventsTable.removeChild(eventsTable.lastChild);
-    }
-
-    const frag = document.createDocumentFragment();
-    items.forEach(ev => {
-      frag.appendChild(createEventRow(ev));
-    });
-    eventsTable.appendChild(frag);
+    renderEvents(items);
 
   } catch (err) {
     console.error("error loading events", err);
   }
 }
 
+function renderEvents(items) {
+  const eventsTable = document.getElementById("events-table");
+  if (!eventsTable) return;
+
+  // 헤더를 제외하고 기존 행 제거
+  while (eventsTable.children.length > 1) {
+    eventsTable.removeChild(eventsTable.lastChild);
+  }
+
+  const frag = document.createDocumentFragment();
+  items.forEach(ev => {
+    frag.appendChild(createEventRow(ev));
+  });
+  eventsTable.appendChild(frag);
+}
+
 // -------------------- 제어 로그(API) --------------------
 
 
@@ -275,7 +359,7 @@ function createControlRow(c) {
   const ttype  = c.target_type || "";      // AMR / ARM / PLC / SYSTEM
   colSrcType.textContent = ttype ? `${source} / ${ttype}` : source;
 
-  // 4) 결과 뱃지 (SUCCESS / FAIL / TIMEOUT)
+  // 4) 결과 뱃지 (SUCCESS / FAIL / TIMEOUT / SUPPRESSED)
   const colResult = document.createElement("span");
   const resultSpan = document.createElement("span");
   const result = c.result_status || "SUCCESS";
@@ -316,44 +400,71 @@ function createControlRow(c) {
   return row;
 }
 
-let lastControlJson = null;
 async function loadControlLogs() {
   const controlTable = document.getElementById("control-table");
   if (!controlTable) return;
 
   try {
-    const res = await fetch("/api/v1/dashboard/control_logs?limit=10");
+    // 🔍 1) 새 제어 로그가 없으면 렌더 스킵
+    const items = await fetchLogFeed("control", "/api/v1/dashboard/control_logs", "control_id", 10);
+    if (items === null) return;
+
+    // 🔁 2) 변경된 경우에만 DOM 갱신
+    renderControlLogs(items);
+
+  } catch (err) {
+    console.error("error loading control-logs", err);
+  }
+}
+
+function renderControlLogs(items) {
+  const controlTable = document.getElementById("control-table");
+  if (!controlTable) return;
+
+  // 헤더를 제외하고 기존 행 제거
+  while (controlTable.children.length > 1) {
+    controlTable.removeChild(controlTable.lastChild);
+  }
+
+  const frag = document.createDocumentFragment();
+  items.forEach(c => {
+    frag.appendChild(createControlRow(c));
+  });
+  controlTable.appendChild(frag);
+}
+
+// -------------------- OPC UA 연결 상태 (API) --------------------
+
+async function loadOpcuaStatus() {
+  const badge = document.getElementById("opcua-status");
+  if (!badge) return;
+
+  try {
+    const res = await fetch("/api/v1/dashboard/opcua_status");
     if (!res.ok) {
-      console.error("failed to fetch control-logs", res.status);
+      console.error("failed to fetch opcua-status", res.status);
       return;
     }
 
     const data = await res.json();
-    const items = data.items || [];
+    renderOpcuaStatus(data.items || []);
+  } catch (err) {
+    console.error("error loading opcua-status", err);
+  }
+}
 
-    // 🔍 1) 이전 데이터와 동일하면 렌더 스킵
-    const newJson = JSON.stringify(items);
-    if (newJson === lastControlJson) {
-      // console.log("[control] no change, skip render");
-      return;
-    }
-    lastControlJson = newJson;
+function renderOpcuaStatus(items) {
+  const badge = document.getElementById("opcua-status");
+  if (!badge) return;
 
-    // 🔁 2) 변경된 경우에만 DOM 갱신
-    // 헤더를 제외하고 기존 행 제거
-    while (controlTable.children.length > 1) {
-      controlTable.removeChild(controlTable.lastChild);
-    }
-
-    const frag = document.createDocumentFragment();
-    items.forEach(c => {
-      frag.appendChild(createControlRow(c));
-    });
-    controlTable.appendChild(frag);
+  // 아직 명령을 보낸 적 없으면 breaker 가 없음
+  const b = items[0];
+  const state = b ? b.state : "-";
 
-  } catch (err) {
-    console.error("error loading control-logs", err);
-  }
+  badge.textContent = `OPC UA · ${state}`;
+  badge.title = b && b.last_error ? b.last_error : "";
+  badge.classList.toggle("badge-error", state === "OPEN");
+  badge.classList.toggle("badge-warn", state === "HALF_OPEN");
 }
 
 // -------------------- 미션 렌더링 (API) --------------------
@@ -406,6 +517,8 @@ function createMissionItem(m) {
 
 // -------------------- 미션 로그 로딩 --------------------
 let lastMissionJson = null;
+let missionItems = [];   // 화면에 보이는 장비별 최신 미션 (SSE delta 반영 기준)
+
 async function loadMissionLogs() {
   const missionList = document.getElementById("mission-list");
   if (!missionList) return;
@@ -418,30 +531,36 @@ async function loadMissionLogs() {
     }
 
     const data = await res.json();
-    const items = data.items || [];
+    renderMissionLogs(data.items || []);
 
-    // 🔍 1) 이전 데이터와 동일하면 렌더 스킵
-    const newJson = JSON.stringify(items);
-    if (newJson === lastMissionJson) {
-      // console.log("[mission] no change, skip render");
-      return;
-    }
-    lastMissionJson = newJson;
+  } catch (err) {
+    console.error("error loading mission_logs", err);
+  }
+}
 
-    // 🔁 2) 변경된 경우에만 DOM 갱신
-    while (missionList.firstChild) {
-      missionList.removeChild(missionList.firstChild);
-    }
+function renderMissionLogs(items) {
+  const missionList = document.getElementById("mission-list");
+  if (!missionList) return;
+  missionItems = items;
 
-    const frag = document.createDocumentFragment();
-    items.forEach(m => {
-      frag.appendChild(createMissionItem(m));
-    });
-    missionList.appendChild(frag);
+  // 🔍 1) 이전 데이터와 동일하면 렌더 스킵
+  const newJson = JSON.stringify(items);
+  if (newJson === lastMissionJson) {
+    // console.log("[mission] no change, skip render");
+    return;
+  }
+  lastMissionJson = newJson;
 
-  } catch (err) {
-    console.error("error loading mission_logs", err);
+  // 🔁 2) 변경된 경우에만 DOM 갱신
+  while (missionList.firstChild) {
+    missionList.removeChild(missionList.firstChild);
   }
+
+  const frag = document.createDocumentFragment();
+  items.forEach(m => {
+    frag.appendChild(createMissionItem(m));
+  });
+  missionList.appendChild(frag);
 }
 
 // ================== AGV 맵 관련 ==================
@@ -474,6 +593,7 @@ async function loadMapMeta() {
 }
 
 let lastAmrJson = null;
+let amrStates = [];   // AMR 별 현재 상태 (SSE delta 반영 기준)
 
 // AMR 상태 로딩
 async function loadAmrStates() {
@@ -488,24 +608,28 @@ async function loadAmrStates() {
     }
 
     const data = await res.json();
-    const items = data.items || [];
-
-    const newJson = JSON.stringify(items);
-    if (newJson === lastAmrJson) {
-      // console.log("[amr] no change, skip render");
-      return;
-    }
-    lastAmrJson = newJson;
-
-    // 🔋 상태 박스 갱신
-    updateAgvStatus(items);
-
-    drawAmrMarkers(items);
+    renderAmrStates(data.items || []);
   } catch (err) {
     console.error("error loading amr_states", err);
   }
 }
 
+function renderAmrStates(items) {
+  amrStates = items;
+
+  const newJson = JSON.stringify(items);
+  if (newJson === lastAmrJson) {
+    // console.log("[amr] no change, skip render");
+    return;
+  }
+  lastAmrJson = newJson;
+
+  // 🔋 상태 박스 갱신
+  updateAgvStatus(items);
+
+  drawAmrMarkers(items);
+}
+
 // AMR 상태 박스 렌더링
 function updateAgvStatus(states) {
   const list = document.getElementById("agv-status-list");
@@ -0,0 +1,39 @@
+# app/utils/files.py
+"""
+프로젝트 경로 / 파일 저장 공통
+
+- BASE_DIR: 프로젝트 루트 (data/ 아래 경로 기준)
+- atomic_write(): 같은 디렉터리의 임시 파일에 쓰고 fsync 후 os.replace
+  → 읽는 쪽이 덜 쓰인 파일을 보지 않고, 중간에 죽어도 이전 파일(또는 파일 없음) 상태로 남음
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+
+def data_dir(*parts: str) -> str:
+    """<BASE_DIR>/data/<parts...>"""
+    return os.path.join(BASE_DIR, "data", *parts)
+
+
+@contextmanager
+def atomic_write(path: str):
+    """
+    with atomic_write(path) as f: f.write(b"...")
+    블록이 정상 종료되면 path 로 교체, 예외가 나면 임시 파일 삭제 후 다시 raise
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
@@ -0,0 +1,43 @@
+# app/utils/json_sql.py
+"""
+JSON 텍스트 컬럼에서 키 1개를 꺼내는 SQL 식 (생성 컬럼용, MariaDB / SQLite 공통)
+
+    db.Column(db.String(64), db.Computed(json_text("request_payload", "move_command", 64)))
+
+  MariaDB : LEFT(IF(JSON_VALID(col), JSON_VALUE(col, '$.key'), NULL), n)
+  SQLite  : CASE WHEN json_valid(col) THEN substr(json_extract(col, '$.key'), 1, n) END
+
+- JSON 이 아닌 값이나 키가 없는 행은 NULL (INSERT 가 실패하지 않도록 JSON_VALID 로 먼저 확인)
+- 컬럼 길이를 넘는 값은 잘라서 넣음 (strict 모드에서 잘림 오류 방지)
+"""
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.types import String
+
+
+class json_text(ColumnElement):
+    inherit_cache = False
+
+    def __init__(self, column: str, key: str, length: int):
+        self.column = column
+        self.key = key
+        self.length = length
+        self.type = String(length)
+
+    @property
+    def path(self) -> str:
+        return f"'$.{self.key}'"
+
+
+@compiles(json_text)
+def _json_text_sqlite(element, compiler, **kw):
+    col = compiler.preparer.quote(element.column)
+    return (f"CASE WHEN json_valid({col}) "
+            f"THEN substr(json_extract({col}, {element.path}), 1, {element.length}) END")
+
+
+@compiles(json_text, "mysql")
+def _json_text_mysql(element, compiler, **kw):
+    col = compiler.preparer.quote(element.column)
+    return f"LEFT(IF(JSON_VALID({col}), JSON_VALUE({col}, {element.path}), NULL), {element.length})"
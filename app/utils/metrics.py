@@ -0,0 +1,161 @@
+# app/utils/metrics.py
+"""
+OPC UA 이벤트 처리 구간별 지연 히스토그램 (프로세스 메모리 집계)
+
+이벤트(노드) 이름 × 구간(stage) 별로 고정 버킷 히스토그램을 유지한다.
+
+stage
+  - opcua       : SourceTimestamp → 워커 수신 (PLC/서버 → 워커)
+  - queue       : 워커 수신 → 전달 시작 (워커 내부 dispatch 대기)
+  - transport   : 전달 시작 → 핸들러 시작 (HTTP / unix socket / embedded)
+  - handler     : 핸들러 실행 전체
+  - inspection  : 비전 검사 (카메라 캡처 + 모델 추론)
+  - inspection_queue : 검사 작업 대기 (webhook 접수 → 검사 워커 시작)
+  - inspection_job   : 검사 작업 전체 (검사 + DB 저장 + PLC 회신)
+  - opcua_call  : sender.py Method 호출 1건
+  - end_to_end  : SourceTimestamp(없으면 워커 수신 시각) → 핸들러 종료
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# 버킷 상한 (ms), 마지막 버킷은 +Inf
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+# 현재 처리 중인 이벤트 이름 (핸들러 안의 inspection / opcua_call 을 이벤트별로 묶기 위함)
+_current_event = contextvars.ContextVar("latency_event", default=None)
+
+_lock = threading.Lock()
+_histograms = {}
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        ms = max(0.0, ms)
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float):
+        """버킷 상한 기준 근사 분위수 (ms)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {str(le): c for le, c in zip(BUCKETS_MS + ("+Inf",), self.counts)},
+        }
+
+
+def observe(stage: str, seconds: float, event: str = None):
+    """stage 소요 시간(초) 기록. event 생략 시 현재 event_scope 의 이벤트 사용"""
+    event = event or _current_event.get() or "unknown"
+    with _lock:
+        hist = _histograms.get((event, stage))
+        if hist is None:
+            hist = _histograms[(event, stage)] = LatencyHistogram()
+        hist.observe(seconds * 1000.0)
+
+
+@contextmanager
+def event_scope(event: str):
+    token = _current_event.set(event)
+    try:
+        yield
+    finally:
+        _current_event.reset(token)
+
+
+def current_event():
+    return _current_event.get()
+
+
+@contextmanager
+def timed(stage: str, event: str = None):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - t0, event)
+
+
+def record_event_timestamps(event: str, meta: dict, handler_start: float, handler_end: float):
+    """
+    워커가 보낸 meta(epoch 초) 와 핸들러 시작/종료 시각으로 구간 지연 기록
+    meta 예: {"source_ts": ..., "server_ts": ..., "received_ts": ..., "dispatched_ts": ...}
+    """
+    if not meta:
+        return
+
+    source_ts = meta.get("source_ts")
+    received_ts = meta.get("received_ts")
+    dispatched_ts = meta.get("dispatched_ts")
+
+    if source_ts and received_ts:
+        observe("opcua", received_ts - source_ts, event)
+    if received_ts and dispatched_ts:
+        observe("queue", dispatched_ts - received_ts, event)
+    if dispatched_ts:
+        observe("transport", handler_start - dispatched_ts, event)
+
+    origin = source_ts or received_ts
+    if origin:
+        observe("end_to_end", handler_end - origin, event)
+
+
+def snapshot() -> dict:
+    """{event: {stage: histogram dict}}"""
+    with _lock:
+        items = [(k, h.to_dict()) for k, h in _histograms.items()]
+
+    result = {}
+    for (event, stage), data in sorted(items):
+        result.setdefault(event, {})[stage] = data
+    return result
+
+
+def prometheus_text() -> str:
+    lines = [
+        "# HELP synchrobots_event_latency_ms OPC UA event latency per node and stage",
+        "# TYPE synchrobots_event_latency_ms histogram",
+    ]
+    with _lock:
+        items = sorted((k, list(h.counts), h.count, h.sum_ms) for k, h in _histograms.items())
+
+    for (event, stage), counts, count, sum_ms in items:
+        labels = f'event="{event}",stage="{stage}"'
+        cumulative = 0
+        for le, c in zip(BUCKETS_MS + ("+Inf",), counts):
+            cumulative += c
+            lines.append(f'synchrobots_event_latency_ms_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"synchrobots_event_latency_ms_sum{{{labels}}} {sum_ms:.3f}")
+        lines.append(f"synchrobots_event_latency_ms_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
@@ -0,0 +1,86 @@
+# app/utils/pagination.py
+"""
+(created_at, id) keyset 페이지네이션
+
+LIMIT/OFFSET 은 뒤 페이지로 갈수록 앞 행을 모두 읽고 버려야 하지만, keyset 은
+마지막으로 본 행의 (created_at, id) 다음부터 인덱스를 그대로 이어 읽으므로 깊은 페이지도 첫 페이지와 비용이 같다.
+(created_at 인덱스: InnoDB 보조 인덱스에는 PK 가 붙어 있어서 (created_at, id) 순서로 정렬된 상태)
+
+(t, id) 비교 앞에 created_at 단독 범위 조건을 같이 붙여서 옵티마이저가 인덱스 range 로 바로 찾아가게 한다.
+
+커서: "<created_at ISO>|<id>" 를 urlsafe base64 로 감싼 문자열 (클라이언트는 내용을 해석하지 않음)
+
+  최신순 첫 페이지 : ?limit=10
+  더 오래된 페이지 : ?limit=10&before=<next_cursor>
+  새 행만         : ?limit=10&since=<cursor>   (대시보드 주기 갱신용, 변경 없으면 items=[])
+
+응답 필드 (keyset_page 반환 dict)
+  items       : 최신순
+  cursor      : 지금까지 본 가장 새 행 → 다음 since 에 사용
+  next_cursor : 이 페이지의 가장 오래된 행 → 다음 before 에 사용 (has_more=false 면 null)
+  has_more    : before 방향으로 더 있는지
+  reset       : since 이후 새 행이 limit 보다 많아서 최신 페이지로 대체했음 (클라이언트는 목록 전체 교체)
+"""
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """잘못된 커서면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+
+def keyset_page(query, time_col, id_col, limit: int, row_key,
+                before: str = None, since: str = None) -> dict:
+    """
+    query  : 필터/조인까지 적용한 SQLAlchemy Query (정렬/limit 은 여기서 붙임)
+    row_key: 결과 행 → (created_at, id)
+    """
+    if since:
+        t, i = decode_cursor(since)
+        rows = (
+            query
+            .filter(time_col >= t, or_(time_col > t, and_(time_col == t, id_col > i)))
+            .order_by(time_col.asc(), id_col.asc())
+            .limit(limit + 1)
+            .all()
+        )
+        if len(rows) <= limit:
+            rows.reverse()
+            head = encode_cursor(*row_key(rows[0])) if rows else since
+            return {"items": rows, "cursor": head, "next_cursor": None, "has_more": False, "reset": False}
+        # 밀린 행이 너무 많으면 이어 붙이지 말고 최신 페이지로 교체
+        page = keyset_page(query, time_col, id_col, limit, row_key)
+        page["reset"] = True
+        return page
+
+    q = query
+    if before:
+        t, i = decode_cursor(before)
+        q = q.filter(time_col <= t, or_(time_col < t, and_(time_col == t, id_col < i)))
+    rows = q.order_by(time_col.desc(), id_col.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # since 용 커서는 최신 페이지에서만 의미가 있음
+    head = encode_cursor(*row_key(rows[0])) if rows and not before else None
+    return {
+        "items": rows,
+        "cursor": head,
+        "next_cursor": encode_cursor(*row_key(rows[-1])) if has_more else None,
+        "has_more": has_more,
+        "reset": False,
+    }
@@ -2,38 +2,85 @@
 
 from flask import render_template
 from . import vision_bp
-from flask import Blueprint, render_template, send_file, abort
+from flask import Blueprint, render_template, send_file, abort, request
 from io import BytesIO
+import hashlib
+import os
 from app import db
 from app.models.opcua import MissionCameraLog
+from app.services import image_store
+from app.utils.pagination import keyset_page
+
+# content-addressed 파일이라 URL(log_id)별 내용이 바뀌지 않음
+IMAGE_MAX_AGE_SEC = 365 * 24 * 3600
 
 @vision_bp.get("/mission-camera-logs")
 def index():
     """
     미션 카메라 로그를 최근 순으로 몇 개만 보여주는 팝업 페이지
+    ?before=<next_cursor> 로 이전 페이지 (keyset, app/utils/pagination.py)
     """
-    logs = (
-        MissionCameraLog.query
-        .order_by(MissionCameraLog.created_at.desc())
-        .limit(50)
-        .all()
+    try:
+        page = keyset_page(
+            MissionCameraLog.query,
+            MissionCameraLog.created_at, MissionCameraLog.log_camera_id,
+            50,
+            row_key=lambda log: (log.created_at, log.log_camera_id),
+            before=request.args.get("before"),
+        )
+    except ValueError:
+        abort(400)
+    return render_template(
+        "mission_camera_logs_popup.html",
+        logs=page["items"],
+        next_cursor=page["next_cursor"],
     )
-    return render_template("mission_camera_logs_popup.html", logs=logs)
 
 @vision_bp.route("/mission-camera-logs/image/<int:log_id>")
 def mission_camera_log_image(log_id: int):
     """
-    특정 로그의 image_data BLOB 을 그대로 내려주는 엔드포인트
-    <img src="..."> 에서 사용
+    특정 로그의 검사 이미지. <img src="..."> 에서 사용
+    - image_path 파일을 스트리밍 (ETag=sha256, Range 지원, 내용이 바뀌지 않으므로 1년 캐시)
+    - 아직 파일로 옮기지 않은 예전 행은 image_data BLOB 으로 응답
     """
-    log = MissionCameraLog.query.get(log_id)
-    if not log or not log.image_data:
+    row = (
+        db.session.query(MissionCameraLog.image_path)
+        .filter(MissionCameraLog.log_camera_id == log_id)
+        .first()
+    )
+    if row is None:
         abort(404)
 
-    # 여기서는 일단 JPEG 가정 (로그 내용에 JFIF 헤더 보이니 JPG일 확률 높음)
-    # 만약 PNG도 섞이면 content_type을 컬럼으로 따로 두거나 헤더보고 판단
+    if row.image_path:
+        try:
+            path = image_store.abs_path(row.image_path)
+        except ValueError:
+            abort(404)
+        if not os.path.exists(path):
+            abort(404)
+        response = send_file(
+            path,
+            mimetype=image_store.mimetype_of(row.image_path),
+            conditional=True,
+            etag=image_store.digest_of(row.image_path),
+            max_age=IMAGE_MAX_AGE_SEC,
+        )
+        response.headers["Cache-Control"] = f"public, max-age={IMAGE_MAX_AGE_SEC}, immutable"
+        return response
+
+    image_data = (
+        db.session.query(MissionCameraLog.image_data)
+        .filter(MissionCameraLog.log_camera_id == log_id)
+        .scalar()
+    )
+    if not image_data:
+        abort(404)
+
+    ext = image_store.guess_ext(image_data)
     return send_file(
-        BytesIO(log.image_data),
-        mimetype="image/jpeg",
-        download_name=f"log_{log_id}.jpg",
-    )
\ No newline at end of file
+        BytesIO(image_data),
+        mimetype=image_store.MIMETYPES[ext],
+        download_name=f"log_{log_id}.{ext}",
+        conditional=True,
+        etag=hashlib.sha256(image_data).hexdigest(),
+    )
@@ -4,9 +4,14 @@ import config
 # from app.hardware.Modbus import ModbusMonitor
 import os
 import time
-from app import create_app
+from app import create_app, start_background_jobs
 
 app = create_app()
+# use_reloader=True 면 이 파일이 감시(부모) 프로세스와 서버(자식, WERKZEUG_RUN_MAIN=true) 에서 두 번 실행된다.
+# 스키마 변경 / 집계 / 보관 / writer 는 요청을 받는 서버 프로세스에서만 시작
+# (WSGI 서버가 import 할 때는 __name__ != "__main__" → 바로 시작)
+if __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+    start_background_jobs(app)
 # print(app.url_map)  # 이 줄 추가해서 어떤 URL이 등록됐는지 확인
 
 # 간단한 상태 저장(선택)
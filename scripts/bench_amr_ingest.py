@@ -0,0 +1,224 @@
+# scripts/bench_amr_ingest.py
+"""
+AMR 텔레메트리 수집 부하 테스트 (POST /api/v1/amr/telemetry)
+
+목표 부하는 --amrs 대 × --rate 샘플/초 (기본 20대 × 100 = 2,000 샘플/초, 요청 1건에 --batch 샘플).
+목표 속도로만 보내면 "보낸 만큼" 만 측정되므로(저장 능력이 더 커도 2,000, 조금만 밀려도 FAIL)
+목표의 --overload 배(기본 2배)를 open-loop 로 보낸다:
+  각 AMR 은 응답과 관계없이 정해진 시각에 다음 배치를 보내고, 429 를 받은 배치는 다시 보내지 않는다.
+→ writer 가 포화된 상태에서 실제로 저장한 행 수 / 전체 시간(전송 + 큐 비우기) = 저장 처리량(capacity)
+
+끝나면 writer 큐가 빌 때까지 기다린 뒤 amr_state_log 행 수와 amr_state_current 를 확인하고,
+  - capacity 가 목표 샘플/초 이상
+  - 202 로 받은 샘플이 모두 저장됨 (amr_state_log 행 수 == 수락 샘플 수, writer dropped 0)
+  - amr_state_current 가 AMR 마다 마지막으로 수락된 샘플과 같음
+을 모두 만족하면 exit 0
+
+기본은 임시 SQLite 파일 + 같은 프로세스의 test client. MariaDB 로 측정하려면 빈 스키마를 --db-uri 로 지정
+(벤치에 필요한 테이블만 생성하고 행을 대량으로 넣으므로 운영 DB 에 쓰지 말 것).
+
+사용법 (프로젝트 루트에서):
+    python -m scripts.bench_amr_ingest --amrs 20 --rate 100 --duration 30 [--overload 2] [--format binary]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from app import create_db_app, db
+from app.models.dashboard import AmrStateCurrent, AmrStateLog, EquipmentInfo
+from app.services.amr_ingest import BINARY_DTYPE, amr_ingest_writer
+from app.services.amr_state_service import install_amr_state_current
+
+# 전송이 끝났을 때 writer 큐에 이 시간 이상 밀려 있었으면(또는 429 가 났으면) writer 가 포화된 것으로 봄
+SATURATED_DRAIN_SEC = 0.5
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "binary": "application/octet-stream"}
+
+
+def _build_app(db_uri: str, amrs: int):
+    from app.api.v1.amr_api import amr_api_bp
+
+    app = create_db_app("bench_amr_ingest", db_uri)
+    app.register_blueprint(amr_api_bp, url_prefix="/api/v1/amr")
+
+    tables = [m.__table__ for m in (EquipmentInfo, AmrStateLog, AmrStateCurrent)]
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=tables)
+        for i in range(amrs):
+            db.session.merge(EquipmentInfo(
+                equipment_id=f"AMR{i:02d}", equipment_type="AMR", equipment_name=f"bench {i}",
+            ))
+        db.session.commit()
+    install_amr_state_current(app)
+    amr_ingest_writer.start(app)
+    return app
+
+
+def _encode(samples: list, fmt: str) -> bytes:
+    if fmt == "binary":
+        return np.array([
+            (s["equipment_id"].encode(), s["ts"], s["pos_x"], s["pos_y"], s["heading"],
+             s["battery_pct"], s["speed"], s["state_code"].encode())
+            for s in samples
+        ], dtype=BINARY_DTYPE).tobytes()
+    return "\n".join(json.dumps(s) for s in samples).encode()
+
+
+class AmrClient(threading.Thread):
+
+    def __init__(self, app, equipment_id: str, args):
+        super().__init__(name=f"bench-{equipment_id}", daemon=True)
+        self.app = app
+        self.equipment_id = equipment_id
+        self.args = args
+        self.accepted = 0
+        self.throttled = 0          # 429 로 버린 샘플 수
+        self.errors = 0
+        self.latencies_ms = []
+        self.behind_sec = 0.0      # 전송 일정보다 가장 많이 밀린 시간
+        self.last_sample = None
+
+    def _sample(self, n: int) -> dict:
+        # 값이 float32 로 저장돼도 비교가 정확하도록 2의 거듭제곱 단위로 만든다
+        return {
+            "equipment_id": self.equipment_id,
+            "ts": time.time(),
+            "pos_x": (n % 4096) * 0.25,
+            "pos_y": (n % 1024) * 0.5,
+            "heading": float(n % 360),
+            "battery_pct": 100.0 - (n % 400) * 0.25,
+            "speed": (n % 8) * 0.125,
+            "state_code": "RUN",
+        }
+
+    def run(self):
+        args = self.args
+        client = self.app.test_client()
+        interval = args.batch / (args.rate * args.overload)
+        started = time.monotonic()
+        stop_at = started + args.duration
+        next_at = started
+        n = 0
+        while next_at < stop_at:
+            samples = [self._sample(n + i) for i in range(args.batch)]
+            n += args.batch
+            body = _encode(samples, args.format)
+            t0 = time.perf_counter()
+            resp = client.post("/api/v1/amr/telemetry", data=body, content_type=CONTENT_TYPES[args.format])
+            self.latencies_ms.append((time.perf_counter() - t0) * 1000)
+
+            if resp.status_code == 429:
+                # open-loop: 재전송 / 대기 없이 다음 일정으로
+                self.throttled += len(samples)
+            elif resp.status_code == 202 and not resp.get_json()["rejected"]:
+                self.accepted += len(samples)
+                self.last_sample = samples[-1]
+            else:
+                self.errors += 1
+                print(f"[BENCH] {self.equipment_id}: {resp.status_code} {resp.get_data(as_text=True)[:200]}")
+
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.behind_sec = max(self.behind_sec, -delay)
+
+
+def _check_current(app, clients: list) -> int:
+    """amr_state_current 가 AMR 별 마지막 샘플과 다른 AMR 수"""
+    mismatched = 0
+    with app.app_context():
+        current = {r.equipment_id: r for r in AmrStateCurrent.query.all()}
+        for c in clients:
+            s, row = c.last_sample, current.get(c.equipment_id)
+            if s is None:
+                continue
+            if row is None or (row.pos_x, row.pos_y, row.battery_pct) != (s["pos_x"], s["pos_y"], s["battery_pct"]):
+                mismatched += 1
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--amrs", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=100.0, help="목표: AMR 1대당 샘플/초")
+    parser.add_argument("--overload", type=float, default=2.0, help="목표의 몇 배로 보낼지 (1 이하면 포화되지 않음)")
+    parser.add_argument("--batch", type=int, default=10, help="요청 1건의 샘플 수")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--format", choices=sorted(CONTENT_TYPES), default="ndjson")
+    parser.add_argument("--db-uri", default=None, help="기본: 임시 SQLite 파일")
+    args = parser.parse_args()
+
+    tmp = None
+    db_uri = args.db_uri
+    if db_uri is None:
+        fd, tmp = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        db_uri = f"sqlite:///{tmp}"
+
+    app = _build_app(db_uri, args.amrs)
+    target = args.amrs * args.rate
+    print(f"[BENCH] target {args.amrs} AMR × {args.rate:g}/s = {target:g} samples/s, "
+          f"offered {target * args.overload:g} samples/s (open-loop), "
+          f"batch={args.batch}, format={args.format}, {args.duration:g}s, db={db_uri}")
+
+    clients = [AmrClient(app, f"AMR{i:02d}", args) for i in range(args.amrs)]
+    started = time.monotonic()
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    sent_sec = time.monotonic() - started
+
+    # writer 큐가 빌 때까지 대기
+    while amr_ingest_writer.pending:
+        time.sleep(0.05)
+    drain_sec = time.monotonic() - started - sent_sec
+    amr_ingest_writer.stop()
+
+    with app.app_context():
+        stored = db.session.query(db.func.count(AmrStateLog.idx)).scalar()
+
+    accepted = sum(c.accepted for c in clients)
+    latencies = sorted(ms for c in clients for ms in c.latencies_ms)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    offered = sum(c.accepted + c.throttled for c in clients) / sent_sec
+    capacity = stored / (sent_sec + drain_sec)
+    saturated = drain_sec >= SATURATED_DRAIN_SEC or any(c.throttled for c in clients)
+    mismatched = _check_current(app, clients)
+
+    print(f"[BENCH] offered {offered:,.0f} samples/s, accepted {accepted}, stored {stored} rows, "
+          f"drain {drain_sec * 1000:.0f}ms")
+    print(f"[BENCH] capacity {capacity:,.0f} samples/s = {capacity / target:.2f} × target {target:g}"
+          + ("" if saturated else " (writer 가 포화되지 않음: capacity 는 하한값, --overload 를 올릴 것)"))
+    print(f"[BENCH] requests {len(latencies)}: p50 {statistics.median(latencies or [0]):.2f}ms, p99 {p99:.2f}ms, "
+          f"429 samples {sum(c.throttled for c in clients)}, errors {sum(c.errors for c in clients)}, "
+          f"max behind {max(c.behind_sec for c in clients) * 1000:.0f}ms")
+    print(f"[BENCH] writer {amr_ingest_writer.stats}, amr_state_current mismatched {mismatched}")
+
+    if tmp:
+        os.unlink(tmp)
+
+    problems = []
+    if capacity < target:
+        problems.append("capacity < target" + ("" if saturated else " (포화되지 않아 판정 불가)"))
+    if stored != accepted or amr_ingest_writer.stats["dropped"]:
+        problems.append("accepted samples lost")
+    if mismatched:
+        problems.append("amr_state_current mismatch")
+    ok = not problems
+    print("[BENCH] PASS" if ok else f"[BENCH] FAIL: {', '.join(problems)}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
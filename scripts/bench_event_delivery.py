@@ -0,0 +1,140 @@
+# scripts/bench_event_delivery.py
+"""
+OPC UA 워커 → 핸들러 이벤트 전달 경로별 왕복 지연 비교
+
+  http     : aiohttp JSON POST → Werkzeug → Flask 라우트 → dispatch_event (기존 call_webhook 방식)
+  unix     : UnixEventClient → EventSocketServer → dispatch_event
+  embedded : EmbeddedDispatcher (같은 프로세스, 스레드 풀) → dispatch_event
+
+실제 장비/DB 영향이 없도록 no-op 이벤트 핸들러로 전달 경로 비용만 측정한다.
+
+사용법 (프로젝트 루트에서):
+    python -m scripts.bench_event_delivery --count 1000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import aiohttp
+from flask import Flask
+from werkzeug.serving import make_server
+
+from app.hardware.opcua.delivery import EmbeddedDispatcher, UnixEventClient
+from app.services.event_router import event_handler, handle_webhook
+from app.services.event_socket import EventSocketServer
+
+BENCH_EVENT = "bench_noop"
+
+
+@event_handler(BENCH_EVENT)
+def _handle_bench_noop(value):
+    return {"ok": True, "echo": value}, 200
+
+
+def _build_app():
+    app = Flask(__name__)
+
+    @app.post("/bench")
+    def bench():
+        return handle_webhook(BENCH_EVENT)
+
+    return app
+
+
+def _summary(name: str, samples: list):
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{name:<16} n={len(ms):<6} mean={statistics.mean(ms):7.3f} ms  "
+        f"p50={statistics.median(ms):7.3f} ms  p95={p95:7.3f} ms  max={ms[-1]:7.3f} ms"
+    )
+
+
+async def _bench_http_new_session(url: str, count: int):
+    # call_webhook 과 동일하게 이벤트마다 ClientSession 생성
+    samples = []
+    for i in range(count):
+        t0 = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, json={"event": BENCH_EVENT, "value": i}, timeout=5) as resp:
+                await resp.text()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+async def _bench_http_keepalive(url: str, count: int):
+    samples = []
+    async with aiohttp.ClientSession() as session:
+        for i in range(count):
+            t0 = time.perf_counter()
+            async with session.post(url, json={"event": BENCH_EVENT, "value": i}, timeout=5) as resp:
+                await resp.text()
+            samples.append(time.perf_counter() - t0)
+    return samples
+
+
+async def _bench_unix(path: str, count: int):
+    client = UnixEventClient(path)
+    samples = []
+    try:
+        for i in range(count):
+            t0 = time.perf_counter()
+            await client.send(BENCH_EVENT, i)
+            samples.append(time.perf_counter() - t0)
+    finally:
+        await client.close()
+    return samples
+
+
+async def _bench_embedded(app, count: int):
+    dispatcher = EmbeddedDispatcher()
+    dispatcher.app = app
+    samples = []
+    for i in range(count):
+        t0 = time.perf_counter()
+        await dispatcher.send(BENCH_EVENT, i)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+async def _run(args):
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    app = _build_app()
+
+    http_server = make_server("127.0.0.1", args.port, app, threaded=True)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{args.port}/bench"
+
+    sock_path = os.path.join(tempfile.mkdtemp(), "bench_events.sock")
+    sock_server = EventSocketServer(app, sock_path)
+    sock_server.start()
+
+    try:
+        # 워밍업
+        await _bench_http_keepalive(url, 20)
+        await _bench_unix(sock_path, 20)
+
+        _summary("http(new sess)", await _bench_http_new_session(url, args.count))
+        _summary("http(keepalive)", await _bench_http_keepalive(url, args.count))
+        _summary("unix", await _bench_unix(sock_path, args.count))
+        _summary("embedded", await _bench_embedded(app, args.count))
+    finally:
+        sock_server.stop()
+        http_server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--port", type=int, default=18080)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# scripts/bench_event_router.py
+"""
+이벤트 라우터 dispatch 오버헤드 측정 (이벤트 1건당)
+
+  dispatch : dispatch_event() 직접 호출 (Unix 소켓 / embedded 모드 경로)
+  flask    : Flask test client POST → webhook 라우트 → dispatch_event (HTTP 경로의 Flask 처리분)
+
+실제 장비/DB 영향이 없도록 steps 가 없는 벤치용 테이블로 컴파일해서
+값 정규화 + 라우팅 + 지연 히스토그램 기록 비용만 측정한다.
+
+사용법 (프로젝트 루트에서):
+    python -m scripts.bench_event_router --count 20000
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from flask import Flask
+
+from app.services.event_router import dispatch_event, init_event_routes
+
+BENCH_ROUTES = {
+    "bench_bool": {
+        "webhook": "/bench/bench_bool",
+        "normalize": "bool",
+        "routes": {True: {"action": "bench_triggered", "steps": []}},
+    },
+    "bench_status": {
+        "webhook": "/bench/bench_status",
+        "normalize": "status",
+        "routes": {
+            "DONE": {"action": "mission_done", "steps": []},
+            "PICK": {"action": "pick_start", "steps": []},
+        },
+    },
+}
+
+CASES = [
+    ("Ready", "bench_bool", "Ready"),
+    ("bool false", "bench_bool", False),
+    ("bool true", "bench_bool", True),
+    ("status str", "bench_status", "PICK"),
+    ("status json", "bench_status", json.dumps({"status": "PICK"})),
+    ("status dict", "bench_status", {"status": "DONE"}),
+]
+
+
+def _summary(name: str, samples: list):
+    us = sorted(s * 1_000_000 for s in samples)
+    p95 = us[int(len(us) * 0.95) - 1]
+    print(
+        f"{name:<24} n={len(us):<7} mean={statistics.mean(us):8.2f} us  "
+        f"p50={statistics.median(us):8.2f} us  p95={p95:8.2f} us"
+    )
+
+
+def _bench_dispatch(app, event: str, value, count: int):
+    samples = []
+    with app.app_context():
+        for _ in range(count):
+            t0 = time.perf_counter()
+            dispatch_event(event, value, None)
+            samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _bench_flask(app, event: str, value, count: int):
+    client = app.test_client()
+    path = BENCH_ROUTES[event]["webhook"]
+    samples = []
+    for _ in range(count):
+        t0 = time.perf_counter()
+        client.post(path, json={"event": event, "value": value})
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    init_event_routes(app, BENCH_ROUTES)
+
+    # 핸들러 안의 print 는 측정에서 제외
+    import builtins
+    real_print = builtins.print
+    builtins.print = lambda *a, **k: None
+    try:
+        results = []
+        for label, event, value in CASES:
+            results.append((f"dispatch {label}", _bench_dispatch(app, event, value, args.count)))
+        for label, event, value in CASES:
+            results.append((f"flask {label}", _bench_flask(app, event, value, max(1, args.count // 10))))
+    finally:
+        builtins.print = real_print
+
+    for name, samples in results:
+        _summary(name, samples)
+
+
+if __name__ == "__main__":
+    main()
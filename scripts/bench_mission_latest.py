@@ -0,0 +1,159 @@
+# scripts/bench_mission_latest.py
+"""
+/mission_logs 응답 시간 vs 미션 이력 크기
+
+  legacy   : 기존 쿼리 (mission_logs + mission_plc_logs UNION 두 번 + GROUP BY + 조인)
+  endpoint : GET /api/v1/dashboard/mission_logs (트리거로 유지되는 mission_latest 조회)
+
+이력을 --sizes 단계까지 늘려 가며(INSERT 트리거가 실제로 동작하는 상태로 적재) 단계마다 두 경로를 측정한다.
+이력 크기와 무관하게 endpoint 가 일정해야 한다.
+
+기본은 임시 SQLite 파일. MariaDB 로 측정하려면 빈 스키마를 --db-uri 로 지정
+(벤치에 필요한 테이블만 생성하고 이력을 대량으로 넣으므로 운영 DB 에 쓰지 말 것).
+
+사용법 (프로젝트 루트에서):
+    python -m scripts.bench_mission_latest --sizes 10000,100000,1000000,10000000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app import create_db_app, db
+from app.models.dashboard import EquipmentInfo, MissionLatest, MissionLog, MissionPlcLog
+from app.services.mission_latest_service import install_mission_latest
+
+LEGACY_SQL = text("""
+SELECT x.equipment_id, x.equipment_type, x.status, x.description, x.source, x.created_at, ei.equipment_name
+FROM (
+    SELECT mpl.equipment_id, 'PLC' AS equipment_type, NULL AS status, mpl.description, mpl.source, mpl.created_at
+    FROM mission_plc_logs AS mpl
+    UNION ALL
+    SELECT ml.equipment_id, ml.equipment_type, ml.status, ml.description, ml.source, ml.created_at
+    FROM mission_logs AS ml
+) AS x
+JOIN (
+    SELECT equipment_id, MAX(created_at) AS max_created_at
+    FROM (
+        SELECT equipment_id, created_at FROM mission_plc_logs
+        UNION ALL
+        SELECT equipment_id, created_at FROM mission_logs
+    ) t
+    GROUP BY equipment_id
+) latest ON latest.equipment_id = x.equipment_id AND latest.max_created_at = x.created_at
+LEFT JOIN equipment_info ei ON ei.equipment_id = x.equipment_id
+ORDER BY x.created_at DESC
+LIMIT :limit
+""")
+
+BATCH_ROWS = 10_000
+T0 = datetime(2025, 1, 1)
+
+
+def _build_app(db_uri: str, equipment: int):
+    from app.api.v1.dashboard_api import dashboard_api_bp
+
+    app = create_db_app("bench_mission_latest", db_uri)
+    app.register_blueprint(dashboard_api_bp, url_prefix="/api/v1/dashboard")
+
+    tables = [m.__table__ for m in (EquipmentInfo, MissionLog, MissionPlcLog, MissionLatest)]
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=tables)
+        for i in range(equipment):
+            db.session.merge(EquipmentInfo(
+                equipment_id=f"EQ{i:02d}", equipment_type="AMR", equipment_name=f"bench {i}",
+            ))
+        db.session.commit()
+    install_mission_latest(app)
+    return app
+
+
+def _load(start: int, stop: int, equipment: int):
+    """이력 [start, stop) 적재: 3건 중 2건 mission_logs, 1건 mission_plc_logs"""
+    for lo in range(start, stop, BATCH_ROWS):
+        hi = min(lo + BATCH_ROWS, stop)
+        missions, plc = [], []
+        for i in range(lo, hi):
+            row = {
+                "equipment_id": f"EQ{i % equipment:02d}",
+                "description": f"bench mission {i}",
+                "created_at": T0 + timedelta(milliseconds=i),
+            }
+            if i % 3 == 2:
+                plc.append({**row, "log_plc_id": i + 1, "source": "PLC"})
+            else:
+                missions.append({**row, "mission_id": i + 1, "equipment_type": "AMR",
+                                 "module_type": "bench", "status": "DONE", "source": "API"})
+        if missions:
+            db.session.execute(MissionLog.__table__.insert(), missions)
+        if plc:
+            db.session.execute(MissionPlcLog.__table__.insert(), plc)
+        db.session.commit()
+
+
+def _time(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _fmt(samples: list) -> str:
+    ms = sorted(s * 1000 for s in samples)
+    return f"p50={statistics.median(ms):9.3f} ms  max={ms[-1]:9.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=None, help="기본: 임시 SQLite 파일")
+    parser.add_argument("--sizes", default="10000,100000,1000000,10000000")
+    parser.add_argument("--equipment", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200, help="endpoint 측정 횟수")
+    parser.add_argument("--legacy-repeat", type=int, default=3, help="legacy 측정 횟수 (0 이면 생략)")
+    args = parser.parse_args()
+
+    tmp = None
+    db_uri = args.db_uri
+    if db_uri is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        tmp.close()
+        db_uri = f"sqlite:///{tmp.name}"
+
+    app = _build_app(db_uri, args.equipment)
+    client = app.test_client()
+    path = f"/api/v1/dashboard/mission_logs?limit={args.limit}"
+
+    try:
+        loaded = 0
+        for size in (int(s) for s in args.sizes.split(",")):
+            t0 = time.perf_counter()
+            with app.app_context():
+                _load(loaded, size, args.equipment)
+            print(f"[load] {loaded:,} → {size:,} rows ({time.perf_counter() - t0:.1f}s)")
+            loaded = size
+
+            endpoint = _time(lambda: client.get(path), args.repeat)
+            line = f"rows={size:>12,}  endpoint {_fmt(endpoint)}"
+            if args.legacy_repeat > 0:
+                with app.app_context():
+                    legacy = _time(
+                        lambda: db.session.execute(LEGACY_SQL, {"limit": args.limit}).all(),
+                        args.legacy_repeat,
+                    )
+                line += f"  |  legacy {_fmt(legacy)}"
+            print(line)
+    finally:
+        if tmp is not None:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
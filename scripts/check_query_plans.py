@@ -0,0 +1,184 @@
+# scripts/check_query_plans.py
+"""
+대시보드 조회 엔드포인트 실행 계획(EXPLAIN) 점검
+
+각 엔드포인트를 test client 로 1번 호출하면서 실제로 실행된 SELECT 를 모두 잡아서
+EXPLAIN 을 돌리고, 이력 테이블을 인덱스 없이 읽는 계획이 있으면 실패(exit 1)로 표시한다.
+
+  MariaDB : type=ALL (full scan) / Extra 에 Using filesort, Using temporary
+  SQLite  : "SCAN <table>" (인덱스 없는 scan) / USE TEMP B-TREE
+
+equipment_info 처럼 행 수가 장비 수 정도인 테이블(SMALL_TABLES)은 full scan 을 허용한다.
+옵티마이저는 통계를 보고 계획을 고르므로 실제 데이터가 쌓인 DB(운영 복제본 등)에서 돌려야 의미가 있다.
+
+사용법 (프로젝트 루트에서):
+    python -m scripts.check_query_plans [--db-uri mysql+pymysql://...]
+"""
+
+import argparse
+import re
+import sys
+
+from sqlalchemy import event
+
+from app import create_db_app, db
+from app.services import amr_state_service, db_triggers, mission_latest_service
+from config import Config
+
+ENDPOINTS = [
+    "/api/v1/dashboard/control_logs?limit=10",
+    "/api/v1/dashboard/events_logs?limit=10",
+    "/api/v1/dashboard/mission_logs?limit=5",
+    "/api/v1/dashboard/amr_states",
+    "/api/v1/dashboard/map-meta",
+    "/vision/mission-camera-logs",
+    "/api/v1/vision/camera_logs?limit=20",
+    "/api/v1/search/control_logs?equipment_id=AMR01&action_type=amr_go_move&result_status=FAIL"
+    "&payload.move_command=go_home&start=2026-01-01T00:00:00",
+    "/api/v1/search/control_logs?payload.move_command=go_home",
+    "/api/v1/search/control_logs?result_status=FAIL,TIMEOUT",
+    "/api/v1/search/control_logs?target_type=ARM",
+    "/api/v1/search/control_logs?source=SCRIPT",
+    "/api/v1/search/events_logs?equipment_id=AMR01&level=ERROR",
+    "/api/v1/search/events_logs?equipment_type=PLC",
+    "/api/v1/search/camera_logs?decision=REJECT",
+    "/api/v1/search/camera_logs?mode=JOINT_DETECTION",
+]
+
+# keyset 페이지네이션 엔드포인트: 첫 응답의 next_cursor / cursor 로 before / since 페이지도 점검
+PAGED_ENDPOINTS = {
+    "/api/v1/dashboard/control_logs?limit=10",
+    "/api/v1/dashboard/events_logs?limit=10",
+    "/api/v1/vision/camera_logs?limit=20",
+}
+
+# 장비 수만큼만 행이 있는 테이블 (full scan / filesort 허용)
+SMALL_TABLES = {"equipment_info", "amr_state_current", "mission_latest"}
+
+
+def _build_app(db_uri: str):
+    from app.api.v1.dashboard_api import dashboard_api_bp
+    from app.api.v1.search_api import search_api_bp
+    from app.api.v1.vision_api import vision_api_bp
+    from app.web.vision import vision_bp
+
+    app = create_db_app("check_query_plans", db_uri)
+    app.register_blueprint(dashboard_api_bp, url_prefix="/api/v1/dashboard")
+    app.register_blueprint(vision_api_bp, url_prefix="/api/v1/vision")
+    app.register_blueprint(search_api_bp, url_prefix="/api/v1/search")
+    app.register_blueprint(vision_bp, url_prefix="/vision")
+    # 응답 내용(맵 파일 없음, 템플릿 오류 등)은 상관없고 실행된 쿼리만 보므로 오류 로그는 끔
+    app.logger.disabled = True
+    return app
+
+
+def _capture(app, path: str) -> list:
+    """path 호출 중 실행된 SELECT (statement, parameters) 목록"""
+    captured = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        response = app.test_client().get(path)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return captured, response
+
+
+def _is_large(table: str) -> bool:
+    # <derived2> 등 파생 테이블은 원본 테이블 행에서 판정
+    return bool(table) and table not in SMALL_TABLES and not table.startswith("<")
+
+
+def _explain_mysql(cursor, statement, parameters) -> tuple:
+    cursor.execute("EXPLAIN " + statement, parameters)
+    cols = [d[0] for d in cursor.description]
+    rows = [dict(zip(cols, row)) for row in cursor.fetchall()]
+    has_large = any(_is_large(r.get("table") or "") for r in rows)
+
+    lines, problems = [], []
+    for r in rows:
+        table = r.get("table") or ""
+        extra = r.get("Extra") or ""
+        lines.append(f"{table:<24} type={r.get('type')!s:<8} key={r.get('key')!s:<40} rows={r.get('rows')!s:<10} {extra}")
+        if _is_large(table) and r.get("type") == "ALL":
+            problems.append(f"{table}: full scan")
+        # filesort/temporary 는 조인 순서상 첫 테이블에 표시되므로, 이력 테이블이 조인에 있으면 어디에 붙든 문제
+        if has_large and ("Using filesort" in extra or "Using temporary" in extra):
+            problems.append(f"{table}: {extra}")
+    return lines, problems
+
+
+def _explain_sqlite(cursor, statement, parameters) -> tuple:
+    cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+    details = [row[-1] for row in cursor.fetchall()]
+    tables = [m.group(1) for m in (re.match(r"(?:SCAN|SEARCH) (\w+)", d) for d in details) if m]
+    has_large = any(_is_large(t) for t in tables)
+
+    problems = []
+    for detail in details:
+        m = re.match(r"SCAN (\w+)", detail)
+        if m and _is_large(m.group(1)) and "USING" not in detail:
+            problems.append(f"{m.group(1)}: full scan")
+        if has_large and "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+    return details, problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=Config.SQLALCHEMY_DATABASE_URI)
+    args = parser.parse_args()
+
+    app = _build_app(args.db_uri)
+    with app.app_context():
+        explain = _explain_mysql if db.engine.dialect.name == "mysql" else _explain_sqlite
+        # 서버 프로세스와 같은 조회 경로를 점검 (트리거가 있으면 요약 테이블, 없으면 이력 GROUP BY)
+        # 점검용이라 트리거를 만들지는 않고 있는지만 확인
+        amr_state_service._trigger_installed = db_triggers.trigger_exists(amr_state_service.TRIGGER_NAME)
+        mission_latest_service._trigger_installed = all(
+            db_triggers.trigger_exists(name) for name in mission_latest_service.TRIGGERS
+        )
+        if not (amr_state_service._trigger_installed and mission_latest_service._trigger_installed):
+            print("[WARN] 요약 테이블 트리거 없음 → /amr_states, /mission_logs 는 이력 GROUP BY 로 점검")
+
+    paths = list(ENDPOINTS)
+    failed = 0
+    while paths:
+        path = paths.pop(0)
+        statements, response = _capture(app, path)
+        if path in PAGED_ENDPOINTS and response.is_json:
+            body = response.get_json()
+            for arg, key in (("before", "next_cursor"), ("since", "cursor")):
+                if body.get(key):
+                    paths.insert(0, f"{path}&{arg}={body[key]}")
+        results = []
+        with app.app_context():
+            raw = db.engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                for statement, parameters in statements:
+                    results.append((statement, *explain(cursor, statement, parameters)))
+            finally:
+                raw.close()
+
+        ok = all(not problems for _, _, problems in results)
+        failed += 0 if ok else 1
+        print(f"[{'OK' if ok else 'FAIL'}] {path} ({len(results)} queries)")
+        for statement, lines, problems in results:
+            print("    " + " ".join(statement.split())[:120])
+            for line in lines:
+                print("      " + line)
+            for p in problems:
+                print("      !! " + p)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
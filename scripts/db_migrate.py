@@ -0,0 +1,37 @@
+# scripts/db_migrate.py
+"""
+스키마 마이그레이션 수동 적용/확인 (app/migrations)
+
+사용법 (프로젝트 루트에서, DB 접속 정보는 config.py / 환경변수):
+    python -m scripts.db_migrate status
+    python -m scripts.db_migrate upgrade [--target v0002_dashboard_indexes]
+"""
+
+import argparse
+
+from app import create_db_app, db
+from app.migrations import applied_versions, discover, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["status", "upgrade"])
+    parser.add_argument("--target", default=None, help="이 버전까지만 적용")
+    args = parser.parse_args()
+
+    app = create_db_app("db_migrate")
+    with app.app_context():
+        if args.command == "upgrade":
+            applied = upgrade(target=args.target)
+            print(f"applied: {', '.join(applied) if applied else '(none)'}")
+            return
+
+        with db.engine.begin() as conn:
+            done = applied_versions(conn)
+        for version, module in discover():
+            mark = "x" if version in done else " "
+            print(f"[{mark}] {version}  {module.DESCRIPTION}")
+
+
+if __name__ == "__main__":
+    main()
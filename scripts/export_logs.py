@@ -0,0 +1,54 @@
+# scripts/export_logs.py
+"""
+로그 테이블을 CSV / Parquet 파일로 내보내기 (app/services/log_export.py, API 와 같은 스트리밍 경로)
+
+server-side cursor 로 청크씩 읽어서 바로 파일에 쓰므로 기간이 길어도 메모리는 일정하다.
+
+사용법 (프로젝트 루트에서, DB 접속 정보는 config.py / 환경변수):
+    python -m scripts.export_logs control_logs --start 2026-01-01 --end 2026-02-01 -o control_2026-01.csv
+    python -m scripts.export_logs amr_state_log --format parquet --equipment-id AMR01 -o amr01.parquet
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from app import create_db_app
+from app.services.log_export import EXPORTS, FORMATS, ExportError, export_rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kind", choices=sorted(EXPORTS))
+    parser.add_argument("--format", choices=sorted(FORMATS), default=None, help="기본: 출력 파일 확장자, 없으면 csv")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--equipment-id", default=None)
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: stdout)")
+    args = parser.parse_args()
+
+    fmt = args.format or (args.output.rsplit(".", 1)[-1] if args.output.endswith(tuple(FORMATS)) else "csv")
+    app = create_db_app("export_logs")
+    with app.app_context():
+        try:
+            chunks = export_rows(args.kind, fmt, args.start, args.end, args.equipment_id)
+        except ExportError as e:
+            print(f"[EXPORT] {e}", file=sys.stderr)
+            sys.exit(2)
+
+        out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        started, written = time.time(), 0
+        try:
+            for data in chunks:
+                out.write(data)
+                written += len(data)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        print(f"[EXPORT] {args.kind} → {args.output} ({fmt}, {written:,} bytes, {time.time() - started:.1f}s)",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# scripts/log_archive.py
+"""
+로그 보관 파일 이동 수동 실행 / 현황 / 조회 (app/services/log_archive.py)
+
+사용법 (프로젝트 루트에서, DB 접속 정보는 config.py / 환경변수):
+    python -m scripts.log_archive status
+    python -m scripts.log_archive run [--days 90] [--table control_logs]
+    python -m scripts.log_archive read control_logs --start 2025-09-01 [--end 2025-09-08] [--equipment-id AMR01] > rows.jsonl
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+
+from app import create_db_app
+from app.services.log_archive import ARCHIVE_TABLES, LOG_ARCHIVE_DAYS, archive_status, read_archive, run_archive
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status")
+    run = sub.add_parser("run")
+    run.add_argument("--days", type=int, default=LOG_ARCHIVE_DAYS, help="이 기간보다 오래된 행 이동")
+    run.add_argument("--table", choices=sorted(ARCHIVE_TABLES), action="append", default=None)
+    read = sub.add_parser("read", help="보관된 행을 NDJSON 으로 stdout 에 출력")
+    read.add_argument("table", choices=sorted(ARCHIVE_TABLES))
+    read.add_argument("--start", type=datetime.fromisoformat, required=True)
+    read.add_argument("--end", type=datetime.fromisoformat, default=None, help="기본: start + 1일")
+    read.add_argument("--equipment-id", default=None)
+    args = parser.parse_args()
+
+    if args.command == "status":
+        print(json.dumps(archive_status(), indent=2))
+        return
+
+    if args.command == "read":
+        end = args.end or args.start + timedelta(days=1)
+        count = 0
+        for record in read_archive(args.table, args.start, end, args.equipment_id):
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        print(f"[LOG_ARCHIVE] {count} rows", file=sys.stderr)
+        return
+
+    if args.days <= 0:
+        parser.error("--days must be > 0")
+    app = create_db_app("log_archive")
+    with app.app_context():
+        moved = run_archive(days=args.days, tables=args.table)
+    print(f"[LOG_ARCHIVE] archived {moved}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# scripts/migrate_camera_images.py
+"""
+mission_camera_logs.image_data(BLOB) → 이미지 파일 저장소(app/services/image_store.py) 이동
+
+image_path 가 비어 있고 image_data 가 있는 행을 log_camera_id 순으로 --batch 건씩 읽어서
+파일로 저장하고, 같은 트랜잭션에서 image_path 설정 + image_data 를 NULL 로 비운다.
+배치마다 commit → 중간에 멈춰도 다시 실행하면 이어서 처리 (저장소는 같은 내용이면 다시 쓰지 않음)
+
+BLOB 을 비워도 InnoDB 파일 크기는 줄지 않으므로, 전부 옮긴 뒤 공간을 돌려받으려면
+OPTIMIZE TABLE mission_camera_logs 를 한가한 시간에 실행.
+
+사용법 (프로젝트 루트에서, DB 접속 정보는 config.py / 환경변수):
+    python -m scripts.migrate_camera_images [--batch 50] [--keep-blob] [--dry-run]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import select
+
+from app import create_db_app, db
+from app.models.opcua import MissionCameraLog
+from app.services.image_store import IMAGE_STORE_DIR, save_image
+
+
+def _pending_filter():
+    return (
+        MissionCameraLog.image_data.isnot(None),
+        (MissionCameraLog.image_path.is_(None)) | (MissionCameraLog.image_path == ""),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--pause", type=float, default=0.1, help="배치 사이 대기(초)")
+    parser.add_argument("--keep-blob", action="store_true", help="image_data 를 비우지 않음")
+    parser.add_argument("--dry-run", action="store_true", help="대상 행 수만 출력")
+    args = parser.parse_args()
+
+    app = create_db_app("migrate_camera_images")
+    table = MissionCameraLog.__table__
+    with app.app_context():
+        total = db.session.query(MissionCameraLog.log_camera_id).filter(*_pending_filter()).count()
+        print(f"[IMAGES] 대상 {total} rows → {IMAGE_STORE_DIR}")
+        if args.dry_run or total == 0:
+            return
+
+        moved, last_id, started = 0, 0, time.time()
+        while True:
+            rows = db.session.execute(
+                select(table.c.log_camera_id, table.c.image_data)
+                .where(*_pending_filter(), table.c.log_camera_id > last_id)
+                .order_by(table.c.log_camera_id)
+                .limit(args.batch)
+            ).all()
+            if not rows:
+                break
+
+            try:
+                for log_id, data in rows:
+                    values = {"image_path": save_image(data)}
+                    if not args.keep_blob:
+                        values["image_data"] = None
+                    db.session.execute(
+                        table.update().where(table.c.log_camera_id == log_id).values(**values)
+                    )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+            last_id = rows[-1][0]
+            moved += len(rows)
+            print(f"[IMAGES] {moved}/{total} (last log_camera_id={last_id}, {time.time() - started:.1f}s)")
+            time.sleep(args.pause)
+
+        print(f"[IMAGES] done: {moved} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# tests/conftest.py
+"""
+DB 를 쓰는 테스트용 공통 fixture: 모델 스키마를 메모리 SQLite 에 만든 앱
+
+운영 스키마는 MariaDB 기준이라 SQLite 에서 그대로 만들 수 없는 부분만 SQLite 방언에서 바꾼다.
+- BIGINT PRIMARY KEY → INTEGER (SQLite 는 INTEGER PRIMARY KEY 만 자동 증가)
+- COLLATE utf8mb4_bin → 같은 이름의 바이너리 비교 collation 등록
+"""
+
+import pytest
+from sqlalchemy import BigInteger, event
+from sqlalchemy.ext.compiler import compiles
+
+from app import create_db_app, db
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    return "INTEGER"
+
+
+def _register_collations(dbapi_conn, _record):
+    dbapi_conn.create_collation("utf8mb4_bin", lambda a, b: (a > b) - (a < b))
+
+
+@pytest.fixture
+def db_app():
+    app = create_db_app("test", "sqlite://")
+    with app.app_context():
+        event.listen(db.engine, "connect", _register_collations)
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
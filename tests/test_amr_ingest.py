@@ -0,0 +1,101 @@
+# tests/test_amr_ingest.py
+"""
+amr_ingest 파싱 / 검증: 문자 필드가 잘리지 않고 거부되는지, 숫자 검증
+
+    python -m pytest -q tests
+"""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from app.services import amr_ingest
+from app.services.amr_ingest import BINARY_DTYPE, IngestError, parse, to_rows, validate
+
+KNOWN = ["AMR01", "AMR-LONG-NAME-00", "로봇-01"]
+
+
+@pytest.fixture(autouse=True)
+def known_ids(monkeypatch):
+    ids = np.array(sorted(i.encode("utf-8") for i in KNOWN))
+    monkeypatch.setattr(amr_ingest, "known_amr_ids", lambda: ids)
+
+
+def _sample(**overrides) -> dict:
+    sample = {"equipment_id": "AMR01", "ts": time.time(), "pos_x": 1.0, "pos_y": 2.0,
+              "heading": 90.0, "battery_pct": 50.0, "speed": 0.5, "state_code": "RUN"}
+    sample.update(overrides)
+    return sample
+
+
+def _ndjson(*samples) -> np.ndarray:
+    return parse("\n".join(json.dumps(s, ensure_ascii=False) for s in samples).encode(), "application/x-ndjson")
+
+
+def _errors(arr) -> list:
+    valid, rejected, errors = validate(arr)
+    return [e["error"] for e in errors]
+
+
+def test_valid_rows_round_trip():
+    arr = _ndjson(_sample(), _sample(equipment_id="로봇-01", state_code="대기"))
+    valid, rejected, errors = validate(arr)
+    assert rejected == 0
+    rows = to_rows(valid)
+    assert [r["equipment_id"] for r in rows] == ["AMR01", "로봇-01"]
+    assert [r["state_code"] for r in rows] == ["RUN", "대기"]
+
+
+def test_long_equipment_id_is_not_truncated_onto_another_device():
+    # 예전에는 S16 으로 잘려 "AMR-LONG-NAME-00" 으로 저장됨
+    arr = _ndjson(_sample(equipment_id="AMR-LONG-NAME-0001"))
+    assert arr["equipment_id"][0] == b"AMR-LONG-NAME-0001"
+    assert _errors(arr) == ["unknown equipment_id"]
+
+
+def test_equipment_id_longer_than_column_is_rejected():
+    arr = _ndjson(_sample(), _sample(equipment_id="X" * 40))
+    valid, rejected, errors = validate(arr)
+    assert rejected == 1
+    assert errors == [{"index": 1, "error": "equipment_id too long or not UTF-8"}]
+
+
+def test_state_code_longer_than_column_is_rejected():
+    arr = _ndjson(_sample(state_code="가" * 17), _sample(state_code="가" * 16))
+    assert _errors(arr) == ["state_code too long or not UTF-8"]
+
+
+def test_binary_cut_utf8_is_rejected_not_500():
+    rec = np.zeros(2, dtype=BINARY_DTYPE)
+    rec["equipment_id"] = b"AMR01"
+    rec["ts"] = time.time()
+    rec["battery_pct"] = 50
+    rec["state_code"][0] = "가나다라마".encode() + b"\xeb"     # 16 bytes, 마지막 글자가 잘림
+    rec["state_code"][1] = "RUN".encode()
+    arr = parse(rec.tobytes(), "application/octet-stream")
+    valid, rejected, errors = validate(arr)
+    assert rejected == 1 and errors[0]["error"] == "state_code too long or not UTF-8"
+    assert to_rows(valid)[0]["state_code"] == "RUN"
+
+
+@pytest.mark.parametrize("overrides, reason", [
+    ({"battery_pct": 101.0}, "battery_pct out of range"),
+    ({"pos_x": float("nan")}, "non-finite value"),
+    ({"ts": time.time() + 3600}, "ts in the future"),
+    ({"ts": time.time() - 7200}, "ts too old"),
+    ({"equipment_id": "AMR99"}, "unknown equipment_id"),
+])
+def test_invalid_values_are_rejected(overrides, reason):
+    assert _errors(_ndjson(_sample(), _sample(**overrides))) == [reason]
+
+
+def test_malformed_line_is_ingest_error():
+    with pytest.raises(IngestError, match="line 2"):
+        parse(json.dumps(_sample()).encode() + b'\n{"x": 1}', "application/x-ndjson")
+
+
+def test_binary_length_must_be_record_multiple():
+    with pytest.raises(IngestError):
+        parse(b"\x00" * (BINARY_DTYPE.itemsize + 1), "application/octet-stream")
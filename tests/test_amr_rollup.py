@@ -0,0 +1,93 @@
+# tests/test_amr_rollup.py
+"""
+amr_rollup: 버킷 집계 / 이미 있는 버킷과 합치는 upsert / watermark 증분 집계
+
+    python -m pytest -q tests
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.dashboard import AmrStateLog, AmrStateRollup1m, AmrStateRollup1s
+from app.services import amr_rollup
+from app.services.amr_rollup import _merge_statement, aggregate, rollup_once
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+Row = namedtuple("Row", "equipment_id updated_at pos_x pos_y heading battery_pct speed state_code")
+
+
+def _row(equipment_id="AMR01", at=0.0, battery=50.0, speed=1.0, state="RUN", x=0.0):
+    return Row(equipment_id, T0 + timedelta(seconds=at), x, 0.0, 0.0, battery, speed, state)
+
+
+def _by_key(buckets):
+    return {(b["equipment_id"], b["bucket_start"]): b for b in buckets}
+
+
+def test_aggregate_buckets_per_equipment_and_second():
+    rows = [_row(at=0.1), _row(at=0.9), _row(at=1.2), _row("AMR02", at=0.5)]
+    buckets = _by_key(aggregate(rows, 1))
+    assert set(buckets) == {("AMR01", T0), ("AMR01", T0 + timedelta(seconds=1)), ("AMR02", T0)}
+    assert buckets[("AMR01", T0)]["samples"] == 2
+
+    minute = aggregate(rows, 60)
+    assert sorted((b["equipment_id"], b["bucket_start"], b["samples"]) for b in minute) == [
+        ("AMR01", T0, 3), ("AMR02", T0, 1),
+    ]
+
+
+def test_aggregate_last_values_follow_time_not_row_order():
+    rows = [
+        _row(at=0.5, battery=40.0, speed=2.0, state="RUN", x=5.0),
+        _row(at=0.2, battery=60.0, speed=4.0, state="IDLE", x=2.0),     # 더 늦게 들어온 이전 시각
+    ]
+    (b,) = aggregate(rows, 1)
+    assert b["last_at"] == T0 + timedelta(seconds=0.5)
+    assert (b["pos_x"], b["battery_pct"], b["state_code"]) == (5.0, 40.0, "RUN")
+    assert (b["battery_min"], b["battery_max"], b["speed_sum"]) == (40.0, 60.0, 6.0)
+
+
+def _merge(rows):
+    db.session.execute(_merge_statement(AmrStateRollup1s, aggregate(rows, 1)))
+    db.session.commit()
+    return db.session.get(AmrStateRollup1s, ("AMR01", T0), populate_existing=True)
+
+
+def test_merge_combines_with_existing_bucket(db_app):
+    _merge([_row(at=0.1, battery=50.0, speed=1.0, state="RUN", x=1.0)])
+    b = _merge([_row(at=0.6, battery=45.0, speed=3.0, state="STOP", x=6.0)])
+    assert b.samples == 2 and b.speed_sum == 4.0
+    assert (b.battery_min, b.battery_max) == (45.0, 50.0)
+    assert (b.pos_x, b.state_code, b.last_at) == (6.0, "STOP", T0 + timedelta(seconds=0.6))
+
+
+def test_merge_keeps_newer_last_values(db_app):
+    _merge([_row(at=0.8, battery=30.0, state="RUN", x=8.0)])
+    b = _merge([_row(at=0.3, battery=90.0, state="IDLE", x=3.0)])    # 이미 있는 값보다 이전 시각
+    assert (b.pos_x, b.battery_pct, b.state_code, b.last_at) == (8.0, 30.0, "RUN", T0 + timedelta(seconds=0.8))
+    assert (b.samples, b.battery_min, b.battery_max) == (2, 30.0, 90.0)
+
+
+def _log(at, speed):
+    db.session.add(AmrStateLog(equipment_id="AMR01", pos_x=0, pos_y=0, heading=0, battery_pct=50,
+                               speed=speed, state_code="RUN", updated_at=T0 + timedelta(seconds=at)))
+    db.session.commit()
+
+
+def test_rollup_once_is_incremental_up_to_upper(db_app, monkeypatch):
+    monkeypatch.setattr(amr_rollup, "AMR_ROLLUP_BATCH_ROWS", 2)
+    for i in range(5):
+        _log(i * 0.1, speed=1.0)
+
+    assert rollup_once(3) == 3                  # upper 이후 행은 다음 주기에
+    assert rollup_once(3) == 0                  # 같은 구간을 두 번 더하지 않음
+    assert db.session.get(AmrStateRollup1s, ("AMR01", T0)).samples == 3
+
+    assert rollup_once(5) == 2
+    assert db.session.get(AmrStateRollup1s, ("AMR01", T0), populate_existing=True).samples == 5
+    minute = db.session.get(AmrStateRollup1m, ("AMR01", T0))
+    assert minute.samples == 5 and minute.speed_sum == pytest.approx(5.0)
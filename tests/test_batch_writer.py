@@ -0,0 +1,104 @@
+# tests/test_batch_writer.py
+"""
+batch_writer: 배치 나누기 / 저장 실패 재시도 / 재시도가 모두 실패하면 버림 / max_rows 백프레셔 / 동기 모드
+
+    python -m pytest -q tests
+"""
+
+import threading
+
+import pytest
+from flask import Flask
+
+from app.services.batch_writer import BatchWriter
+
+
+class Sink:
+    """write_batch 대역: 앞의 fail_times 번은 실패, gate 가 있으면 열릴 때까지 대기"""
+
+    def __init__(self, fail_times=0, gate=None):
+        self.fail_times = fail_times
+        self.gate = gate
+        self.batches = []
+
+    def __call__(self, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("lock wait timeout")
+        self.batches.append(list(rows))
+
+
+def _writer(sink, mode="buffered", **kwargs):
+    kwargs.setdefault("retry_delays", (0.001, 0.001))
+    return BatchWriter("TEST", "test-writer", sink, batch_rows=3, flush_ms=10, mode=mode, **kwargs)
+
+
+@pytest.fixture
+def started():
+    writers = []
+
+    def start(writer):
+        writer.start(Flask("test"))
+        writers.append(writer)
+        return writer
+
+    yield start
+    for writer in writers:
+        writer.stop()
+
+
+def test_rows_are_written_in_batches(started):
+    sink = Sink()
+    writer = started(_writer(sink))
+    assert writer.submit([{"i": i} for i in range(5)])
+    writer.submit([{"i": 5}])
+    writer.stop()
+    assert [r["i"] for batch in sink.batches for r in batch] == list(range(6))
+    assert all(len(batch) <= 3 for batch in sink.batches)
+    assert writer.stats["written"] == 6 and writer.pending == 0
+
+
+def test_failed_batch_is_retried(started):
+    sink = Sink(fail_times=2)
+    writer = started(_writer(sink))
+    writer.submit([{"i": 0}, {"i": 1}])
+    writer.stop()
+    assert sink.batches == [[{"i": 0}, {"i": 1}]]
+    assert writer.stats["retries"] == 2
+    assert writer.stats["dropped"] == 0 and writer.stats["written"] == 2
+    assert writer.stats["last_error"] == "lock wait timeout"
+
+
+def test_batch_is_dropped_after_all_retries(started):
+    sink = Sink(fail_times=3)
+    writer = started(_writer(sink))
+    writer.submit([{"i": 0}, {"i": 1}])
+    writer.stop()
+    assert sink.batches == []
+    assert writer.stats["dropped"] == 2 and writer.stats["written"] == 0
+    assert writer.stats["last_error"] == "lock wait timeout"
+    assert writer.pending == 0
+
+
+def test_max_rows_throttles_while_writes_are_stuck(started):
+    gate = threading.Event()
+    writer = started(_writer(Sink(gate=gate), max_rows=4))
+    assert writer.submit([{"i": 0}, {"i": 1}, {"i": 2}])
+    assert not writer.submit([{"i": 3}, {"i": 4}])        # 3 + 2 > 4 → 아무것도 넣지 않음
+    assert writer.stats["throttled"] == 2
+    assert writer.fill_ratio == pytest.approx(0.75)
+    gate.set()
+    writer.stop()
+    assert writer.stats["written"] == 3 and writer.pending == 0
+
+
+def test_sync_mode_writes_in_caller_and_raises():
+    sink = Sink(fail_times=1)
+    writer = _writer(sink, mode="sync")
+    with pytest.raises(RuntimeError, match="lock wait timeout"):
+        writer.submit([{"i": 0}])
+    assert writer.submit([{"i": i} for i in range(4)])
+    assert sink.batches == [[{"i": 0}, {"i": 1}, {"i": 2}], [{"i": 3}]]
+    assert writer.stats["written"] == 4
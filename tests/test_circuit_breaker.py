@@ -0,0 +1,80 @@
+# tests/test_circuit_breaker.py
+"""
+circuit_breaker 상태 전이: CLOSED → OPEN → (probe) HALF_OPEN → 시험 명령 1건 → CLOSED / OPEN
+
+    python -m pytest -q tests
+"""
+
+import pytest
+
+from app.hardware.opcua.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("opc.tcp://test:4840", failure_threshold=2)
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure(TimeoutError("connect timeout"))
+    assert breaker.state == OPEN
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure(TimeoutError("connect timeout"))
+    assert breaker.state == CLOSED
+    breaker.allow()
+
+    breaker.record_failure(ConnectionError("refused"))
+    assert breaker.state == OPEN and breaker.opened_at is not None
+    assert breaker.to_dict()["last_error"] == "ConnectionError: refused"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure(TimeoutError("connect timeout"))
+    breaker.record_success()
+    breaker.record_failure(TimeoutError("connect timeout"))
+    assert breaker.state == CLOSED
+
+
+def test_probe_only_moves_open_to_half_open(breaker):
+    breaker.probe_succeeded()
+    assert breaker.state == CLOSED
+    _open(breaker)
+    breaker.probe_succeeded()
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_allows_a_single_trial(breaker):
+    _open(breaker)
+    breaker.probe_succeeded()
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.opened_at is None
+    breaker.allow()
+    breaker.allow()
+
+
+def test_failed_trial_reopens(breaker):
+    _open(breaker)
+    breaker.probe_succeeded()
+    breaker.allow()
+    breaker.record_failure(TimeoutError("read timeout"))     # threshold 와 무관하게 바로 OPEN
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+def test_release_trial_keeps_half_open(breaker):
+    _open(breaker)
+    breaker.probe_succeeded()
+    breaker.allow()
+    breaker.release_trial()                                  # 세션 받기 전 취소 → 판정 없음
+    assert breaker.state == HALF_OPEN
+    breaker.allow()
@@ -0,0 +1,76 @@
+# tests/test_command_gate.py
+"""
+command_gate: 중복 제거 / 장비별 token bucket / 전송 실패 시 forget()
+
+    python -m pytest -q tests
+"""
+
+import pytest
+
+from app.services import command_gate as gate_module
+from app.services.command_gate import CommandGate, TokenBucket
+
+PAYLOAD = {"move_command": "pick_up_zone"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(gate_module.time, "monotonic", lambda: now["t"])
+    return now
+
+
+@pytest.fixture
+def gate(clock):
+    return CommandGate(1.0, {"default": {"rate": 2.0, "burst": 2}, "AMR02": {"rate": 1.0, "burst": 1}})
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=2)
+    bucket.updated = 0.0
+    assert bucket.take(0.0) and bucket.take(0.0)
+    assert not bucket.take(0.0)
+    assert not bucket.take(0.4)         # 0.8 token
+    assert bucket.take(0.5)             # 1.0 token
+    assert bucket.take(100.0) and bucket.take(100.0)
+    assert not bucket.take(100.0)       # burst 이상 쌓이지 않음
+
+
+def test_refund_is_capped_at_burst():
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.refund()
+    assert bucket.tokens == 2
+
+
+def test_duplicate_within_window_is_suppressed(gate, clock):
+    assert gate.check("AMR01", "amr_go_move", PAYLOAD) is None
+    assert gate.check("AMR01", "amr_go_move", dict(PAYLOAD)).startswith("duplicate")
+    assert gate.check("AMR01", "amr_go_move", {"move_command": "go_home"}) is None
+    clock["t"] += 1.0
+    assert gate.check("AMR01", "amr_go_move", PAYLOAD) is None
+
+
+def test_rate_limit_is_per_equipment(gate):
+    assert gate.check("AMR01", "a", 1) is None
+    assert gate.check("AMR01", "a", 2) is None
+    assert gate.check("AMR01", "a", 3) == "rate limited"
+    assert gate.check("AMR02", "a", 1) is None          # 장비별 설정
+    assert gate.check("AMR02", "a", 2) == "rate limited"
+
+
+def test_forget_allows_retry_and_refunds_token(gate):
+    # breaker open / timeout 중 재시도가 계속 실패해도 bucket 이 비지 않음
+    for _ in range(5):
+        assert gate.check("AMR01", "amr_go_move", PAYLOAD) is None
+        gate.forget("AMR01", "amr_go_move", PAYLOAD)
+    assert gate.check("AMR01", "amr_go_move", PAYLOAD) is None
+    assert gate.check("AMR01", "amr_go_move", {"other": 1}) is None
+
+
+def test_forget_unknown_command_does_not_add_token(gate):
+    assert gate.check("AMR02", "a", 1) is None
+    gate.forget("AMR02", "a", 2)        # 보낸 적 없는 명령
+    gate.forget("AMR02", "a", 1)
+    gate.forget("AMR02", "a", 1)        # 두 번 forget 해도 1개만 반환
+    assert gate.check("AMR02", "a", 3) is None
+    assert gate.check("AMR02", "a", 4) == "rate limited"
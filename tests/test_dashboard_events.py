@@ -0,0 +1,52 @@
+# tests/test_dashboard_events.py
+"""
+GET /api/v1/dashboard/events_logs: equipment_info 에 없는 장비 이벤트는 빼고(예전 INNER JOIN 과 동일),
+keyset 페이지 크기 / 커서가 유지되는지
+
+    python -m pytest -q tests
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.api.v1.dashboard_api import dashboard_api_bp
+from app.models.dashboard import EquipmentInfo, EventLog
+from app.services.equipment_cache import equipment_cache
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def client(db_app):
+    db_app.register_blueprint(dashboard_api_bp, url_prefix="/api/v1/dashboard")
+    db.session.add(EquipmentInfo(equipment_id="AMR01", equipment_type="AMR", equipment_name="amr 1"))
+    # SQLite 는 FK 를 검사하지 않음 → 삭제된 장비(GHOST) 이벤트를 만들 수 있음
+    for i in range(6):
+        db.session.add(EventLog(
+            equipment_id="AMR01" if i % 2 == 0 else "GHOST", equipment_type="AMR",
+            level="INFO", message=f"event {i}", created_at=T0 + timedelta(seconds=i),
+        ))
+    db.session.commit()
+    equipment_cache.invalidate()
+    yield db_app.test_client()
+    equipment_cache.invalidate()
+
+
+def test_events_for_unknown_equipment_are_skipped(client):
+    res = client.get("/api/v1/dashboard/events_logs?limit=10")
+    assert res.status_code == 200
+    items = res.get_json()["items"]
+    assert [i["message"] for i in items] == ["event 4", "event 2", "event 0"]
+    assert all(i["equipment"]["equipment_name"] == "amr 1" for i in items)
+
+
+def test_pages_stay_full_when_rows_are_skipped(client):
+    first = client.get("/api/v1/dashboard/events_logs?limit=2").get_json()
+    assert [i["message"] for i in first["items"]] == ["event 4", "event 2"]
+    assert first["has_more"]
+
+    rest = client.get(f"/api/v1/dashboard/events_logs?limit=2&before={first['next_cursor']}").get_json()
+    assert [i["message"] for i in rest["items"]] == ["event 0"]
+    assert not rest["has_more"]
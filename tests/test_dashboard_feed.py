@@ -0,0 +1,129 @@
+# tests/test_dashboard_feed.py
+"""
+dashboard_feed 커서: 새 행 / 늦게 commit 된 작은 id / 요약 테이블 워터마크 / 트리거가 없을 때
+
+    python -m pytest -q tests
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models.dashboard import AmrStateCurrent, ControlLog, EquipmentInfo, MissionLatest
+from app.services import amr_state_service, dashboard_feed as feed_module, mission_latest_service
+from app.services.dashboard_feed import DashboardFeed
+from app.services.equipment_cache import equipment_cache
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(feed_module, "publish_dashboard_event", events.append)
+    monkeypatch.setattr(feed_module, "breaker_states", lambda: [])
+    return events
+
+
+@pytest.fixture
+def feed(db_app, published, monkeypatch):
+    monkeypatch.setattr(amr_state_service, "_trigger_installed", True)
+    monkeypatch.setattr(mission_latest_service, "_trigger_installed", True)
+    for i in (1, 2):
+        db.session.add(EquipmentInfo(equipment_id=f"AMR0{i}", equipment_type="AMR", equipment_name=f"amr {i}"))
+    db.session.commit()
+    equipment_cache.invalidate()
+    yield DashboardFeed(poll_sec=1, min_gap_sec=0, max_rows=50, id_window=100)
+    equipment_cache.invalidate()
+
+
+def _kinds(events, kind):
+    return [e["payload"]["items"] for e in events if e["type"] == kind]
+
+
+def _amr(equipment_id, log_idx):
+    db.session.merge(AmrStateCurrent(equipment_id=equipment_id, log_idx=log_idx, pos_x=0, pos_y=0, heading=0,
+                                     battery_pct=50, speed=0, updated_at=T0))
+    db.session.commit()
+
+
+def _mission(equipment_id, src_table, src_id):
+    db.session.merge(MissionLatest(equipment_id=equipment_id, src_table=src_table, src_id=src_id,
+                                   equipment_type="AMR", created_at=T0))
+    db.session.commit()
+
+
+def _control(control_id):
+    db.session.add(ControlLog(control_id=control_id, equipment_id="AMR01", target_type="AMR",
+                              action_type="amr_go_move", operator_name="SYSTEM", source="API",
+                              request_payload="{}", result_status="SUCCESS", created_at=T0))
+    db.session.commit()
+
+
+def test_baseline_publishes_nothing(feed, published):
+    _amr("AMR01", 10)
+    _control(1)
+    feed.prime()
+    feed.poll()
+    assert published == []
+
+
+def test_control_log_late_commit_within_window(feed, published):
+    _control(5)
+    feed.prime()
+    _control(10)
+    feed.poll()
+    _control(7)             # 10 보다 먼저 id 를 받았지만 늦게 commit
+    feed.poll()
+    feed.poll()
+    assert [[i["control_id"] for i in items] for items in _kinds(published, "control_logs")] == [[10], [7]]
+
+
+def test_amr_state_delta_by_log_idx_watermark(feed, published):
+    _amr("AMR01", 10)
+    _amr("AMR02", 20)
+    feed.prime()
+
+    _amr("AMR01", 30)
+    feed.poll()
+    _amr("AMR02", 25)       # 30 보다 작은 idx 가 늦게 commit
+    feed.poll()
+    feed.poll()             # 바뀐 것 없음
+    deltas = _kinds(published, "amr_states")
+    assert [[(i["equipment_id"], i["idx"]) for i in items] for items in deltas] == [
+        [("AMR01", 30)], [("AMR02", 25)],
+    ]
+
+
+def test_mission_watermark_is_per_source_table(feed, published):
+    _mission("AMR01", "mission_logs", 500)
+    feed.prime()
+
+    # mission_plc_logs 의 PK 는 mission_logs 와 따로 증가 → 작은 id 라도 새 행
+    _mission("AMR02", "mission_plc_logs", 3)
+    feed.poll()
+    _mission("AMR01", "mission_logs", 501)
+    feed.poll()
+    deltas = _kinds(published, "mission_logs")
+    assert [[(i["equipment_id"], i["equipment"]["equipment_id"]) for i in items] for items in deltas] == [
+        [("AMR02", "AMR02")], [("AMR01", "AMR01")],
+    ]
+
+
+def test_no_current_deltas_without_triggers(feed, published, monkeypatch):
+    monkeypatch.setattr(amr_state_service, "_trigger_installed", False)
+    monkeypatch.setattr(mission_latest_service, "_trigger_installed", False)
+
+    def history_scan(*args, **kwargs):
+        raise AssertionError("feed must not scan history")
+
+    monkeypatch.setattr(amr_state_service, "get_current_amr_states", history_scan)
+    monkeypatch.setattr(mission_latest_service, "get_latest_missions", history_scan)
+
+    feed.prime()
+    _amr("AMR01", 10)
+    _mission("AMR01", "mission_logs", 1)
+    feed.poll()
+    assert _kinds(published, "amr_states") == []
+    assert _kinds(published, "mission_logs") == []
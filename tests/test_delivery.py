@@ -0,0 +1,82 @@
+# tests/test_delivery.py
+"""
+UnixEventClient: 재접속 후 이전 연결의 수신 태스크가 새 연결을 닫지 않는지
+
+    python -m pytest -q tests
+"""
+
+import asyncio
+
+from app.hardware.opcua.delivery import UnixEventClient
+from app.hardware.opcua.ipc import HEADER, KIND_REPLY, decode_body, encode_frame, parse_header
+
+
+async def _serve(path: str, connections: list):
+    """요청마다 {"status": 200, "body": 받은 event} 로 응답하는 소켓 서버"""
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                _, request_id, body_len = parse_header(await reader.readexactly(HEADER.size))
+                msg = decode_body(await reader.readexactly(body_len))
+                writer.write(encode_frame(KIND_REPLY, request_id, {"status": 200, "body": {"event": msg["event"]}}))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    return await asyncio.start_unix_server(handle, path)
+
+
+def test_reconnect_keeps_new_connection(tmp_path):
+    path = str(tmp_path / "event.sock")
+
+    async def scenario():
+        connections = []
+        server = await _serve(path, connections)
+        client = UnixEventClient(path)
+
+        assert (await client.send("a", 1))["body"] == {"event": "a"}
+        old_writer = client._writer
+
+        # 이전 연결이 닫히는 중으로 보이지만 수신 태스크는 아직 readexactly 에서 대기 → 새 연결
+        old_writer.is_closing = lambda: True
+        assert (await client.send("b", 2))["body"] == {"event": "b"}
+        assert client._writer is not old_writer
+
+        # 그 뒤 이전 연결이 EOF 로 끝나도 새 연결과 대기 요청은 그대로
+        connections[0].close()
+        await asyncio.sleep(0.05)
+        assert client._writer is not None and not client._writer.is_closing()
+        assert (await client.send("c", 3))["body"] == {"event": "c"}
+        assert len(connections) == 2
+
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_server_close_fails_pending_requests(tmp_path):
+    path = str(tmp_path / "event.sock")
+
+    async def scenario():
+        async def handle(reader, writer):
+            await reader.readexactly(HEADER.size)
+            writer.close()      # 응답 없이 연결 종료
+
+        server = await asyncio.start_unix_server(handle, path)
+        client = UnixEventClient(path)
+        try:
+            await client.send("a", 1, timeout=2)
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("pending request should fail when the socket closes")
+        assert client._pending == {}
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
@@ -0,0 +1,115 @@
+# tests/test_event_ingest.py
+"""
+event_ingest 중복/역순 필터: 판정 순서, 실패한 핸들러는 기록하지 않는지, 잘못된 meta 타임스탬프
+
+    python -m pytest -q tests
+"""
+
+import pytest
+from flask import Flask
+
+from app.services import event_router
+from app.services.event_ingest import EventIngestIndex
+from app.services.event_router import dispatch_event, handle_webhook
+
+
+def _meta(ts, node_id="ns=2;s=Sensor1"):
+    return {"node_id": node_id, "source_ts": ts}
+
+
+@pytest.fixture
+def index(monkeypatch):
+    idx = EventIngestIndex(flush_sec=60)
+    monkeypatch.setattr(event_router, "ingest_index", idx)
+    return idx
+
+
+@pytest.fixture
+def handler():
+    calls = []
+    result = {"status": 200}
+
+    def handle(value):
+        calls.append(value)
+        if isinstance(result["status"], Exception):
+            raise result["status"]
+        return {"ok": True}, result["status"]
+
+    handle.calls = calls
+    handle.result = result
+    event_router.EVENT_HANDLERS["ingest_event"] = handle
+    yield handle
+    event_router.EVENT_HANDLERS.pop("ingest_event", None)
+
+
+def _seen(index, ts, value=True, name="ingest_event"):
+    return index.is_processed(index.event_key(name, value, _meta(ts)))
+
+
+def test_key_is_none_without_meta_or_timestamp(index):
+    assert index.event_key("e", True, None) is None
+    assert index.event_key("e", True, {"node_id": "n"}) is None
+    assert not index.is_processed(None)
+
+
+@pytest.mark.parametrize("ts", ["1" * 5000, [1.0], {"a": 1}, True, float("nan"), float("inf")])
+def test_non_numeric_timestamp_is_ignored(index, ts):
+    assert index.event_key("e", True, _meta(ts)) is None
+
+
+def test_older_and_same_events_are_processed(index):
+    index.commit(index.event_key("e", True, _meta(100.5)))
+    assert _seen(index, 100.5, name="e")
+    assert _seen(index, 99.0, name="e")
+    assert not _seen(index, 100.5, value=False, name="e")   # 같은 ts, 다른 값
+    assert not _seen(index, 101.0, name="e")
+
+
+def test_older_commit_does_not_rewind(index):
+    index.commit(index.event_key("e", True, _meta(200.0)))
+    index.commit(index.event_key("e", True, _meta(100.0)))
+    assert _seen(index, 150.0, name="e")
+    assert not _seen(index, 201.0, name="e")
+
+
+def test_nodes_are_independent(index):
+    index.commit(index.event_key("e", True, _meta(100.0, node_id="a")))
+    assert not index.is_processed(index.event_key("e", True, _meta(50.0, node_id="b")))
+
+
+def test_dispatch_skips_redelivered_event(index, handler):
+    assert dispatch_event("ingest_event", True, _meta(10.0)) == ({"ok": True}, 200)
+    body, status = dispatch_event("ingest_event", True, _meta(10.0))
+    assert body["action"] == "duplicate_skipped"
+    assert handler.calls == [True]
+
+
+@pytest.mark.parametrize("failure", [503, RuntimeError("db down")])
+def test_failed_handler_is_not_recorded(index, handler, failure):
+    handler.result["status"] = failure
+    if isinstance(failure, Exception):
+        with pytest.raises(RuntimeError):
+            dispatch_event("ingest_event", True, _meta(10.0))
+    else:
+        assert dispatch_event("ingest_event", True, _meta(10.0))[1] == 503
+
+    # 워커 재전송 → 다시 처리
+    handler.result["status"] = 200
+    assert dispatch_event("ingest_event", True, _meta(10.0)) == ({"ok": True}, 200)
+    assert handler.calls == [True, True]
+    assert index._dirty["ns=2;s=Sensor1"][1] == 10_000_000
+
+
+def test_client_error_is_recorded(index, handler):
+    handler.result["status"] = 400
+    dispatch_event("ingest_event", True, _meta(10.0))
+    assert _seen(index, 10.0)
+
+
+@pytest.mark.parametrize("field", ["source_ts", "server_ts", "received_ts", "dispatched_ts"])
+def test_webhook_non_numeric_meta_ts_is_400(index, handler, field):
+    app = Flask("test_event_ingest")
+    app.add_url_rule("/ingest_event", view_func=lambda: handle_webhook("ingest_event"), methods=["POST"])
+    res = app.test_client().post("/ingest_event", json={"value": True, "meta": {field: "1" * 5000}})
+    assert res.status_code == 400
+    assert handler.calls == []
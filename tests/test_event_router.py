@@ -0,0 +1,123 @@
+# tests/test_event_router.py
+"""
+event_router 회귀 테스트: 형식이 잘못된 webhook 값이 500(unhandled) 이 되지 않는지
+
+    python -m pytest -q tests
+"""
+
+import pytest
+from flask import Flask
+
+from app.services import event_router
+from app.services.event_router import NORMALIZERS, compile_event, init_event_routes
+
+STATUS_SPEC = {
+    "webhook": "/test/status_event",
+    "normalize": "status",
+    "routes": {"PICK": {"action": "picked"}},
+}
+BOOL_SPEC = {
+    "webhook": "/test/bool_event",
+    "normalize": "bool",
+    "routes": {True: {"action": "triggered"}},
+}
+
+
+@pytest.fixture
+def client():
+    app = Flask("test_event_router")
+    init_event_routes(app, {"status_event": STATUS_SPEC, "bool_event": BOOL_SPEC})
+    yield app.test_client()
+    event_router.EVENT_HANDLERS.pop("status_event", None)
+    event_router.EVENT_HANDLERS.pop("bool_event", None)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ({"status": "PICK"}, "PICK"),
+    ('{"status": "PICK"}', "PICK"),
+    ('"PICK"', "PICK"),
+    ("PICK", "PICK"),
+    ({"status": ["PICK"]}, None),
+    ({"status": {"a": 1}}, None),
+    ('{"status": [1, 2]}', None),
+    ("[1, 2]", "[1, 2]"),
+    (["PICK"], None),
+    (3, None),
+    (None, None),
+])
+def test_normalize_status_returns_str_or_none(value, expected):
+    assert NORMALIZERS["status"](value) == expected
+
+
+@pytest.mark.parametrize("value", [[1, 2], {"a": 1}, "x", 0, None])
+def test_normalize_bool_is_hashable(value):
+    assert isinstance(NORMALIZERS["bool"](value), bool)
+
+
+@pytest.mark.parametrize("value", [
+    ["PICK"],
+    {"status": ["PICK"]},
+    {"status": {"nested": True}},
+    '{"status": ["PICK"]}',
+    12.5,
+])
+def test_status_handler_bad_values_are_no_action(value):
+    handler = compile_event("status_event", STATUS_SPEC)
+    body, status = handler(value)
+    assert status == 200
+    assert body["action"] == "no_action"
+
+
+def test_status_handler_matches_route():
+    handler = compile_event("status_event", STATUS_SPEC)
+    assert handler({"status": "PICK"}) == ({"ok": True, "action": "picked"}, 200)
+
+
+def test_handler_normalizer_error_is_400():
+    def broken(value):
+        raise TypeError("unhashable type: 'list'")
+
+    NORMALIZERS["broken"] = broken
+    try:
+        handler = compile_event("broken_event", {"normalize": "broken", "routes": {}})
+        body, status = handler(["x"])
+    finally:
+        NORMALIZERS.pop("broken")
+    assert status == 400
+    assert body["ok"] is False
+
+
+@pytest.mark.parametrize("payload", [
+    {"value": ["PICK"]},
+    {"value": {"status": ["PICK"]}},
+    {"value": {"status": {"a": 1}}},
+])
+def test_webhook_list_values_are_no_action(client, payload):
+    res = client.post("/test/status_event", json=payload)
+    assert res.status_code == 200
+    assert res.get_json()["action"] == "no_action"
+
+
+def test_webhook_bool_list_value(client):
+    res = client.post("/test/bool_event", json={"value": [1]})
+    assert res.status_code == 200
+    assert res.get_json()["action"] == "triggered"
+
+
+@pytest.mark.parametrize("payload", [["PICK"], "PICK", 3])
+def test_webhook_non_object_body_is_400(client, payload):
+    res = client.post("/test/status_event", json=payload)
+    assert res.status_code == 400
+    assert res.get_json()["ok"] is False
+
+
+def test_webhook_non_object_meta_is_400(client):
+    res = client.post("/test/status_event", json={"value": "PICK", "meta": [1]})
+    assert res.status_code == 400
+
+
+@pytest.mark.parametrize("data", [b"{not json", b"", b'{"value": "PICK"'])
+def test_webhook_malformed_json_is_400(client, data):
+    res = client.post("/test/status_event", data=data, content_type="application/json")
+    assert res.status_code == 400
+    assert res.get_json() == {"ok": False, "error": "invalid JSON body"}
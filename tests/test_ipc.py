@@ -0,0 +1,76 @@
+# tests/test_ipc.py
+"""
+ipc 프레임 코덱: encode_frame → parse_header / decode_body 왕복, 잘못된 프레임은 FrameError
+
+    python -m pytest -q tests
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.hardware.opcua.ipc import (
+    HEADER,
+    KIND_EVENT,
+    KIND_REPLY,
+    MAX_BODY_SIZE,
+    FrameError,
+    decode_body,
+    encode_frame,
+    parse_header,
+)
+
+
+def _round_trip(kind, request_id, obj):
+    frame = encode_frame(kind, request_id, obj)
+    got_kind, got_id, body_len = parse_header(frame[:HEADER.size])
+    assert (got_kind, got_id, body_len) == (kind, request_id, len(frame) - HEADER.size)
+    return decode_body(frame[HEADER.size:])
+
+
+@pytest.mark.parametrize("value", [
+    None, True, False, 0, -1, (1 << 63) - 1, -(1 << 63), 1.5, float("inf"),
+    "", "AMR01", "로봇-01", b"", b"\x00\xff", [], [1, "a", None], {},
+])
+def test_scalar_and_container_round_trip(value):
+    assert _round_trip(KIND_EVENT, 1, value) == value
+
+
+def test_event_and_reply_bodies_round_trip():
+    event = {"event": "mission_state", "value": {"equipment_id": "AMR01", "steps": [1, 2.5, True],
+                                                  "meta": {"node_id": "ns=2;i=7", "source_ts": 1767225600.25}}}
+    assert _round_trip(KIND_EVENT, 42, event) == event
+
+    reply = {"status": 200, "body": {"ok": True, "error": None}}
+    assert _round_trip(KIND_REPLY, (1 << 32) - 1, reply) == reply
+
+
+def test_other_types_are_sent_as_text():
+    # tuple → list, dict 키 → str, 범위 밖 정수 / datetime → 문자열
+    value = {1: (1, 2), "big": 1 << 64, "at": datetime(2026, 1, 1, 12, 0)}
+    assert _round_trip(KIND_EVENT, 1, value) == {"1": [1, 2], "big": str(1 << 64), "at": "2026-01-01 12:00:00"}
+
+
+def test_bad_magic_is_rejected():
+    frame = bytearray(encode_frame(KIND_EVENT, 1, None))
+    frame[:2] = b"XX"
+    with pytest.raises(FrameError, match="bad magic"):
+        parse_header(bytes(frame[:HEADER.size]))
+
+
+def test_oversized_body_is_rejected():
+    with pytest.raises(FrameError, match="too large"):
+        parse_header(HEADER.pack(b"SB", KIND_EVENT, 1, MAX_BODY_SIZE + 1))
+
+
+@pytest.mark.parametrize("body", [
+    b"\x63",                                    # 모르는 태그
+    encode_frame(KIND_EVENT, 1, "abc")[HEADER.size:-1],       # 문자열 길이보다 짧음
+    encode_frame(KIND_EVENT, 1, [1, 2])[HEADER.size:-3],      # 정수가 잘림
+    encode_frame(KIND_EVENT, 1, None)[HEADER.size:] + b"\x00",  # 남는 바이트
+    b"\x05\x00\x00\x00\x01\xeb",                # 잘린 UTF-8
+    b"",
+])
+def test_malformed_body_is_frame_error(body):
+    with pytest.raises(FrameError):
+        decode_body(body)
@@ -0,0 +1,88 @@
+# tests/test_log_archive.py
+"""
+log_archive: 배치 저장 + 삭제, 저장 뒤 멈췄다가 다시 저장된 행을 read_archive 가 한 번만 주는지
+
+    python -m pytest -q tests
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.dashboard import EventLog
+from app.services import log_archive
+from app.services.log_archive import archive_table, read_archive
+
+T0 = datetime(2026, 1, 1, 23, 59, 58)
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_BATCH_ROWS", 2)
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_PAUSE_SEC", 0)
+    return tmp_path
+
+
+def _add_events(n):
+    # 날짜 경계를 넘도록 1초 간격
+    for i in range(n):
+        db.session.add(EventLog(equipment_id="AMR01" if i % 2 == 0 else "AMR02", equipment_type="AMR",
+                                level="INFO", message=f"event {i}", created_at=T0 + timedelta(seconds=i)))
+    db.session.commit()
+
+
+def _messages(records):
+    return [r["message"] for r in records]
+
+
+def test_archive_moves_rows_into_day_files(db_app, archive_dir):
+    _add_events(5)
+    assert archive_table("events_logs", T0 + timedelta(seconds=4)) == 4
+    assert [e.message for e in EventLog.query.all()] == ["event 4"]
+    assert sorted(os.listdir(archive_dir / "events_logs")) == ["2026-01-01", "2026-01-02"]
+
+    records = list(read_archive("events_logs", T0, T0 + timedelta(days=1)))
+    assert _messages(records) == ["event 0", "event 1", "event 2", "event 3"]
+    assert records[0]["created_at"] == T0.isoformat()
+
+
+def test_read_archive_filters_range_and_equipment(db_app, archive_dir):
+    _add_events(4)
+    archive_table("events_logs", T0 + timedelta(days=1))
+    start, end = T0 + timedelta(seconds=1), T0 + timedelta(seconds=3)
+    assert _messages(read_archive("events_logs", start, end)) == ["event 1", "event 2"]
+    assert _messages(read_archive("events_logs", T0, end, equipment_id="AMR01")) == ["event 0", "event 2"]
+
+
+def test_read_archive_skips_rows_saved_twice(db_app, archive_dir, monkeypatch):
+    _add_events(4)
+
+    # 첫 실행: 파일 저장 후 DELETE 전에 멈춤
+    def crash(*args, **kwargs):
+        raise RuntimeError("killed")
+
+    original = db.session.execute
+    with monkeypatch.context() as m:
+        m.setattr(db.session, "execute",
+                  lambda stmt, *a, **kw: crash() if stmt.is_delete else original(stmt, *a, **kw))
+        with pytest.raises(RuntimeError):
+            archive_table("events_logs", T0 + timedelta(seconds=1))
+    assert EventLog.query.count() == 4
+
+    # 다음 실행은 배치 크기가 달라 다른 파일명으로 같은 행을 다시 저장
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_BATCH_ROWS", 3)
+    assert archive_table("events_logs", T0 + timedelta(days=1)) == 4
+    day_files = os.listdir(archive_dir / "events_logs" / "2026-01-01")
+    assert len(day_files) == 2
+
+    assert _messages(read_archive("events_logs", T0, T0 + timedelta(days=2))) == [
+        "event 0", "event 1", "event 2", "event 3",
+    ]
+
+
+def test_unknown_table_is_value_error(archive_dir):
+    with pytest.raises(ValueError, match="unknown archive table"):
+        list(read_archive("users", T0, T0 + timedelta(days=1)))
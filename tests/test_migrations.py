@@ -0,0 +1,60 @@
+# tests/test_migrations.py
+"""
+app/migrations: create_all() 로 만든 DB 에 다시 적용해도 안전한지, DB_AUTO_MIGRATE=0 이면 시작을 막는지
+
+    python -m pytest -q tests
+"""
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app import db
+from app import migrations
+from app.migrations import SchemaOutOfDate, discover, pending, run_startup_migrations, upgrade
+
+
+def _versions():
+    return [v for v, _ in discover()]
+
+
+def test_upgrade_on_create_all_schema_is_noop(db_app):
+    # 새 DB: create_all() 이 이미 최신 스키마 → 마이그레이션은 건너뛰며 기록만
+    assert upgrade() == _versions()
+    assert pending() == []
+    assert upgrade() == []
+
+
+def test_upgrade_restores_missing_index(db_app):
+    upgrade()
+    with db.engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_control_logs_target_created"))
+        conn.execute(text("DELETE FROM schema_migrations WHERE version = 'v0004_log_search_filter_indexes'"))
+
+    assert upgrade() == ["v0004_log_search_filter_indexes"]
+    names = {ix["name"] for ix in inspect(db.engine).get_indexes("control_logs")}
+    assert "ix_control_logs_target_created" in names
+
+
+def test_upgrade_skips_missing_tables(db_app):
+    # create_all() 전에 수동 upgrade 를 돌려도 실패하지 않음 (테이블은 create_all 이 모델 기준으로 만듦)
+    with db.engine.begin() as conn:
+        conn.execute(text("DROP TABLE mission_camera_logs"))
+    assert upgrade() == _versions()
+
+
+def test_startup_without_auto_migrate_refuses_pending(db_app, monkeypatch):
+    monkeypatch.setattr(migrations, "DB_AUTO_MIGRATE", False)
+    with pytest.raises(SchemaOutOfDate, match="v0001"):
+        run_startup_migrations(db_app)
+
+    upgrade()
+    run_startup_migrations(db_app)      # 모두 적용됐으면 통과
+
+
+def test_startup_migration_failure_refuses_start(db_app, monkeypatch):
+    def broken(engine=None, target=None):
+        raise RuntimeError("lock wait timeout")
+
+    monkeypatch.setattr(migrations, "upgrade", broken)
+    with pytest.raises(SchemaOutOfDate, match="lock wait timeout"):
+        run_startup_migrations(db_app)
@@ -0,0 +1,85 @@
+# tests/test_pagination.py
+"""
+keyset_page: before / since 커서, 같은 created_at 의 id 순서, 밀린 행이 많을 때 reset
+
+    python -m pytest -q tests
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.dashboard import EventLog
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _add(n, start=0):
+    # 두 행씩 같은 created_at → (created_at, id) 로만 순서가 정해짐
+    for i in range(start, start + n):
+        db.session.add(EventLog(equipment_id="AMR01", equipment_type="AMR", level="INFO",
+                                message=f"event {i}", created_at=T0 + timedelta(seconds=i // 2)))
+    db.session.commit()
+
+
+def _page(limit, **cursor):
+    return keyset_page(EventLog.query, EventLog.created_at, EventLog.event_id, limit,
+                       lambda r: (r.created_at, r.event_id), **cursor)
+
+
+def _messages(page):
+    return [r.message for r in page["items"]]
+
+
+@pytest.fixture
+def events(db_app):
+    _add(5)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(T0, 123)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (T0, 123)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(T0, 1)[:-4]])
+def test_invalid_cursor_is_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_before_walks_all_rows_once(events):
+    first = _page(2)
+    assert _messages(first) == ["event 4", "event 3"]
+    assert first["has_more"] and first["cursor"] is not None
+
+    second = _page(2, before=first["next_cursor"])
+    assert _messages(second) == ["event 2", "event 1"]     # 같은 초의 event 2 / 3 이 나뉘어도 빠지지 않음
+    assert second["cursor"] is None
+
+    last = _page(2, before=second["next_cursor"])
+    assert _messages(last) == ["event 0"]
+    assert not last["has_more"] and last["next_cursor"] is None
+
+
+def test_since_returns_only_new_rows(events):
+    head = _page(10)["cursor"]
+    empty = _page(10, since=head)
+    assert empty["items"] == [] and empty["cursor"] == head
+
+    _add(2, start=5)
+    new = _page(10, since=head)
+    assert _messages(new) == ["event 6", "event 5"]
+    assert not new["reset"]
+    assert _page(10, since=new["cursor"])["items"] == []
+
+
+def test_since_with_too_many_new_rows_resets(events):
+    head = _page(10)["cursor"]
+    _add(4, start=5)
+    page = _page(2, since=head)
+    assert page["reset"]
+    assert _messages(page) == ["event 8", "event 7"]
+    assert page["has_more"]
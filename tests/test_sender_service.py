@@ -0,0 +1,96 @@
+# tests/test_sender_service.py
+"""
+SenderService 시작: 풀 시작이 끝나기 전에 started 가 되지 않는지, 실패하면 루프 스레드를 남기지 않는지
+
+    python -m pytest -q tests
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.hardware.opcua.sender_service import SenderService
+
+
+class FakePool:
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.started = False
+
+    async def start(self):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("endpoint unreachable")
+        self.started = True
+
+    async def close(self):
+        pass
+
+
+def _sender_threads() -> int:
+    return sum(1 for t in threading.enumerate() if t.name == "opcua-sender")
+
+
+def _wait_threads(expected: int):
+    deadline = time.monotonic() + 2
+    while _sender_threads() > expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return _sender_threads()
+
+
+def test_start_failure_does_not_leak_loop_thread():
+    before = _sender_threads()
+    service = SenderService(lambda: FakePool(fail=True))
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            service.start()
+    assert not service.started
+    assert _wait_threads(before) == before
+
+
+def test_start_publishes_loop_and_pool_together():
+    service = SenderService(FakePool)
+    service.start()
+    try:
+        assert service.started
+        assert service.pool.started
+    finally:
+        service.stop()
+        service.loop.call_soon_threadsafe(service.loop.stop)
+
+
+def test_start_in_running_loop_not_started_until_pool_ready():
+    service = SenderService(lambda: FakePool(delay=0.05))
+
+    async def scenario():
+        task = asyncio.get_running_loop().create_task(service.start_in_running_loop())
+        await asyncio.sleep(0.01)
+        # 풀 시작 중: loop 만 보이고 pool 이 None 인 상태가 없어야 함
+        assert not service.started
+        assert service.pool is None
+        # 같은 루프의 두 번째 호출은 풀을 또 만들지 않음
+        await service.start_in_running_loop()
+        await task
+        assert service.started
+        assert service.pool.started
+        assert service.loop is asyncio.get_running_loop()
+
+    asyncio.run(scenario())
+
+
+def test_start_in_running_loop_failure_can_retry():
+    pools = [FakePool(fail=True), FakePool()]
+    service = SenderService(lambda: pools.pop(0))
+
+    async def scenario():
+        with pytest.raises(ConnectionError):
+            await service.start_in_running_loop()
+        assert not service.started
+        await service.start_in_running_loop()
+        assert service.started
+
+    asyncio.run(scenario())
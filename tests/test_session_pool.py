@@ -0,0 +1,104 @@
+# tests/test_session_pool.py
+"""
+OpcUaSessionPool.session(): 취소 / 오류가 난 세션을 풀에 어떻게 돌려주는지 (실제 OPC UA 서버 없이)
+
+    python -m pytest -q tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.hardware.opcua.circuit_breaker import CircuitBreaker
+from app.hardware.opcua.session_pool import OpcUaSessionPool
+
+
+class FakeClient:
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+async def _pool(size: int = 1, **breaker_kwargs) -> OpcUaSessionPool:
+    pool = OpcUaSessionPool("opc.tcp://test", "urn:test", size=size,
+                            breaker=CircuitBreaker("test", **breaker_kwargs))
+    await pool.start()
+    for s in pool._sessions:
+        s.client = FakeClient()
+        s.last_used = time.monotonic()
+    return pool
+
+
+def test_cancelled_call_discards_session():
+    async def scenario():
+        pool = await _pool()
+        session = pool._sessions[0]
+        client = session.client
+
+        async def slow_call():
+            async with pool.session():
+                await asyncio.sleep(10)     # 서버 응답 대기 중
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(slow_call(), 0.01)
+        await asyncio.sleep(0)
+
+        assert session.client is None           # 다음 사용 시 재접속
+        assert client.disconnected
+        assert pool._idle.qsize() == 1          # 세션 슬롯은 풀로 돌아옴
+        assert pool.breaker.failures == 1
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_successful_call_keeps_session():
+    async def scenario():
+        pool = await _pool()
+        client = pool._sessions[0].client
+        async with pool.session() as s:
+            assert s.client is client
+        assert pool._sessions[0].client is client
+        assert pool.breaker.failures == 0
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_session_error_closes_session():
+    async def scenario():
+        pool = await _pool()
+        session = pool._sessions[0]
+        with pytest.raises(ConnectionError):
+            async with pool.session():
+                raise ConnectionError("socket closed")
+        assert session.client is None
+        assert pool.breaker.failures == 1
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_cancel_while_waiting_for_session_releases_trial():
+    async def scenario():
+        pool = await _pool(failure_threshold=1)
+        pool.breaker.record_failure(ConnectionError("down"))
+        pool.breaker.probe_succeeded()          # HALF_OPEN: 시험 명령 1건
+        held = pool._idle.get_nowait()          # 세션이 모두 사용 중
+
+        async def waiting_call():
+            async with pool.session():
+                pass
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(waiting_call(), 0.01)
+        assert pool.breaker.state == "HALF_OPEN"
+        pool.breaker.allow()                    # 시험 기회가 돌아옴
+        pool._idle.put_nowait(held)
+        await pool.close()
+
+    asyncio.run(scenario())